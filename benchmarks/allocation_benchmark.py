@@ -0,0 +1,124 @@
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from time import perf_counter
+import tracemalloc
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Tuple,
+)
+
+import lpp.object
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+from lpp.repl import (
+    ENGINES,
+    Engine,
+)
+
+
+# Programs doing arithmetic on small numbers and the value they evaluate to.
+PROGRAMS: Dict[str, Tuple[str, str]] = {
+    # Every procedimiento keeps the environment it was created in, and a
+    # digit in it, alive until the end.
+    'cadena': ('''
+        variable cadena = procedimiento(n, siguiente) {
+            si (n == 0) { regresa 0; }
+            variable digito = n - n / 10 * 10;
+            regresa cadena(n - 1, procedimiento() { digito + siguiente() });
+        };
+        cadena(20000, procedimiento() { 0 });
+    ''', '0'),
+    'fibonacci': ('''
+        variable fibonacci = procedimiento(n) {
+            si (n < 2) { regresa n; }
+            regresa fibonacci(n - 1) + fibonacci(n - 2);
+        };
+        fibonacci(20);
+    ''', '6765'),
+    'dígitos': ('''
+        variable digitos = procedimiento(n) {
+            variable i = 0;
+            variable suma = 0;
+            mientras (i < n) {
+                suma = suma + (i - i / 10 * 10);
+                i = i + 1;
+            }
+            suma
+        };
+        digitos(100000);
+    ''', '450000'),
+}
+
+
+@contextmanager
+def small_integers_not_shared() -> Iterator[None]:
+    """Make every arithmetic result a new Integer, like before they were
+    shared."""
+    minimum = lpp.object._SMALL_INTEGER_MIN
+    maximum = lpp.object._SMALL_INTEGER_MAX
+    lpp.object._SMALL_INTEGER_MIN, lpp.object._SMALL_INTEGER_MAX = 1, 0
+    try:
+        yield
+    finally:
+        lpp.object._SMALL_INTEGER_MIN = minimum
+        lpp.object._SMALL_INTEGER_MAX = maximum
+
+
+def measure(engine: Engine, name: str) -> Tuple[float, int]:
+    """Return the seconds it takes `engine` to run a program and the peak
+    of the memory it allocates while doing it.
+
+    Tracing slows every allocation down, so the time is measured in a run
+    of its own.
+    """
+    source, expected = PROGRAMS[name]
+
+    start_time = perf_counter()
+    evaluated = engine(Parser(Lexer(source)).parse_program(), Environment())
+    seconds = perf_counter() - start_time
+    assert evaluated is not None and evaluated.inspect() == expected
+
+    program = Parser(Lexer(source)).parse_program()
+    tracemalloc.start()
+    evaluated = engine(program, Environment())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert evaluated is not None and evaluated.inspect() == expected
+    return seconds, peak
+
+
+def main() -> None:
+    argument_parser = ArgumentParser(
+        description='Measure the memory every engine allocates for '
+                    'arithmetic, with small integers shared and without.')
+    argument_parser.add_argument('--engine', action='append',
+                                 choices=list(ENGINES), dest='engines')
+    argument_parser.add_argument('--program', action='append',
+                                 choices=list(PROGRAMS), dest='programs')
+    arguments = argument_parser.parse_args()
+
+    # Code compiled to Python computes with ints, only what it returns
+    # becomes an Integer.
+    engine_names: List[str] = arguments.engines or [
+        name for name in ENGINES if name != 'python']
+
+    for name in arguments.programs or PROGRAMS:
+        print(name)
+        for engine_name in engine_names:
+            engine = ENGINES[engine_name]
+            with small_integers_not_shared():
+                seconds, peak = measure(engine, name)
+            shared_seconds, shared_peak = measure(engine, name)
+
+            print(f'    {engine_name}: '
+                  f'{peak / 1024:,.1f}KiB in {seconds:.3f}s not shared, '
+                  f'{shared_peak / 1024:,.1f}KiB in {shared_seconds:.3f}s '
+                  f'shared')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+from gc import collect
+from tracemalloc import (
+    get_traced_memory,
+    start,
+    stop,
+)
+from typing import (
+    Callable,
+    Dict,
+)
+
+from benchmarks.frontend_benchmark import CORPORA
+from lpp.ast import (
+    Program,
+    walk,
+)
+from lpp.lexer import (
+    Lexer,
+    tokenize,
+)
+from lpp.parser import Parser
+
+
+def retained_memory(parse: Callable[[], Program]) -> int:
+    """Return the bytes still allocated by `parse` once it is done, which
+    is the size of the program it returns."""
+    start()
+    try:
+        program = parse()
+        collect()
+        return get_traced_memory()[0]
+    finally:
+        stop()
+
+
+def main() -> None:
+    for name, generate in CORPORA.items():
+        source: str = generate()
+        nodes: int = sum(1 for _ in walk(Parser(Lexer(source)).parse_program()))
+
+        # The source and its tokens are created before measuring, so only
+        # the program counts.
+        tokens = tokenize(source)
+        sizes: Dict[str, int] = {
+            'from a Lexer': retained_memory(
+                lambda: Parser(Lexer(source)).parse_program()),
+            'with tokens': retained_memory(
+                lambda: Parser(tokens).parse_program()),
+            'with spans': retained_memory(
+                lambda: Parser(tokens, keep_tokens=False).parse_program()),
+        }
+
+        print(f'{name}: {nodes:,} nodes')
+        for label, size in sizes.items():
+            print(f'    {label}: {size / 1024:,.0f} KiB, '
+                  f'{size / nodes:.0f} bytes per node')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+from argparse import ArgumentParser
+from sys import setrecursionlimit
+from time import perf_counter
+from typing import Dict
+
+from lpp.ast import Program
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+from lpp.repl import (
+    ENGINES,
+    Engine,
+)
+
+
+PROGRAMS: Dict[str, str] = {
+    'fibonacci': '''
+        variable fibonacci = procedimiento(n) {
+            si (n < 2) { regresa n; }
+            regresa fibonacci(n - 1) + fibonacci(n - 2);
+        };
+        fibonacci(20);
+    ''',
+    # The examples of the README, called from a tree recursion.
+    'closures': '''
+        variable mayor_de_edad = procedimiento(edad) {
+            si (edad > 18) { regresa verdadero; } si_no { regresa falso; }
+        };
+        variable sumador = procedimiento(x) {
+            regresa procedimiento(y) { regresa x + y; };
+        };
+        variable cuenta = procedimiento(n) {
+            si (n < 2) {
+                si (mayor_de_edad(sumador(n)(18))) { regresa 1; }
+                regresa 0;
+            }
+            regresa cuenta(n - 1) + cuenta(n - 2);
+        };
+        cuenta(18);
+    ''',
+    'strings': '''
+        variable repite = procedimiento(texto, n) {
+            si (n == 0) { regresa ""; }
+            regresa texto + repite(texto, n - 1);
+        };
+        variable cuenta = procedimiento(n) {
+            si (n < 2) { regresa longitud(repite("ab", 10)); }
+            regresa cuenta(n - 1) + cuenta(n - 2);
+        };
+        cuenta(14);
+    ''',
+}
+
+
+def best_time(engine: Engine, program: Program, rounds: int) -> float:
+    best: float = float('inf')
+    for _ in range(rounds):
+        start_time = perf_counter()
+        engine(program, Environment())
+        best = min(best, perf_counter() - start_time)
+
+    return best
+
+
+def main() -> None:
+    argument_parser = ArgumentParser(
+        description='Compare how long every engine takes to run the same '
+                    'programs.')
+    argument_parser.add_argument('--rounds', type=int, default=3)
+    argument_parser.add_argument('programs', nargs='*', default=list(PROGRAMS))
+    arguments = argument_parser.parse_args()
+
+    # The evaluator uses several Python frames per LPP call.
+    setrecursionlimit(100000)
+
+    for name in arguments.programs:
+        program: Program = Parser(Lexer(PROGRAMS[name])).parse_program()
+        times: Dict[str, float] = {
+            engine_name: best_time(engine, program, arguments.rounds)
+            for engine_name, engine in ENGINES.items()
+        }
+
+        print(name)
+        for engine_name, seconds in times.items():
+            speedup = times['evaluador'] / seconds
+            print(f'    {engine_name}: {seconds:.3f}s ({speedup:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
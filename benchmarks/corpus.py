@@ -0,0 +1,74 @@
+from typing import List
+
+
+_PROGRAM_TEMPLATE: str = '''
+variable mayor_de_edad_{n} = procedimiento(edad) {{
+    si (edad > 18) {{
+        regresa verdadero;
+    }} si_no {{
+        regresa falso;
+    }}
+}};
+variable sumador_{n} = procedimiento(x) {{
+    regresa procedimiento(y) {{
+        regresa x + y;
+    }};
+}};
+variable suma_dos_{n} = sumador_{n}(2);
+variable año_{n} = suma_dos_{n}({n}) * 2 - 3 / 1;
+variable saludo_{n} = "Hola número {n}, ¿cómo estás?";
+si (año_{n} == {n} + 7) {{ longitud(saludo_{n}); }} si_no {{ !falso; }}
+mayor_de_edad_{n}(suma_dos_{n}(20)) != verdadero;
+'''
+
+
+def realistic(repetitions: int) -> str:
+    """Return a program built from the README examples repeated
+    `repetitions` times with distinct identifiers."""
+    chunks: List[str] = [_PROGRAM_TEMPLATE.format(n=n)
+                         for n in range(repetitions)]
+
+    return ''.join(chunks)
+
+
+def nested_ifs(depth: int, repetitions: int) -> str:
+    """Return `repetitions` si/si_no expressions nested `depth` levels deep."""
+    opening: str = 'si (x > {n}) {{\n'
+    closing: str = '}} si_no {{\n    regresa {n};\n}}\n'
+
+    chunks: List[str] = []
+    for _ in range(repetitions):
+        chunks.extend(opening.format(n=n) for n in range(depth))
+        chunks.append('regresa x;\n')
+        chunks.extend(closing.format(n=n) for n in reversed(range(depth)))
+
+    return ''.join(chunks)
+
+
+def procedure_chain(length: int) -> str:
+    """Return `length` procedimientos, each calling the previous one."""
+    chunks: List[str] = ['variable paso_0 = procedimiento(x) { regresa x; };\n']
+    chunks.extend(
+        f'variable paso_{n} = procedimiento(x) {{\n'
+        f'    regresa paso_{n - 1}(x + {n}) * 2;\n'
+        f'}};\n'
+        for n in range(1, length)
+    )
+
+    return ''.join(chunks)
+
+
+def long_strings(count: int, length: int) -> str:
+    """Return `count` string literals of `length` characters each."""
+    text: str = ('Platzi es la mejor escuela online. ' * (length // 35 + 1))[:length]
+
+    return ''.join(f'variable texto_{n} = "{text}";\n' for n in range(count))
+
+
+def statements(count: int) -> str:
+    """Return `count` short statements."""
+    chunks: List[str] = ['variable v_0 = 0;\n']
+    chunks.extend(f'variable v_{n} = v_{n - 1} + {n} * 2;\n'
+                  for n in range(1, count))
+
+    return ''.join(chunks)
@@ -0,0 +1,98 @@
+from argparse import ArgumentParser
+from timeit import repeat
+from typing import (
+    Callable,
+    Dict,
+    Optional,
+    Type,
+)
+
+import lpp.ast as ast
+from lpp.evaluator import (
+    Handler,
+    _HANDLERS,
+)
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+
+
+# Has a node of every type the evaluator knows.
+SOURCE: str = '''
+    variable f = procedimiento(x) {
+        si (x > 1) { regresa -x; } si_no { regresa "x"; }
+    };
+    f(verdadero);
+'''
+
+
+def chain(node: ast.ASTNode) -> Optional[Handler]:
+    """Find the handler of `node` comparing its type against every node
+    type in turn, in the order the evaluator did before it had a table."""
+    node_type: Type = type(node)
+
+    if node_type == ast.Program:
+        return _HANDLERS[ast.Program]
+    elif node_type == ast.ExpressionStatement:
+        return _HANDLERS[ast.ExpressionStatement]
+    elif node_type == ast.Integer:
+        return _HANDLERS[ast.Integer]
+    elif node_type == ast.Boolean:
+        return _HANDLERS[ast.Boolean]
+    elif node_type == ast.Prefix:
+        return _HANDLERS[ast.Prefix]
+    elif node_type == ast.Infix:
+        return _HANDLERS[ast.Infix]
+    elif node_type == ast.Block:
+        return _HANDLERS[ast.Block]
+    elif node_type == ast.If:
+        return _HANDLERS[ast.If]
+    elif node_type == ast.ReturnStatement:
+        return _HANDLERS[ast.ReturnStatement]
+    elif node_type == ast.LetStatement:
+        return _HANDLERS[ast.LetStatement]
+    elif node_type == ast.Identifier:
+        return _HANDLERS[ast.Identifier]
+    elif node_type == ast.Function:
+        return _HANDLERS[ast.Function]
+    elif node_type == ast.Call:
+        return _HANDLERS[ast.Call]
+    elif node_type == ast.StringLiteral:
+        return _HANDLERS[ast.StringLiteral]
+
+    return None
+
+
+def table(node: ast.ASTNode) -> Optional[Handler]:
+    """Find the handler of `node` the way `evaluate` does."""
+    return _HANDLERS.get(type(node))
+
+
+def nanoseconds(dispatch: Callable[[ast.ASTNode], Optional[Handler]],
+                node: ast.ASTNode,
+                number: int) -> float:
+    best = min(repeat(lambda: dispatch(node), number=number, repeat=5))
+
+    return best / number * 1e9
+
+
+def main() -> None:
+    argument_parser = ArgumentParser(
+        description='Compare the cost of finding the handler of every node '
+                    'type with a chain of comparisons and with a table.')
+    argument_parser.add_argument('--number', type=int, default=200000)
+    arguments = argument_parser.parse_args()
+
+    nodes: Dict[Type[ast.ASTNode], ast.ASTNode] = {}
+    for node in ast.walk(Parser(Lexer(SOURCE)).parse_program()):
+        nodes.setdefault(type(node), node)
+
+    print(f'{"node":>20} {"chain":>8} {"table":>8}')
+    for node_type in _HANDLERS:
+        node = nodes[node_type]
+        before = nanoseconds(chain, node, arguments.number)
+        after = nanoseconds(table, node, arguments.number)
+        print(f'{node_type.__name__:>20} {before:>6.0f}ns {after:>6.0f}ns')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+import json
+import sys
+from argparse import ArgumentParser
+from functools import partial
+from os import path
+from platform import (
+    machine,
+    platform,
+    python_implementation,
+    python_version,
+)
+from time import perf_counter
+from tracemalloc import (
+    get_traced_memory,
+    start,
+    stop,
+)
+from typing import (
+    Callable,
+    Dict,
+    List,
+)
+
+from benchmarks import corpus
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+from lpp.token import TokenType
+
+
+Metrics = Dict[str, float]
+
+BASELINE_PATH: str = path.join(path.dirname(__file__), 'baseline.json')
+
+CORPORA: Dict[str, Callable[[], str]] = {
+    'realistic': partial(corpus.realistic, 1000),
+    'nested_ifs': partial(corpus.nested_ifs, 100, 100),
+    'procedure_chain': partial(corpus.procedure_chain, 20000),
+    'long_strings': partial(corpus.long_strings, 100, 100000),
+    'statements': partial(corpus.statements, 100000),
+}
+
+# Metrics where a bigger number is better, the rest are memory sizes.
+THROUGHPUT_METRICS: List[str] = ['tokens_per_second', 'statements_per_second']
+
+
+def environment() -> Dict[str, str]:
+    """Describe where the metrics are taken. Throughput depends on the
+    machine and peak memory on the Python version, so only metrics taken
+    in the same environment are compared."""
+    return {
+        'python': f'{python_implementation()} {python_version()}',
+        'platform': platform(),
+        'machine': machine(),
+    }
+
+
+def lex(source: str) -> int:
+    lexer: Lexer = Lexer(source)
+
+    tokens: int = 0
+    while lexer.next_token().token_type != TokenType.EOF:
+        tokens += 1
+
+    return tokens
+
+
+def parse(source: str) -> int:
+    parser: Parser = Parser(Lexer(source))
+
+    return len(parser.parse_program().statements)
+
+
+def best_time(fn: Callable[[str], int], source: str, rounds: int) -> float:
+    best: float = float('inf')
+    for _ in range(rounds):
+        start_time = perf_counter()
+        fn(source)
+        best = min(best, perf_counter() - start_time)
+
+    return best
+
+
+def peak_memory(fn: Callable[[str], int], source: str) -> float:
+    """Return the peak memory, in KiB, allocated while running `fn`."""
+    start()
+    try:
+        fn(source)
+        return get_traced_memory()[1] / 1024
+    finally:
+        stop()
+
+
+def measure(source: str, rounds: int) -> Metrics:
+    tokens = lex(source)
+    statements = parse(source)
+
+    return {
+        'tokens_per_second': tokens / best_time(lex, source, rounds),
+        'statements_per_second': statements / best_time(parse, source, rounds),
+        'lexer_peak_kib': peak_memory(lex, source),
+        'parser_peak_kib': peak_memory(parse, source),
+    }
+
+
+def regressions(results: Dict[str, Metrics],
+                baseline: Dict[str, Metrics],
+                threshold: float) -> List[str]:
+    """Return a message for every metric more than `threshold` percent
+    worse than in `baseline`."""
+    messages: List[str] = []
+
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = baseline.get(name, {}).get(metric)
+            if expected is None:
+                continue
+
+            if metric in THROUGHPUT_METRICS:
+                change = (expected - value) / expected * 100
+            else:
+                change = (value - expected) / expected * 100
+
+            if change > threshold:
+                messages.append(f'{name}.{metric}: {value:,.0f} vs baseline '
+                                f'{expected:,.0f} ({change:.1f}% worse)')
+
+    return messages
+
+
+def main() -> None:
+    argument_parser = ArgumentParser(
+        description='Measure the throughput and peak memory of the lexer and '
+                    'the parser, and compare them against a baseline.')
+    argument_parser.add_argument('--baseline', default=BASELINE_PATH)
+    argument_parser.add_argument('--threshold', type=float, default=25.0,
+                                 help='allowed regression in percent')
+    argument_parser.add_argument('--rounds', type=int, default=3)
+    argument_parser.add_argument('--update-baseline', action='store_true')
+    argument_parser.add_argument('corpora', nargs='*', default=list(CORPORA))
+    arguments = argument_parser.parse_args()
+
+    results: Dict[str, Metrics] = {}
+    for name in arguments.corpora:
+        results[name] = measure(CORPORA[name](), arguments.rounds)
+
+        print(name)
+        for metric, value in results[name].items():
+            print(f'    {metric}: {value:,.0f}')
+
+    if arguments.update_baseline:
+        with open(arguments.baseline, 'w') as baseline_file:
+            json.dump({'environment': environment(), 'metrics': results},
+                      baseline_file,
+                      indent=4,
+                      sort_keys=True)
+            baseline_file.write('\n')
+        return
+
+    with open(arguments.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    if baseline.get('environment') != environment():
+        print(f'The baseline was taken on {baseline.get("environment")}, '
+              f'not on {environment()}. Record one here with '
+              f'--update-baseline to compare against it.')
+        return
+
+    messages = regressions(results, baseline['metrics'], arguments.threshold)
+    for message in messages:
+        print(f'Regression: {message}')
+
+    if messages:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
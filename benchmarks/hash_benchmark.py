@@ -0,0 +1,120 @@
+from argparse import ArgumentParser
+from time import perf_counter
+from timeit import repeat
+from typing import (
+    Callable,
+    List,
+)
+
+from lpp.evaluator import _evaluate_index_expression
+from lpp.lexer import Lexer
+from lpp.object import (
+    Environment,
+    Hash,
+    Object,
+    String,
+    integer_object,
+)
+from lpp.parser import Parser
+from lpp.persistent import Map
+from lpp.repl import (
+    ENGINES,
+    Engine,
+)
+
+
+def chain_program(size: int, lookups: int) -> str:
+    """Return a program that looks every key up in a chain of `si`, the way
+    lookup tables were written before hashes."""
+    branches = f'si (llave == "llave{size - 1}") {{ {size - 1} }}'
+    for key in reversed(range(size - 1)):
+        branches = f'si (llave == "llave{key}") {{ {key} }} ' \
+                   f'si_no {{ {branches} }}'
+
+    return f'''
+        variable tabla = procedimiento(llave) {{ {branches} }};
+        variable i = 0;
+        variable suma = 0;
+        mientras (i < {lookups}) {{
+            suma = suma + tabla("llave{size - 1}");
+            i = i + 1;
+        }}
+        suma;
+    '''
+
+
+def hash_program(size: int, lookups: int) -> str:
+    pairs = ', '.join(f'"llave{key}": {key}' for key in range(size))
+
+    return f'''
+        variable tabla = {{{pairs}}};
+        variable i = 0;
+        variable suma = 0;
+        mientras (i < {lookups}) {{
+            suma = suma + tabla["llave{size - 1}"];
+            i = i + 1;
+        }}
+        suma;
+    '''
+
+
+def seconds(engine: Engine, source: str, expected: str) -> float:
+    program = Parser(Lexer(source)).parse_program()
+
+    start_time = perf_counter()
+    evaluated = engine(program, Environment())
+    elapsed = perf_counter() - start_time
+
+    assert evaluated is not None and evaluated.inspect() == expected
+    return elapsed
+
+
+def nanoseconds(run: Callable[[], Object], number: int) -> float:
+    best = min(repeat(run, number=number, repeat=5))
+
+    return best / number * 1e9
+
+
+def main() -> None:
+    argument_parser = ArgumentParser(
+        description='Compare looking keys up in a hash and in a chain of si, '
+                    'and the cost of indexing a hash with long strings.')
+    argument_parser.add_argument('--engine', action='append',
+                                 choices=list(ENGINES), dest='engines')
+    argument_parser.add_argument('--lookups', type=int, default=10000)
+    argument_parser.add_argument('--number', type=int, default=100000)
+    arguments = argument_parser.parse_args()
+    lookups: int = arguments.lookups
+    number: int = arguments.number
+
+    print(f'{"keys":>8} {"engine":>10} {"si":>10} {"hash":>10}')
+    # Deeper chains of si nest deeper than CPython compiles.
+    for size in (10, 50):
+        expected = str((size - 1) * lookups)
+        for engine_name in arguments.engines or ENGINES:
+            engine = ENGINES[engine_name]
+            chain_seconds = seconds(engine, chain_program(size, lookups),
+                                    expected)
+            hash_seconds = seconds(engine, hash_program(size, lookups),
+                                   expected)
+            print(f'{size:>8} {engine_name:>10} '
+                  f'{chain_seconds:>9.3f}s {hash_seconds:>9.3f}s')
+
+    # The same key looked up again reuses its hash key, a key equal to it
+    # but new builds its own once.
+    print()
+    print(f'{"key length":>12} {"same key":>10} {"new key":>10}')
+    for length in (10, 10000):
+        key = String('a' * length)
+        hash_object = Hash(Map([(key.hash_key(), (key, integer_object(1)))]))
+        value = key.value
+        same_time = nanoseconds(
+            lambda: _evaluate_index_expression(hash_object, key), number)
+        new_time = nanoseconds(
+            lambda: _evaluate_index_expression(hash_object, String(value)),
+            number)
+        print(f'{length:>12} {same_time:>8.0f}ns {new_time:>8.0f}ns')
+
+
+if __name__ == '__main__':
+    main()
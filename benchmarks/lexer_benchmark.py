@@ -0,0 +1,224 @@
+from argparse import ArgumentParser
+from re import match
+from sys import exit
+from time import perf_counter
+from typing import (
+    Callable,
+    Dict,
+)
+
+from benchmarks.corpus import realistic
+from lpp.lexer import Lexer
+from lpp.token import (
+    Token,
+    TokenType,
+)
+
+
+class RegexLexer:
+    """The lexer before it was table driven, kept to compare against. It
+    matches a regular expression against every character."""
+
+    def __init__(self, source: str) -> None:
+        self._source: str = source
+        self._position: int = 0
+        self._read_position: int = 0
+        self._character: str = ''
+
+        self._read_character()
+
+    def next_token(self) -> Token:
+        self._skip_whitespace()
+
+        if match(r'^=$', self._character):
+            if self._peek_character() == '=':
+                token = self._make_two_character_token(TokenType.EQ)
+            else:
+                token = Token(TokenType.ASSIGN, self._character)
+        elif match(r'^\+$', self._character):
+            token = Token(TokenType.PLUS, self._character)
+        elif match(r'^$', self._character):
+            token = Token(TokenType.EOF, self._character)
+        elif match(r'^\($', self._character):
+            token = Token(TokenType.LPAREN, self._character)
+        elif match(r'^\)$', self._character):
+            token = Token(TokenType.RPAREN, self._character)
+        elif match(r'^{$', self._character):
+            token = Token(TokenType.LBRACE, self._character)
+        elif match(r'^}$', self._character):
+            token = Token(TokenType.RBRACE, self._character)
+        elif match(r'^,$', self._character):
+            token = Token(TokenType.COMMA, self._character)
+        elif match(r'^;$', self._character):
+            token = Token(TokenType.SEMICOLON, self._character)
+        elif match(r'^-$', self._character):
+            token = Token(TokenType.MINUS, self._character)
+        elif match(r'^/$', self._character):
+            token = Token(TokenType.DIVISION, self._character)
+        elif match(r'^\*$', self._character):
+            token = Token(TokenType.MULTIPLICATION, self._character)
+        elif match(r'^<$', self._character):
+            token = Token(TokenType.LT, self._character)
+        elif match(r'^>$', self._character):
+            token = Token(TokenType.GT, self._character)
+        elif match(r'^!$', self._character):
+            if self._peek_character() == '=':
+                token = self._make_two_character_token(TokenType.NOT_EQ)
+            else:
+                token = Token(TokenType.NEGATION, self._character)
+        elif self._is_letter(self._character):
+            literal = self._read_identifier()
+            token_type = _lookup_token_type(literal)
+
+            return Token(token_type, literal)
+        elif self._is_number(self._character):
+            literal = self._read_number()
+
+            return Token(TokenType.INT, literal)
+        elif match(r'^"$', self._character):
+            literal = self._read_string()
+
+            return Token(TokenType.STRING, literal)
+        else:
+            token = Token(TokenType.ILLEGAL, self._character)
+
+        self._read_character()
+
+        return token
+
+    def _is_letter(self, character: str) -> bool:
+        return bool(match(r'^[a-záéíóúA-ZÁÉÍÓÚñÑ_]$', character))
+
+    def _is_number(self, character: str) -> bool:
+        return bool(match(r'^\d$', character))
+
+    def _make_two_character_token(self, token_type: TokenType) -> Token:
+        prefix = self._character
+        self._read_character()
+        suffix = self._character
+
+        return Token(token_type, f'{prefix}{suffix}')
+
+    def _peek_character(self) -> str:
+        if self._read_position >= len(self._source):
+            return ''
+
+        return self._source[self._read_position]
+
+    def _read_character(self) -> None:
+        if self._read_position >= len(self._source):
+            self._character = ''
+        else:
+            self._character = self._source[self._read_position]
+
+        self._position = self._read_position
+        self._read_position += 1
+
+    def _read_identifier(self) -> str:
+        initial_position = self._position
+
+        is_first_letter = True
+        while self._is_letter(self._character) or \
+                (not is_first_letter and self._is_number(self._character)):
+            self._read_character()
+            is_first_letter = False
+
+        return self._source[initial_position:self._position]
+
+    def _read_number(self) -> str:
+        initial_position = self._position
+
+        while self._is_number(self._character):
+            self._read_character()
+
+        return self._source[initial_position:self._position]
+
+    def _read_string(self) -> str:
+        self._read_character()
+
+        initial_position = self._position
+
+        while self._character != '"' \
+                and self._read_position <= len(self._source):
+            self._read_character()
+
+        string = self._source[initial_position:self._position]
+
+        self._read_character()
+
+        return string
+
+    def _skip_whitespace(self) -> None:
+        while match(r'^\s$', self._character):
+            self._read_character()
+
+
+def _lookup_token_type(literal: str) -> TokenType:
+    # Built on every call, like it was then.
+    keywords: Dict[str, TokenType] = {
+        'falso': TokenType.FALSE,
+        'procedimiento': TokenType.FUNCTION,
+        'regresa': TokenType.RETURN,
+        'si': TokenType.IF,
+        'si_no': TokenType.ELSE,
+        'variable': TokenType.LET,
+        'verdadero': TokenType.TRUE,
+    }
+
+    return keywords.get(literal, TokenType.IDENT)
+
+
+def lex(new_lexer: Callable[[str], object], source: str) -> int:
+    lexer = new_lexer(source)
+
+    tokens: int = 0
+    while lexer.next_token().token_type != TokenType.EOF:  # type: ignore
+        tokens += 1
+
+    return tokens
+
+
+def best_time(new_lexer: Callable[[str], object],
+              source: str,
+              rounds: int) -> float:
+    best: float = float('inf')
+    for _ in range(rounds):
+        start = perf_counter()
+        lex(new_lexer, source)
+        best = min(best, perf_counter() - start)
+
+    return best
+
+
+def main() -> None:
+    argument_parser = ArgumentParser(
+        description='Compare the table-driven lexer with the regular '
+                    'expression one it replaced.')
+    argument_parser.add_argument('--repetitions', type=int, default=300)
+    argument_parser.add_argument('--rounds', type=int, default=10)
+    argument_parser.add_argument('--minimum-speedup', type=float, default=10,
+                                 help='fail when the table-driven lexer is '
+                                      'less than this many times faster')
+    arguments = argument_parser.parse_args()
+
+    source: str = realistic(arguments.repetitions)
+    tokens = lex(Lexer, source)
+    if lex(RegexLexer, source) != tokens:
+        exit('The lexers disagree on the number of tokens.')
+
+    before = best_time(RegexLexer, source, arguments.rounds)
+    after = best_time(Lexer, source, arguments.rounds)
+    speedup = before / after
+
+    print(f'Lexer: {len(source)} characters, {tokens} tokens, '
+          f'best of {arguments.rounds}')
+    print(f'{"regex":>8}: {before:.4f}s, {tokens / before:,.0f} tokens/s')
+    print(f'{"table":>8}: {after:.4f}s, {tokens / after:,.0f} tokens/s')
+    print(f'{speedup:.1f}x faster')
+
+    if speedup < arguments.minimum_speedup:
+        exit(f'Less than {arguments.minimum_speedup:g}x faster.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import (
+    Dict,
+    List,
+)
+
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+from lpp.repl import (
+    ENGINES,
+    Engine,
+)
+
+
+# Both count from 0 to n, comparing and adding once per step.
+PROGRAMS: Dict[str, str] = {
+    'mientras': '''
+        variable contar = procedimiento(n) {
+            variable i = 0;
+            mientras (i < n) {
+                i = i + 1;
+            }
+            i
+        };
+        contar({iterations});
+    ''',
+    # The call is returned, so it runs at any depth in every engine.
+    'recursión': '''
+        variable contar = procedimiento(i, n) {
+            si (i < n) { regresa contar(i + 1, n); }
+            regresa i;
+        };
+        contar(0, {iterations});
+    ''',
+}
+
+
+def measure(engine: Engine, name: str, iterations: int) -> float:
+    source = PROGRAMS[name].replace('{iterations}', str(iterations))
+    program = Parser(Lexer(source)).parse_program()
+
+    start_time = perf_counter()
+    evaluated = engine(program, Environment())
+    seconds = perf_counter() - start_time
+
+    assert evaluated is not None and evaluated.inspect() == str(iterations)
+    return seconds
+
+
+def main() -> None:
+    argument_parser = ArgumentParser(
+        description='Compare counting with a mientras loop and with a '
+                    'recursive procedimiento in every engine.')
+    argument_parser.add_argument('--engine', action='append',
+                                 choices=list(ENGINES), dest='engines')
+    argument_parser.add_argument('iterations', type=int, nargs='?',
+                                 default=10_000_000)
+    arguments = argument_parser.parse_args()
+
+    engine_names: List[str] = arguments.engines or list(ENGINES)
+    iterations: int = arguments.iterations
+
+    print(f'{iterations:,} iterations')
+    for engine_name in engine_names:
+        engine = ENGINES[engine_name]
+        loop = measure(engine, 'mientras', iterations)
+        recursion = measure(engine, 'recursión', iterations)
+
+        print(f'    {engine_name}: mientras {loop:.3f}s, '
+              f'recursión {recursion:.3f}s, {recursion / loop:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+from argparse import ArgumentParser
+from timeit import repeat
+import tracemalloc
+from typing import (
+    Any,
+    Callable,
+    List,
+    Tuple,
+)
+
+from lpp.evaluator import (
+    TRUE,
+    _TYPE_MISMATCH,
+    _UNKNOWN_INFIX_OPERATOR,
+    _evaluate_infix_expression,
+    _evaluate_integer_infix_expression,
+    _evaluate_string_infix_expression,
+    _new_error,
+    _to_boolean_object,
+)
+from lpp.object import (
+    Integer,
+    Object,
+    ObjectType,
+    String,
+)
+
+
+class DictInteger:
+    """Integer the way it was before objects had slots and type tags."""
+
+    def __init__(self, value: int) -> None:
+        self.value = value
+
+    def type(self) -> ObjectType:
+        return ObjectType.INTEGER
+
+
+class DictString:
+    """String the way it was before objects had slots and type tags."""
+
+    def __init__(self, value: str) -> None:
+        self.value = value
+
+    def type(self) -> ObjectType:
+        return ObjectType.STRING
+
+
+def infix_before(operator: str, left: Any, right: Any) -> Object:
+    """Evaluate an infix expression calling type() on its operands, the way
+    the evaluator did before objects had type tags."""
+    if left.type() == ObjectType.INTEGER \
+            and right.type() == ObjectType.INTEGER:
+        return _evaluate_integer_infix_expression(operator, left, right)
+    elif left.type() == ObjectType.STRING \
+            and right.type() == ObjectType.STRING:
+        if operator == '+':
+            return String(left.value + right.value)
+
+        return _evaluate_string_infix_expression(operator, left, right)
+    elif operator == '==':
+        return _to_boolean_object(left is right)
+    elif operator == '!=':
+        return _to_boolean_object(left is not right)
+    elif left.type() != right.type():
+        return _new_error(_TYPE_MISMATCH, [left.type().name,
+                                           operator,
+                                           right.type().name])
+    else:
+        return _new_error(_UNKNOWN_INFIX_OPERATOR, [left.type().name,
+                                                    operator,
+                                                    right.type().name])
+
+
+# What each infix expression adds up or compares, before and now.
+EXPRESSIONS: List[Tuple[str, str, Tuple[Any, Any], Tuple[Object, Object]]] = [
+    ('1000 + 1000', '+',
+     (DictInteger(1000), DictInteger(1000)), (Integer(1000), Integer(1000))),
+    ('1000 < 1000', '<',
+     (DictInteger(1000), DictInteger(1000)), (Integer(1000), Integer(1000))),
+    ('"a" + "b"', '+',
+     (DictString('a'), DictString('b')), (String('a'), String('b'))),
+    ('verdadero == 1', '==',
+     (TRUE, DictInteger(1)), (TRUE, Integer(1))),
+]
+
+
+def bytes_per_value(create: Callable[[Any], Any],
+                    arguments: List[Any]) -> float:
+    """Return what creating an object for every argument allocates, for
+    each object."""
+    tracemalloc.start()
+    values = [create(argument) for argument in arguments]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # The list holding them is not part of any value.
+    return (current - values.__sizeof__()) / len(arguments)
+
+
+def nanoseconds(run: Callable[[], Any], number: int) -> float:
+    best = min(repeat(run, number=number, repeat=5))
+
+    return best / number * 1e9
+
+
+def main() -> None:
+    argument_parser = ArgumentParser(
+        description='Compare the memory and creation time of objects with '
+                    'and without slots, and the cost of evaluating infix '
+                    'expressions calling type() and reading type tags.')
+    argument_parser.add_argument('--number', type=int, default=200000)
+    arguments = argument_parser.parse_args()
+    number: int = arguments.number
+
+    print(f'{"object":>20} {"before":>16} {"now":>16}')
+    integers: List[Any] = list(range(1000, 1000 + number))
+    strings: List[Any] = [str(value) for value in integers]
+    for name, before, now, values in [
+            ('Integer', DictInteger, Integer, integers),
+            ('String', DictString, String, strings)]:
+        before_bytes = bytes_per_value(before, values)
+        now_bytes = bytes_per_value(now, values)
+        before_time = nanoseconds(lambda: before(values[0]), number)
+        now_time = nanoseconds(lambda: now(values[0]), number)
+        print(f'{name:>20} {before_bytes:>5.0f}B {before_time:>6.0f}ns '
+              f'{now_bytes:>5.0f}B {now_time:>6.0f}ns')
+
+    print()
+    print(f'{"expression":>20} {"before":>8} {"now":>8}')
+    for source, operator, (left, right), (now_left, now_right) \
+            in EXPRESSIONS:
+        before_time = nanoseconds(
+            lambda: infix_before(operator, left, right), number)
+        now_time = nanoseconds(
+            lambda: _evaluate_infix_expression(operator, now_left, now_right),
+            number)
+        print(f'{source:>20} {before_time:>6.0f}ns {now_time:>6.0f}ns')
+
+
+if __name__ == '__main__':
+    main()
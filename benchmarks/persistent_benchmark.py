@@ -0,0 +1,110 @@
+from argparse import ArgumentParser
+from random import Random
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+)
+
+from lpp.persistent import (
+    Map,
+    Vector,
+)
+
+
+def microseconds(operation: Callable[[Any], Any], arguments: List[Any]) -> float:
+    """Return the microseconds `operation` takes for every argument, the
+    best of three runs."""
+    best = float('inf')
+    for _ in range(3):
+        start_time = perf_counter()
+        for argument in arguments:
+            operation(argument)
+        best = min(best, perf_counter() - start_time)
+
+    return best / len(arguments) * 1e6
+
+
+def copy_and_append(elements: List[Any], element: Any) -> List[Any]:
+    """Append the way an array without shared structure would."""
+    return elements + [element]
+
+
+def copy_and_set(elements: Any, key: Any, value: Any) -> Any:
+    copy = elements.copy()
+    copy[key] = value
+
+    return copy
+
+
+def main() -> None:
+    argument_parser = ArgumentParser(
+        description='Compare appending, updating and looking up elements of '
+                    'persistent vectors and maps with copying a list or a '
+                    'dict on every update.')
+    argument_parser.add_argument('--size', type=int, default=10 ** 6)
+    argument_parser.add_argument('--operations', type=int, default=1000)
+    arguments = argument_parser.parse_args()
+    size: int = arguments.size
+    operations: int = arguments.operations
+
+    random = Random(0)
+    indexes = [random.randrange(size) for _ in range(operations)]
+    keys = [f'llave{index}' for index in indexes]
+
+    start_time = perf_counter()
+    vector: Vector[int] = Vector()
+    for element in range(size):
+        vector = vector.append(element)
+    vector_seconds = perf_counter() - start_time
+
+    start_time = perf_counter()
+    persistent_map: Map[str, int] = Map()
+    for element in range(size):
+        persistent_map = persistent_map.set(f'llave{element}', element)
+    map_seconds = perf_counter() - start_time
+
+    elements = list(range(size))
+    dictionary: Dict[str, int] = {f'llave{element}': element
+                                  for element in range(size)}
+
+    print(f'Building {size:,} elements one at a time: vector '
+          f'{vector_seconds:.2f}s, map {map_seconds:.2f}s. Copying on every '
+          f'update would copy {size * (size - 1) // 2:,} elements.')
+    print()
+
+    # Copying a million elements takes milliseconds, a few of them are
+    # enough to know what one takes.
+    copies = indexes[:max(1, operations // 100)]
+    copy_keys = keys[:len(copies)]
+
+    print(f'{"operation":>20} {"copy on write":>16} {"persistent":>14}')
+    results = [
+        ('vector append',
+         microseconds(lambda index: copy_and_append(elements, index), copies),
+         microseconds(vector.append, indexes)),
+        ('vector update',
+         microseconds(lambda index: copy_and_set(elements, index, -1), copies),
+         microseconds(lambda index: vector.set(index, -1), indexes)),
+        ('vector lookup',
+         microseconds(elements.__getitem__, indexes),
+         microseconds(vector.__getitem__, indexes)),
+        ('map update',
+         microseconds(lambda key: copy_and_set(dictionary, key, -1), copy_keys),
+         microseconds(lambda key: persistent_map.set(key, -1), keys)),
+        ('map insert',
+         microseconds(lambda key: copy_and_set(dictionary, key + '!', -1),
+                      copy_keys),
+         microseconds(lambda key: persistent_map.set(key + '!', -1), keys)),
+        ('map lookup',
+         microseconds(dictionary.__getitem__, keys),
+         microseconds(persistent_map.get, keys)),
+    ]
+    for name, copy_time, persistent_time in results:
+        print(f'{name:>20} {copy_time:>14.2f}us {persistent_time:>12.2f}us')
+
+
+if __name__ == '__main__':
+    main()
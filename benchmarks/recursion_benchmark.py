@@ -0,0 +1,79 @@
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import (
+    Dict,
+    List,
+)
+
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+from lpp.repl import (
+    ENGINES,
+    Engine,
+)
+
+
+PROGRAMS: Dict[str, str] = {
+    # Every level stays alive until the deepest one returns.
+    'cuenta': '''
+        variable cuenta = procedimiento(n) {
+            si (n == 0) { regresa 0; }
+            regresa 1 + cuenta(n - 1);
+        };
+    ''',
+    # Every call returns the next one, in accumulator style.
+    'contar': '''
+        variable contar = procedimiento(n, acc) {
+            si (n == 0) { regresa acc; }
+            regresa contar(n - 1, acc + 1);
+        };
+    ''',
+}
+
+CALLS: Dict[str, str] = {
+    'cuenta': 'cuenta({depth});',
+    'contar': 'contar({depth}, 0);',
+}
+
+
+def measure(engine: Engine, name: str, depth: int) -> str:
+    source = PROGRAMS[name] + CALLS[name].format(depth=depth)
+    program = Parser(Lexer(source)).parse_program()
+
+    start_time = perf_counter()
+    try:
+        evaluated = engine(program, Environment())
+    except RecursionError:
+        return 'RecursionError'
+    seconds = perf_counter() - start_time
+
+    assert evaluated is not None and evaluated.inspect() == str(depth)
+    return f'{seconds:.3f}s ({seconds / depth * 1e6:.1f}µs per call)'
+
+
+def main() -> None:
+    argument_parser = ArgumentParser(
+        description='Measure how deep every engine recurses, with the '
+                    'default recursion limit of Python.')
+    argument_parser.add_argument('--engine', action='append',
+                                 choices=list(ENGINES), dest='engines')
+    argument_parser.add_argument('--program', action='append',
+                                 choices=list(PROGRAMS), dest='programs')
+    argument_parser.add_argument('depths', type=int, nargs='*',
+                                 default=[1000, 100000, 1000000])
+    arguments = argument_parser.parse_args()
+
+    engines: Dict[str, Engine] = {name: ENGINES[name]
+                                  for name in arguments.engines or ENGINES}
+    depths: List[int] = arguments.depths
+
+    for name in arguments.programs or PROGRAMS:
+        for depth in depths:
+            print(f'{name}, {depth:,} calls')
+            for engine_name, engine in engines.items():
+                print(f'    {engine_name}: {measure(engine, name, depth)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+from argparse import ArgumentParser
+from contextlib import contextmanager
+import sys
+from time import perf_counter
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+)
+
+import lpp.object
+from lpp.lexer import Lexer
+from lpp.object import Environment
+from lpp.parser import Parser
+from lpp.repl import (
+    ENGINES,
+    Engine,
+)
+
+
+# Every piece is a line of a hundred characters.
+LINE: str = 'x' * 99 + '.'
+
+
+# Programs that build a string of the given number of lines one line at a
+# time, and measure it.
+PROGRAMS: Dict[str, Callable[[int], str]] = {
+    'mientras': lambda lines: f'''
+        variable reporte = "";
+        variable i = 0;
+        mientras (i < {lines}) {{
+            reporte = reporte + "{LINE}";
+            i = i + 1;
+        }}
+        longitud(reporte);
+    ''',
+    'recursivo': lambda lines: f'''
+        variable reporte = procedimiento(n, texto) {{
+            si (n == 0) {{
+                regresa texto;
+            }}
+            regresa reporte(n - 1, texto + "{LINE}");
+        }};
+        longitud(reporte({lines}, ""));
+    ''',
+}
+
+
+@contextmanager
+def ropes_disabled() -> Iterator[None]:
+    """Copy both strings on every concatenation, like before strings could
+    be ropes."""
+    minimum = lpp.object._ROPE_MIN_LENGTH
+    lpp.object._ROPE_MIN_LENGTH = sys.maxsize
+    try:
+        yield
+    finally:
+        lpp.object._ROPE_MIN_LENGTH = minimum
+
+
+def seconds(engine: Engine, name: str, lines: int) -> float:
+    program = Parser(Lexer(PROGRAMS[name](lines))).parse_program()
+
+    start_time = perf_counter()
+    evaluated = engine(program, Environment())
+    elapsed = perf_counter() - start_time
+
+    assert evaluated is not None
+    assert evaluated.inspect() == str(lines * len(LINE))
+    return elapsed
+
+
+def main() -> None:
+    argument_parser = ArgumentParser(
+        description='Measure how long building a string one line at a time '
+                    'takes with ropes and copying it on every concatenation.')
+    argument_parser.add_argument('--engine', action='append',
+                                 choices=list(ENGINES), dest='engines')
+    argument_parser.add_argument('--program', action='append',
+                                 choices=list(PROGRAMS), dest='programs')
+    argument_parser.add_argument('--lines', action='append', type=int)
+    # Copying takes quadratic time, a hundred thousand lines take hours.
+    argument_parser.add_argument('--max-copied-lines', type=int, default=10000)
+    arguments = argument_parser.parse_args()
+    line_counts: List[int] = arguments.lines or [1000, 10000, 100000]
+
+    for name in arguments.programs or PROGRAMS:
+        print(name)
+        print(f'    {"engine":>10} {"lines":>8} {"size":>8} '
+              f'{"copied":>10} {"ropes":>10}')
+        for engine_name in arguments.engines or ENGINES:
+            engine = ENGINES[engine_name]
+            for lines in line_counts:
+                copied = '-'
+                if lines <= arguments.max_copied_lines:
+                    with ropes_disabled():
+                        copied = f'{seconds(engine, name, lines):.3f}s'
+                ropes = f'{seconds(engine, name, lines):.3f}s'
+                size = f'{lines * len(LINE) / 1e6:g}MB'
+
+                print(f'    {engine_name:>10} {lines:>8} {size:>8} '
+                      f'{copied:>10} {ropes:>10}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,515 @@
+from array import array
+from enum import IntEnum
+from marshal import (
+    dumps,
+    loads,
+)
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import lpp.ast as ast
+from lpp.lexer import (
+    Lexer,
+    TokenBuffer,
+)
+from lpp.parser import Parser
+from lpp.token import (
+    Token,
+    TokenType,
+)
+
+
+class NodeKind(IntEnum):
+    PROGRAM = 0
+    LET = 1
+    RETURN = 2
+    EXPRESSION = 3
+    BLOCK = 4
+    IDENTIFIER = 5
+    INTEGER = 6
+    STRING = 7
+    BOOLEAN = 8
+    PREFIX = 9
+    INFIX = 10
+    IF = 11
+    FUNCTION = 12
+    CALL = 13
+    WHILE = 14
+    ASSIGN = 15
+    ARRAY = 16
+    INDEX = 17
+    HASH = 18
+
+
+OPERATORS: List[str] = ['+', '-', '*', '/', '<', '>', '==', '!=', '!']
+
+NO_NODE: int = -1
+
+Literal = Union[int, str]
+
+_FORMAT_VERSION: int = 1
+
+
+class Arena:
+    """Program stored as parallel arrays instead of a graph of nodes.
+
+    Nodes are referred to by their index, children always come before their
+    parent and the program is the last node. Every node has a kind, a value
+    and up to three children, plus a run of extra children in `_lists` for
+    the statements of a program or block, the parameters of a function and
+    the arguments of a call and the elements of an array or hash:
+
+    - LET, ASSIGN: first is the name, second the value.
+    - RETURN, EXPRESSION: first is the expression.
+    - IDENTIFIER, INTEGER, STRING: value is an index in the literal table.
+    - BOOLEAN: value is 1 or 0.
+    - PREFIX, INFIX: value is an index in OPERATORS, first and second are
+      the operands.
+    - IF: first is the condition, second the consequence and third the
+      alternative.
+    - WHILE: first is the condition, second the body.
+    - FUNCTION: first is the body, the list holds the parameters.
+    - CALL: first is the function, the list holds the arguments.
+    - ARRAY: the list holds the elements.
+    - INDEX: first is the indexed expression, second the index.
+    - HASH: the list holds the keys and values alternating.
+    - PROGRAM, BLOCK: the list holds the statements.
+    """
+
+    def __init__(self) -> None:
+        self._kinds: array = array('B')
+        self._values: array = array('i')
+        self._first: array = array('i')
+        self._second: array = array('i')
+        self._third: array = array('i')
+        self._list_starts: array = array('I')
+        self._list_lengths: array = array('I')
+        self._lists: array = array('i')
+        self._literals: List[Literal] = []
+        self._literal_indexes: Dict[Tuple[type, Literal], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._kinds)
+
+    @classmethod
+    def from_program(cls, program: ast.Program) -> 'Arena':
+        arena = cls()
+        arena.add_program(program.statements)
+
+        return arena
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Arena':
+        version, kinds, values, first, second, third, list_starts, \
+            list_lengths, lists, literals = loads(data)
+
+        if version != _FORMAT_VERSION:
+            raise ValueError(f'Versión de arena desconocida: {version}')
+
+        arena = cls()
+        arena._kinds.frombytes(kinds)
+        arena._values.frombytes(values)
+        arena._first.frombytes(first)
+        arena._second.frombytes(second)
+        arena._third.frombytes(third)
+        arena._list_starts.frombytes(list_starts)
+        arena._list_lengths.frombytes(list_lengths)
+        arena._lists.frombytes(lists)
+        arena._literals = list(literals)
+        arena._literal_indexes = {
+            (type(literal), literal): index
+            for index, literal in enumerate(arena._literals)
+        }
+
+        return arena
+
+    @property
+    def root(self) -> int:
+        return len(self._kinds) - 1
+
+    def add_program(self, statements: Iterable[ast.Statement]) -> int:
+        indexes = [self.add(statement) for statement in statements]
+
+        return self._append(NodeKind.PROGRAM, children=indexes)
+
+    def add(self, node: ast.ASTNode) -> int:
+        """Append `node` and everything below it, and return its index."""
+        if isinstance(node, ast.LetStatement):
+            assert node.name is not None and node.value is not None
+            return self._append(NodeKind.LET,
+                                first=self.add(node.name),
+                                second=self.add(node.value))
+        elif isinstance(node, ast.ReturnStatement):
+            assert node.return_value is not None
+            return self._append(NodeKind.RETURN,
+                                first=self.add(node.return_value))
+        elif isinstance(node, ast.ExpressionStatement):
+            assert node.expression is not None
+            return self._append(NodeKind.EXPRESSION,
+                                first=self.add(node.expression))
+        elif isinstance(node, ast.Block):
+            return self._append(NodeKind.BLOCK,
+                                children=[self.add(statement)
+                                          for statement in node.statements])
+        elif isinstance(node, ast.Identifier):
+            return self._append(NodeKind.IDENTIFIER,
+                                value=self._literal(node.value))
+        elif isinstance(node, ast.Integer):
+            assert node.value is not None
+            return self._append(NodeKind.INTEGER,
+                                value=self._literal(node.value))
+        elif isinstance(node, ast.StringLiteral):
+            return self._append(NodeKind.STRING,
+                                value=self._literal(node.value))
+        elif isinstance(node, ast.Boolean):
+            return self._append(NodeKind.BOOLEAN, value=int(bool(node.value)))
+        elif isinstance(node, ast.Prefix):
+            assert node.right is not None
+            return self._append(NodeKind.PREFIX,
+                                value=OPERATORS.index(node.operator),
+                                first=self.add(node.right))
+        elif isinstance(node, ast.Infix):
+            assert node.right is not None
+            return self._append(NodeKind.INFIX,
+                                value=OPERATORS.index(node.operator),
+                                first=self.add(node.left),
+                                second=self.add(node.right))
+        elif isinstance(node, ast.If):
+            assert node.condition is not None and node.consequence is not None
+            return self._append(
+                NodeKind.IF,
+                first=self.add(node.condition),
+                second=self.add(node.consequence),
+                third=self.add(node.alternative) if node.alternative else NO_NODE
+            )
+        elif isinstance(node, ast.Function):
+            assert node.body is not None
+            parameters = [self.add(parameter) for parameter in node.parameters]
+            return self._append(NodeKind.FUNCTION,
+                                first=self.add(node.body),
+                                children=parameters)
+        elif isinstance(node, ast.Call):
+            assert node.arguments is not None
+            function = self.add(node.function)
+            return self._append(NodeKind.CALL,
+                                first=function,
+                                children=[self.add(argument)
+                                          for argument in node.arguments])
+        elif isinstance(node, ast.WhileStatement):
+            assert node.condition is not None and node.body is not None
+            return self._append(NodeKind.WHILE,
+                                first=self.add(node.condition),
+                                second=self.add(node.body))
+        elif isinstance(node, ast.AssignStatement):
+            assert node.name is not None and node.value is not None
+            return self._append(NodeKind.ASSIGN,
+                                first=self.add(node.name),
+                                second=self.add(node.value))
+
+        elif isinstance(node, ast.ArrayLiteral):
+            assert node.elements is not None
+            return self._append(NodeKind.ARRAY,
+                                children=[self.add(element)
+                                          for element in node.elements])
+        elif isinstance(node, ast.HashLiteral):
+            assert node.pairs is not None
+            return self._append(NodeKind.HASH,
+                                children=[self.add(item)
+                                          for pair in node.pairs
+                                          for item in pair])
+        elif isinstance(node, ast.Index):
+            assert node.index is not None
+            return self._append(NodeKind.INDEX,
+                                first=self.add(node.left),
+                                second=self.add(node.index))
+
+        raise TypeError(f'Nodo sin soporte en la arena: {type(node).__name__}')
+
+    def children(self, index: int) -> List[int]:
+        """Return the children of the node at `index` in source order."""
+        kind = self._kinds[index]
+        fixed = [child
+                 for child in (self._first[index],
+                               self._second[index],
+                               self._third[index])
+                 if child != NO_NODE]
+        listed = self.list(index)
+
+        if kind == NodeKind.FUNCTION:
+            return listed + fixed
+
+        return fixed + listed
+
+    def first(self, index: int) -> int:
+        return self._first[index]
+
+    def kind(self, index: int) -> NodeKind:
+        return NodeKind(self._kinds[index])
+
+    def list(self, index: int) -> List[int]:
+        start = self._list_starts[index]
+
+        return self._lists[start:start + self._list_lengths[index]].tolist()
+
+    def literal(self, index: int) -> Literal:
+        return self._literals[self._values[index]]
+
+    def operator(self, index: int) -> str:
+        return OPERATORS[self._values[index]]
+
+    def second(self, index: int) -> int:
+        return self._second[index]
+
+    def third(self, index: int) -> int:
+        return self._third[index]
+
+    def to_bytes(self) -> bytes:
+        return dumps((
+            _FORMAT_VERSION,
+            self._kinds.tobytes(),
+            self._values.tobytes(),
+            self._first.tobytes(),
+            self._second.tobytes(),
+            self._third.tobytes(),
+            self._list_starts.tobytes(),
+            self._list_lengths.tobytes(),
+            self._lists.tobytes(),
+            tuple(self._literals),
+        ))
+
+    def to_node(self, index: int) -> ast.ASTNode:
+        """Rebuild the node at `index`, and everything below it, as
+        `lpp.ast` objects.
+
+        The nodes below `index` are the run of indexes right before it, so
+        they are rebuilt in a single pass in index order, children before
+        their parents, with the tokens shared between nodes.
+        """
+        kinds = self._kinds
+        values = self._values
+        firsts = self._first
+        seconds = self._second
+        thirds = self._third
+        list_starts = self._list_starts
+        list_lengths = self._list_lengths
+        lists = self._lists
+
+        start = self._subtree_start(index)
+        nodes: List[Any] = []
+        literal_tokens: Dict[int, Token] = {}
+
+        for node_index in range(start, index + 1):
+            kind = kinds[node_index]
+            node: ast.ASTNode
+
+            if kind == _IDENTIFIER or kind == _INTEGER or kind == _STRING:
+                value = values[node_index]
+                literal = self._literals[value]
+                token = literal_tokens.get(value)
+                if token is None:
+                    token = Token(_LITERAL_TOKEN_TYPES[kind], str(literal))
+                    literal_tokens[value] = token
+
+                if kind == _IDENTIFIER:
+                    node = ast.Identifier(token, str(literal))
+                elif kind == _INTEGER:
+                    node = ast.Integer(token, int(literal))
+                else:
+                    node = ast.StringLiteral(token, str(literal))
+            elif kind == _INFIX:
+                operator = OPERATORS[values[node_index]]
+                node = ast.Infix(_OPERATOR_TOKENS[operator],
+                                 nodes[firsts[node_index] - start],
+                                 operator,
+                                 nodes[seconds[node_index] - start])
+            elif kind == _EXPRESSION:
+                expression = nodes[firsts[node_index] - start]
+                node = ast.ExpressionStatement(expression.token, expression)
+            elif kind == _CALL:
+                list_start = list_starts[node_index]
+                node = ast.Call(_CALL_TOKEN,
+                                nodes[firsts[node_index] - start],
+                                [nodes[child - start]
+                                 for child in lists[list_start:list_start
+                                                    + list_lengths[node_index]]])
+            elif kind == _LET:
+                node = ast.LetStatement(_LET_TOKEN,
+                                        nodes[firsts[node_index] - start],
+                                        nodes[seconds[node_index] - start])
+            elif kind == _RETURN:
+                node = ast.ReturnStatement(_RETURN_TOKEN,
+                                           nodes[firsts[node_index] - start])
+            elif kind == _BLOCK or kind == _PROGRAM:
+                list_start = list_starts[node_index]
+                statements = [nodes[child - start]
+                              for child in lists[list_start:list_start
+                                                 + list_lengths[node_index]]]
+                if kind == _BLOCK:
+                    node = ast.Block(_BLOCK_TOKEN, statements)
+                else:
+                    node = ast.Program(statements)
+            elif kind == _BOOLEAN:
+                node = ast.Boolean(_TRUE_TOKEN, True) if values[node_index] \
+                    else ast.Boolean(_FALSE_TOKEN, False)
+            elif kind == _PREFIX:
+                operator = OPERATORS[values[node_index]]
+                node = ast.Prefix(_OPERATOR_TOKENS[operator],
+                                  operator,
+                                  nodes[firsts[node_index] - start])
+            elif kind == _IF:
+                alternative = thirds[node_index]
+                node = ast.If(_IF_TOKEN,
+                              nodes[firsts[node_index] - start],
+                              nodes[seconds[node_index] - start],
+                              nodes[alternative - start]
+                              if alternative != NO_NODE else None)
+            elif kind == _WHILE:
+                node = ast.WhileStatement(_WHILE_TOKEN,
+                                          nodes[firsts[node_index] - start],
+                                          nodes[seconds[node_index] - start])
+            elif kind == _ASSIGN:
+                name = nodes[firsts[node_index] - start]
+                node = ast.AssignStatement(name.token,
+                                           name,
+                                           nodes[seconds[node_index] - start])
+            elif kind == _FUNCTION:
+                list_start = list_starts[node_index]
+                node = ast.Function(_FUNCTION_TOKEN,
+                                    [nodes[child - start]
+                                     for child in lists[list_start:list_start
+                                                        + list_lengths[node_index]]],
+                                    nodes[firsts[node_index] - start])
+            elif kind == _ARRAY:
+                list_start = list_starts[node_index]
+                node = ast.ArrayLiteral(_ARRAY_TOKEN,
+                                        [nodes[child - start]
+                                         for child in lists[list_start:list_start
+                                                            + list_lengths[node_index]]])
+            elif kind == _HASH:
+                list_start = list_starts[node_index]
+                items = [nodes[child - start]
+                         for child in lists[list_start:list_start
+                                            + list_lengths[node_index]]]
+                node = ast.HashLiteral(_HASH_TOKEN,
+                                       list(zip(items[::2], items[1::2])))
+            elif kind == _INDEX:
+                node = ast.Index(_ARRAY_TOKEN,
+                                 nodes[firsts[node_index] - start],
+                                 nodes[seconds[node_index] - start])
+            else:
+                raise ValueError(f'Tipo de nodo desconocido: {kind}')
+
+            nodes.append(node)
+
+        return nodes[-1]
+
+    def walk(self, index: Optional[int] = None) -> Iterator[int]:
+        """Yield the index of the node at `index`, the program by default,
+        and of every node below it, parents before children."""
+        stack: List[int] = [self.root if index is None else index]
+
+        while stack:
+            index = stack.pop()
+            yield index
+
+            stack.extend(reversed(self.children(index)))
+
+    def _append(self,
+                kind: NodeKind,
+                value: int = 0,
+                first: int = NO_NODE,
+                second: int = NO_NODE,
+                third: int = NO_NODE,
+                children: Sequence[int] = ()) -> int:
+        self._kinds.append(kind)
+        self._values.append(value)
+        self._first.append(first)
+        self._second.append(second)
+        self._third.append(third)
+        self._list_starts.append(len(self._lists))
+        self._list_lengths.append(len(children))
+        self._lists.extend(children)
+
+        return len(self._kinds) - 1
+
+    def _literal(self, literal: Literal) -> int:
+        key = (type(literal), literal)
+        if key not in self._literal_indexes:
+            self._literal_indexes[key] = len(self._literals)
+            self._literals.append(literal)
+
+        return self._literal_indexes[key]
+
+    def _subtree_start(self, index: int) -> int:
+        # Children are added in source order, so the first node added for
+        # a subtree is found by following the first child down.
+        while True:
+            first = self._first[index]
+            if self._list_lengths[index]:
+                listed = self._lists[self._list_starts[index]]
+                first = listed if first == NO_NODE else min(first, listed)
+
+            if first == NO_NODE:
+                return index
+
+            index = first
+
+
+def parse(lexer: Union[Lexer, TokenBuffer]) -> Tuple[Arena, List[str]]:
+    """Parse a program straight into an `Arena` and return it together with
+    the parse errors.
+
+    Statements are moved into the arena as soon as they are parsed, so only
+    one of them exists as `lpp.ast` objects at any time.
+    """
+    parser = Parser(lexer)
+    arena = Arena()
+
+    # Statements parsed after an error may be incomplete, they are only
+    # parsed to report the rest of the errors.
+    arena.add_program(statement
+                      for statement in parser.parse_statements()
+                      if not parser.errors)
+
+    return arena, parser.errors
+
+
+def _operator_token(operator: str) -> Token:
+    return Lexer(operator).next_token()
+
+
+# Plain ints, comparing them is cheaper than comparing enum members.
+_PROGRAM, _LET, _RETURN, _EXPRESSION, _BLOCK, _IDENTIFIER, _INTEGER, \
+    _STRING, _BOOLEAN, _PREFIX, _INFIX, _IF, _FUNCTION, _CALL, _WHILE, \
+    _ASSIGN, _ARRAY, _INDEX, _HASH = [int(kind) for kind in NodeKind]
+
+_LITERAL_TOKEN_TYPES: Dict[int, TokenType] = {
+    _IDENTIFIER: TokenType.IDENT,
+    _INTEGER: TokenType.INT,
+    _STRING: TokenType.STRING,
+}
+
+_OPERATOR_TOKENS: Dict[str, Token] = {
+    operator: _operator_token(operator) for operator in OPERATORS
+}
+
+_ARRAY_TOKEN: Token = Token(TokenType.LBRACKET, '[')
+_BLOCK_TOKEN: Token = Token(TokenType.LBRACE, '{')
+_CALL_TOKEN: Token = Token(TokenType.LPAREN, '(')
+_FALSE_TOKEN: Token = Token(TokenType.FALSE, 'falso')
+_FUNCTION_TOKEN: Token = Token(TokenType.FUNCTION, 'procedimiento')
+_HASH_TOKEN: Token = Token(TokenType.LBRACE, '{')
+_IF_TOKEN: Token = Token(TokenType.IF, 'si')
+_LET_TOKEN: Token = Token(TokenType.LET, 'variable')
+_RETURN_TOKEN: Token = Token(TokenType.RETURN, 'regresa')
+_TRUE_TOKEN: Token = Token(TokenType.TRUE, 'verdadero')
+_WHILE_TOKEN: Token = Token(TokenType.WHILE, 'mientras')
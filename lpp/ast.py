@@ -2,16 +2,28 @@ from abc import (
     ABC,
     abstractmethod,
 )
+from array import array
 from typing import (
+    Dict,
+    Iterator,
     List,
     Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TYPE_CHECKING,
 )
 
 from lpp.token import Token
 
+if TYPE_CHECKING:
+    from lpp.object import Integer as IntegerObject
+
 
 class ASTNode(ABC):
 
+    __slots__ = ()
+
     @abstractmethod
     def token_literal(self) -> str:
         pass
@@ -23,26 +35,56 @@ class ASTNode(ABC):
 
 class Statement(ASTNode):
 
+    __slots__ = ('token',)
+
     def __init__(self, token: Token) -> None:
-        self.token = token
+        # None once the parser has swapped the token for a span.
+        self.token: Optional[Token] = token
 
     def token_literal(self) -> str:
-        return self.token.literal
+        return self.token.literal if self.token is not None else ''
 
 
 class Expression(ASTNode):
 
+    __slots__ = ('token',)
+
     def __init__(self, token: Token) -> None:
-        self.token = token
+        # None once the parser has swapped the token for a span.
+        self.token: Optional[Token] = token
 
     def token_literal(self) -> str:
-        return self.token.literal
+        return self.token.literal if self.token is not None else ''
+
+
+class Scope:
+    """Names of the variables of a program or a procedimiento, in the order
+    of their slots. Parameters come first, and of repeated ones the last
+    wins, like in the evaluator."""
+
+    __slots__ = ('names', '_slots')
+
+    def __init__(self, names: Sequence[str]) -> None:
+        self.names: Tuple[str, ...] = tuple(names)
+        self._slots: Dict[str, int] = {
+            name: slot for slot, name in enumerate(names)
+        }
+
+    def slot(self, name: str) -> Optional[int]:
+        return self._slots.get(name)
 
 
 class Program(ASTNode):
 
+    __slots__ = ('statements', 'spans', 'scope')
+
     def __init__(self, statements: List[Statement]) -> None:
         self.statements = statements
+        # Start and end offsets of the token of every node, in the order of
+        # walk(), when the parser was asked not to keep tokens.
+        self.spans: Optional[array] = None
+        # Set by lpp.resolver.
+        self.scope: Optional[Scope] = None
 
     def token_literal(self) -> str:
         if len(self.statements) > 0:
@@ -58,11 +100,17 @@ class Program(ASTNode):
 
 class Identifier(Expression):
 
+    __slots__ = ('value', 'depth', 'slot')
+
     def __init__(self,
                  token: Token,
                  value: str) -> None:
         super().__init__(token)
         self.value = value
+        # Set by lpp.resolver: how many procedimientos out the variable is
+        # defined and its slot there, None for builtins and unknown names.
+        self.depth: Optional[int] = None
+        self.slot: Optional[int] = None
 
     def __str__(self) -> str:
         return self.value
@@ -70,6 +118,8 @@ class Identifier(Expression):
 
 class LetStatement(Statement):
 
+    __slots__ = ('name', 'value')
+
     def __init__(self, 
                  token: Token,
                  name: Optional[Identifier] = None,
@@ -79,23 +129,48 @@ class LetStatement(Statement):
         self.value = value
 
     def __str__(self) -> str:
-        return f'{self.token_literal()} {str(self.name)} = {str(self.value)};'
+        return f'variable {str(self.name)} = {str(self.value)};'
 
 
 class ReturnStatement(Statement):
 
+    __slots__ = ('return_value', 'tail', 'in_expression')
+
     def __init__(self,
                  token: Token,
                  return_value: Optional[Expression] = None) -> None:
         super().__init__(token)
         self.return_value = return_value
+        # Set by lpp.resolver when it returns a call from a procedimiento.
+        self.tail = False
+        # Set by lpp.resolver when it is in a `si` used as a value, so it
+        # has to leave the expressions around it to end the call.
+        self.in_expression = False
+
+    def __str__(self) -> str:
+        return f'regresa {str(self.return_value)};'
+
+
+class AssignStatement(Statement):
+
+    __slots__ = ('name', 'value')
+
+    def __init__(self,
+                 token: Token,
+                 name: Optional[Identifier] = None,
+                 value: Optional[Expression] = None) -> None:
+        super().__init__(token)
+        self.name = name
+        self.value = value
 
     def __str__(self) -> str:
-        return f'{self.token_literal()} {str(self.return_value)};'
+        return f'{str(self.name)} = {str(self.value)};'
 
 
 class ExpressionStatement(Statement):
 
+    __slots__ = ('expression',)
+
     def __init__(self,
                  token: Token,
                  expression: Optional[Expression] = None) -> None:
@@ -108,11 +183,16 @@ class ExpressionStatement(Statement):
 
 class Integer(Expression):
 
+    __slots__ = ('value', 'object')
+
     def __init__(self,
                  token: Token,
                  value: Optional[int] = None) -> None:
         super().__init__(token)
         self.value = value
+        # Set by the evaluators the first time the literal is evaluated, so
+        # every later evaluation returns the same object.
+        self.object: Optional['IntegerObject'] = None
 
     def __str__(self) -> str:
         return str(self.value)
@@ -120,6 +200,8 @@ class Integer(Expression):
 
 class Prefix(Expression):
 
+    __slots__ = ('operator', 'right')
+
     def __init__(self,
                  token: Token,
                  operator: str,
@@ -134,6 +216,8 @@ class Prefix(Expression):
 
 class Infix(Expression):
 
+    __slots__ = ('left', 'operator', 'right')
+
     def __init__(self,
                  token: Token,
                  left: Expression,
@@ -150,6 +234,8 @@ class Infix(Expression):
 
 class Boolean(Expression):
 
+    __slots__ = ('value',)
+
     def __init__(self,
                  token: Token,
                  value: Optional[bool] = None) -> None:
@@ -157,11 +243,13 @@ class Boolean(Expression):
         self.value = value
 
     def __str__(self) -> str:
-        return self.token_literal()
+        return 'verdadero' if self.value else 'falso'
 
 
 class Block(Statement):
 
+    __slots__ = ('statements',)
+
     def __init__(self,
                  token: Token,
                  statements: List[Statement]) -> None:
@@ -176,6 +264,8 @@ class Block(Statement):
 
 class If(Expression):
 
+    __slots__ = ('condition', 'consequence', 'alternative', 'in_expression')
+
     def __init__(self,
                  token: Token,
                  condition: Optional[Expression] = None,
@@ -185,6 +275,9 @@ class If(Expression):
         self.condition = condition
         self.consequence = consequence
         self.alternative = alternative
+        # Set by lpp.resolver when it is used as a value, so a branch
+        # without a value gives nulo.
+        self.in_expression = False
 
     def __str__(self) -> str:
         out: str = f'si {str(self.condition)} {str(self.consequence)}'
@@ -195,25 +288,47 @@ class If(Expression):
         return out
 
 
+class WhileStatement(Statement):
+
+    __slots__ = ('condition', 'body')
+
+    def __init__(self,
+                 token: Token,
+                 condition: Optional[Expression] = None,
+                 body: Optional[Block] = None) -> None:
+        super().__init__(token)
+        self.condition = condition
+        self.body = body
+
+    def __str__(self) -> str:
+        return f'mientras {str(self.condition)} {str(self.body)}'
+
+
 class Function(Expression):
 
+    __slots__ = ('parameters', 'body', 'scope')
+
     def __init__(self,
                  token: Token,
-                 parameters: List[Identifier] = [],
+                 parameters: Sequence[Identifier] = (),
                  body: Optional[Block] = None) -> None:
         super().__init__(token)
         self.parameters = parameters
         self.body = body
+        # Set by lpp.resolver.
+        self.scope: Optional[Scope] = None
 
     def __str__(self) -> str:
         param_list: List[str] = [str(parameter) for parameter in self.parameters]
         params: str = ', '.join(param_list)
 
-        return f'{self.token_literal()}({params}) {str(self.body)}'
+        return f'procedimiento({params}) {str(self.body)}'
 
 
 class Call(Expression):
 
+    __slots__ = ('function', 'arguments')
+
     def __init__(self,
                  token: Token,
                  function: Expression,
@@ -232,6 +347,8 @@ class Call(Expression):
 
 class StringLiteral(Expression):
 
+    __slots__ = ('value',)
+
     def __init__(self,
                  token: Token,
                  value: str) -> None:
@@ -239,5 +356,109 @@ class StringLiteral(Expression):
         self.value = value
 
     def __str__(self) -> str:
-        return super().__str__()
+        return f'"{self.value}"'
+
+
+class ArrayLiteral(Expression):
+
+    __slots__ = ('elements',)
+
+    def __init__(self,
+                 token: Token,
+                 elements: Optional[List[Expression]] = None) -> None:
+        super().__init__(token)
+        self.elements = elements
+
+    def __str__(self) -> str:
+        assert self.elements is not None
+        elements: str = ', '.join([str(element) for element in self.elements])
+
+        return f'[{elements}]'
+
+
+class HashLiteral(Expression):
+
+    __slots__ = ('pairs',)
+
+    def __init__(self,
+                 token: Token,
+                 pairs: Optional[List[Tuple[Expression, Expression]]] = None
+                 ) -> None:
+        super().__init__(token)
+        self.pairs = pairs
+
+    def __str__(self) -> str:
+        assert self.pairs is not None
+        pairs: str = ', '.join([f'{str(key)}: {str(value)}'
+                                for key, value in self.pairs])
+
+        return f'{{{pairs}}}'
+
+
+class Index(Expression):
+
+    __slots__ = ('left', 'index')
+
+    def __init__(self,
+                 token: Token,
+                 left: Expression,
+                 index: Optional[Expression] = None) -> None:
+        super().__init__(token)
+        self.left = left
+        self.index = index
+
+    def __str__(self) -> str:
+        return f'({str(self.left)}[{str(self.index)}])'
+
+
+_CHILD_SLOTS: Dict[Type[ASTNode], Tuple[str, ...]] = {}
+
+
+def children(node: ASTNode) -> List[ASTNode]:
+    """Return the nodes right below `node` in source order."""
+    node_type = type(node)
+    if node_type not in _CHILD_SLOTS:
+        _CHILD_SLOTS[node_type] = tuple(
+            slot
+            for cls in reversed(node_type.__mro__)
+            for slot in getattr(cls, '__slots__', ())
+            if slot not in ('token', 'spans', 'scope', 'depth', 'slot',
+                             'object')
+        )
+
+    result: List[ASTNode] = []
+    for slot in _CHILD_SLOTS[node_type]:
+        value = getattr(node, slot)
+        if isinstance(value, ASTNode):
+            result.append(value)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                # The pairs of a hash are tuples of a key and a value.
+                if isinstance(item, tuple):
+                    result.extend(item)
+                else:
+                    result.append(item)
+
+    return result
+
+
+def walk(node: ASTNode) -> Iterator[ASTNode]:
+    """Yield `node` and every node below it, parents before children and
+    children in source order."""
+    stack: List[ASTNode] = [node]
+
+    while stack:
+        node = stack.pop()
+        yield node
+
+        stack.extend(reversed(children(node)))
+
+
+def spans(program: Program) -> Iterator[Tuple[ASTNode, int, int]]:
+    """Yield every node of `program` with the start and end offsets of its
+    token, as recorded by a parser that didn't keep tokens."""
+    assert program.spans is not None
+    nodes = (node for node in walk(program) if node is not program)
 
+    for index, node in enumerate(nodes):
+        yield node, program.spans[2 * index], program.spans[2 * index + 1]
@@ -4,28 +4,123 @@ from typing import (
 )
 
 from lpp.object import (
+    Array,
     Builtin,
     Error,
-    Integer,
+    FALSE,
+    Hash,
+    Hashable,
+    NULL,
     Object,
     String,
+    TRUE,
+    integer_object,
 )
+from lpp.persistent import Vector
 
 
-_UNSUPPORTED_ARGUMENT_TYPE = 'argumento para longitud sin soporte, se recibió {}'
-_WRONG_NUMBER_OF_ARGS = 'número incorrecto de argumentos para longitud, se recibieron {}, se requieren {}'
+_UNSUPPORTED_ARGUMENT_TYPE = 'argumento para {} sin soporte, se recibió {}'
+_WRONG_NUMBER_OF_ARGS = 'número incorrecto de argumentos para {}, se recibieron {}, se requieren {}'
 
 
 def longitud(*args: Object) -> Object:
     if len(args) != 1:
-        return Error(_WRONG_NUMBER_OF_ARGS.format(len(args), 1))
+        return Error(_WRONG_NUMBER_OF_ARGS.format('longitud', len(args), 1))
     elif type(args[0]) == String:
         argument = cast(String, args[0])
-        return Integer(len(argument.value))
+        return integer_object(len(argument.value))
+    elif type(args[0]) == Array:
+        return integer_object(len(cast(Array, args[0]).elements))
+    elif type(args[0]) == Hash:
+        return integer_object(len(cast(Hash, args[0]).pairs))
     else:
-        return Error(_UNSUPPORTED_ARGUMENT_TYPE.format(args[0].type().name))
+        return Error(_UNSUPPORTED_ARGUMENT_TYPE.format('longitud',
+                                                       args[0].type().name))
+
+
+def primero(*args: Object) -> Object:
+    if len(args) != 1:
+        return Error(_WRONG_NUMBER_OF_ARGS.format('primero', len(args), 1))
+    elif type(args[0]) == Array:
+        array = cast(Array, args[0])
+        return array.elements[0] if len(array.elements) else NULL
+    else:
+        return Error(_UNSUPPORTED_ARGUMENT_TYPE.format('primero',
+                                                       args[0].type().name))
+
+
+def ultimo(*args: Object) -> Object:
+    if len(args) != 1:
+        return Error(_WRONG_NUMBER_OF_ARGS.format('ultimo', len(args), 1))
+    elif type(args[0]) == Array:
+        elements = cast(Array, args[0]).elements
+        return elements[len(elements) - 1] if len(elements) else NULL
+    else:
+        return Error(_UNSUPPORTED_ARGUMENT_TYPE.format('ultimo',
+                                                       args[0].type().name))
+
+
+def agregar(*args: Object) -> Object:
+    """Return an array with an element appended, or a hash with a key set,
+    leaving the argument as it was."""
+    if args and type(args[0]) == Hash:
+        if len(args) != 3:
+            return Error(_WRONG_NUMBER_OF_ARGS.format('agregar', len(args), 3))
+        elif not isinstance(args[1], Hashable):
+            return Error(_UNSUPPORTED_ARGUMENT_TYPE.format('agregar',
+                                                           args[1].type().name))
+
+        return cast(Hash, args[0]).set(args[1], args[2])
+    elif len(args) != 2:
+        return Error(_WRONG_NUMBER_OF_ARGS.format('agregar', len(args), 2))
+    elif type(args[0]) == Array:
+        return cast(Array, args[0]).append(args[1])
+    else:
+        return Error(_UNSUPPORTED_ARGUMENT_TYPE.format('agregar',
+                                                       args[0].type().name))
+
+
+def contiene(*args: Object) -> Object:
+    if len(args) != 2:
+        return Error(_WRONG_NUMBER_OF_ARGS.format('contiene', len(args), 2))
+    elif type(args[0]) != Hash:
+        return Error(_UNSUPPORTED_ARGUMENT_TYPE.format('contiene',
+                                                       args[0].type().name))
+    elif not isinstance(args[1], Hashable):
+        return Error(_UNSUPPORTED_ARGUMENT_TYPE.format('contiene',
+                                                       args[1].type().name))
+
+    return TRUE if args[1].hash_key() in cast(Hash, args[0]).pairs else FALSE
+
+
+def llaves(*args: Object) -> Object:
+    if len(args) != 1:
+        return Error(_WRONG_NUMBER_OF_ARGS.format('llaves', len(args), 1))
+    elif type(args[0]) == Hash:
+        pairs = cast(Hash, args[0]).pairs
+        return Array(Vector([key for key, _ in pairs.values()]))
+    else:
+        return Error(_UNSUPPORTED_ARGUMENT_TYPE.format('llaves',
+                                                       args[0].type().name))
+
+
+def valores(*args: Object) -> Object:
+    if len(args) != 1:
+        return Error(_WRONG_NUMBER_OF_ARGS.format('valores', len(args), 1))
+    elif type(args[0]) == Hash:
+        pairs = cast(Hash, args[0]).pairs
+        return Array(Vector([value for _, value in pairs.values()]))
+    else:
+        return Error(_UNSUPPORTED_ARGUMENT_TYPE.format('valores',
+                                                       args[0].type().name))
 
 
 BUILTINS: Dict[str, Builtin] = {
-    'longitud': Builtin(fn=longitud)
+    'agregar': Builtin(fn=agregar),
+    'contiene': Builtin(fn=contiene),
+    'llaves': Builtin(fn=llaves),
+    'longitud': Builtin(fn=longitud),
+    'primero': Builtin(fn=primero),
+    'ultimo': Builtin(fn=ultimo),
+    'valores': Builtin(fn=valores),
 }
@@ -0,0 +1,100 @@
+from contextlib import suppress
+from hashlib import sha256
+from os import (
+    makedirs,
+    path,
+    remove,
+    replace,
+)
+from sys import implementation
+from tempfile import NamedTemporaryFile
+from typing import (
+    List,
+    Optional,
+    Tuple,
+)
+
+from lpp.arena import Arena
+from lpp.ast import Program
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+
+
+# Arenas are serialized with marshal, whose format depends on the Python
+# version, so cached files are only valid for the same implementation. The
+# number changes with the syntax, a source may parse differently.
+CACHE_TAG: str = f'lpp-4-{implementation.cache_tag}'
+
+_MAGIC: bytes = f'{CACHE_TAG}\n'.encode()
+_SUFFIX: str = '.lppc'
+
+
+class ProgramCache:
+    """On-disk cache of parsed programs, keyed by a hash of their source.
+
+    Entries are written to a temporary file and moved into place, so readers
+    only ever see complete entries and concurrent writers of the same
+    program simply replace each other's identical entry. Unreadable entries
+    count as misses.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self._directory = directory
+
+    def load(self, source: str) -> Optional[Program]:
+        try:
+            with open(self._entry_path(source), 'rb') as entry:
+                data = entry.read()
+        except OSError:
+            return None
+
+        if not data.startswith(_MAGIC):
+            return None
+
+        try:
+            arena = Arena.from_bytes(data[len(_MAGIC):])
+            program = arena.to_node(arena.root)
+        except (EOFError, IndexError, TypeError, ValueError):
+            return None
+
+        return program if isinstance(program, Program) else None
+
+    def parse(self, source: str) -> Tuple[Program, List[str]]:
+        """Return the program for `source` and its parse errors, parsing and
+        caching it only when it isn't cached yet."""
+        program = self.load(source)
+        if program is not None:
+            return program, []
+
+        parser = Parser(Lexer(source))
+        program = parser.parse_program()
+        if not parser.errors:
+            self.store(source, Arena.from_program(program))
+
+        return program, parser.errors
+
+    def store(self, source: str, arena: Arena) -> None:
+        data = _MAGIC + arena.to_bytes()
+
+        try:
+            makedirs(self._directory, exist_ok=True)
+            entry = NamedTemporaryFile(dir=self._directory,
+                                       suffix='.tmp',
+                                       delete=False)
+        except OSError:
+            return
+
+        try:
+            with entry:
+                entry.write(data)
+            replace(entry.name, self._entry_path(source))
+        except OSError:
+            # The cache is only an optimization, a full or read-only disk
+            # shouldn't stop the program from running.
+            with suppress(OSError):
+                remove(entry.name)
+
+    def _entry_path(self, source: str) -> str:
+        digest = sha256(_MAGIC + source.encode('utf-8')).hexdigest()
+
+        return path.join(self._directory, f'{digest}{_SUFFIX}')
@@ -0,0 +1,643 @@
+from operator import (
+    add,
+    eq,
+    floordiv,
+    gt,
+    lt,
+    mul,
+    ne,
+    sub,
+)
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Type,
+    cast,
+)
+
+import lpp.ast as ast
+from lpp.builtins import BUILTINS
+from lpp.evaluator import (
+    FALSE,
+    NULL,
+    TRUE,
+    _NOT_A_FUNCTION,
+    _UNKNOWN_IDENTIFIER,
+    _ReturnFromExpression,
+    _apply_function,
+    _evaluate_hash_items,
+    _evaluate_index_expression,
+    _evaluate_infix_expression,
+    _evaluate_prefix_expression,
+    _new_error,
+)
+from lpp.object import (
+    Array,
+    Builtin,
+    Environment,
+    Error,
+    Frame,
+    Function,
+    Integer,
+    Object,
+    Return,
+    String,
+    TailCall,
+    integer_object,
+)
+from lpp.persistent import Vector
+from lpp.resolver import resolve
+
+
+# Closures return Any so their results are used without a cast() call, which
+# would run on every evaluation.
+Closure = Callable[[Frame], Any]
+
+
+class CompiledFunction(Function):
+    """Function created by compiled code, it keeps the closure compiled
+    from its body, shared by every function created from the same
+    procedimiento, and the layout of the frames of its calls."""
+
+    __slots__ = ('frame', 'names', 'run', 'padding')
+
+    def __init__(self,
+                 node: ast.Function,
+                 frame: Frame,
+                 run: Closure,
+                 padding: List[None]) -> None:
+        assert node.body is not None and node.scope is not None
+        super().__init__(node.parameters, node.body, frame)
+        self.frame = frame
+        self.names = node.scope.names
+        self.run = run
+        # What follows the arguments in the values of a frame.
+        self.padding = padding
+
+
+_ARITHMETIC: Dict[str, Callable[[int, int], int]] = {
+    '+': add,
+    '-': sub,
+    '*': mul,
+    '/': floordiv,
+}
+
+_COMPARISONS: Dict[str, Callable[[int, int], bool]] = {
+    '<': lt,
+    '>': gt,
+    '==': eq,
+    '!=': ne,
+}
+
+
+def compile_closures(node: ast.ASTNode) -> Closure:
+    """Turn `node` into a Python closure that evaluates it in the frame it
+    is called with. The program `node` belongs to must be resolved.
+
+    Every node is visited once, so the type of the node, its operator and
+    its literal values are looked at while compiling instead of every time
+    it runs.
+    """
+    node_type: Type = type(node)
+    if node_type not in _COMPILERS:
+        raise TypeError(f'Nodo sin soporte: {node_type.__name__}')
+
+    return _COMPILERS[node_type](node)
+
+
+def run(program: ast.Program, env: Environment) -> Optional[Object]:
+    """Compile `program` to closures and run it in `env`."""
+    resolve(program)
+    assert program.scope is not None
+    names = program.scope.names
+
+    return compile_closures(program)(Frame([None] * len(names), names, None, env))
+
+
+def _compile_array(node: ast.ASTNode) -> Closure:
+    elements = cast(ast.ArrayLiteral, node).elements
+    assert elements is not None
+    element_closures = [compile_closures(element) for element in elements]
+
+    def run_array(frame: Frame) -> Optional[Object]:
+        return Array(Vector([element(frame)
+                             for element in element_closures]))
+
+    return run_array
+
+
+def _compile_assign(node: ast.ASTNode) -> Closure:
+    assign_statement = cast(ast.AssignStatement, node)
+    assert assign_statement.name is not None \
+        and assign_statement.value is not None
+    name = assign_statement.name.value
+    depth = assign_statement.name.depth
+    slot = assign_statement.name.slot
+    value = compile_closures(assign_statement.value)
+    error = _new_error(_UNKNOWN_IDENTIFIER, [name])
+
+    if depth is None:
+        def run_global(frame: Frame) -> Optional[Object]:
+            if frame.globals.assign(name, value(frame)):
+                return None
+
+            return error
+
+        return run_global
+
+    assert slot is not None
+    if depth == 0:
+        def run_local(frame: Frame) -> Optional[Object]:
+            new_value = value(frame)
+
+            values = frame.values
+            if values[slot] is not None:
+                values[slot] = new_value
+            elif not frame.assign(name, new_value):
+                return error
+
+            return None
+
+        return run_local
+
+    def run_assign(frame: Frame) -> Optional[Object]:
+        new_value = value(frame)
+
+        outer = frame
+        for _ in range(depth):
+            outer = cast(Frame, outer.outer)
+
+        values = outer.values
+        if values[slot] is not None:
+            values[slot] = new_value
+        elif not outer.assign(name, new_value):
+            # Assigned before the `variable` that defines it.
+            return error
+
+        return None
+
+    return run_assign
+
+
+def _compile_block(node: ast.ASTNode) -> Closure:
+    block = cast(ast.Block, node)
+    statements = [compile_closures(statement)
+                  for statement in block.statements]
+
+    if len(statements) == 1:
+        return statements[0]
+
+    def run_block(frame: Frame) -> Optional[Object]:
+        result: Optional[Object] = None
+
+        for statement in statements:
+            result = statement(frame)
+
+            result_type = type(result)
+            if result_type is Return or result_type is Error \
+                    or result_type is TailCall:
+                return result
+
+        return result
+
+    return run_block
+
+
+def _compile_boolean(node: ast.ASTNode) -> Closure:
+    value = TRUE if cast(ast.Boolean, node).value else FALSE
+
+    return lambda frame: value
+
+
+def _compile_call(node: ast.ASTNode) -> Closure:
+    call = cast(ast.Call, node)
+    assert call.arguments is not None
+    function_closure = compile_closures(call.function)
+    argument_closures = [compile_closures(argument)
+                         for argument in call.arguments]
+
+    def run_call(frame: Frame) -> Optional[Object]:
+        function = function_closure(frame)
+        arguments = [argument(frame) for argument in argument_closures]
+
+        if type(function) is CompiledFunction:
+            return _run_function(function, arguments)
+
+        return _call_other(function, arguments)
+
+    return run_call
+
+
+def _call_other(function: Object, arguments: List[Object]) -> Object:
+    """Call what isn't a CompiledFunction."""
+    if type(function) is Builtin:
+        return function.fn(*arguments)
+    elif type(function) is Function:
+        # Created by the evaluator, for example in a shared environment.
+        return _apply_function(function, arguments)
+
+    return _new_error(_NOT_A_FUNCTION, [function.type().name])
+
+
+def _run_function(function: CompiledFunction,
+                  arguments: List[Optional[Object]]) -> Optional[Object]:
+    while True:
+        if len(arguments) != len(function.parameters):
+            # Extra arguments are ignored and missing ones left unset.
+            arguments = (arguments + [None] * len(function.parameters))[
+                :len(function.parameters)]
+        if function.padding:
+            arguments.extend(function.padding)
+
+        outer = function.frame
+        try:
+            result = function.run(Frame(arguments,
+                                        function.names,
+                                        outer,
+                                        outer.globals))
+        except _ReturnFromExpression as early_return:
+            result = early_return.result
+
+        result_type = type(result)
+        if result_type is TailCall:
+            # Run the call the body returned here, instead of one level
+            # deeper for every call in a row.
+            function = result.function
+            arguments = result.arguments
+        elif result_type is Return:
+            return result.value
+        elif result is None:
+            # A body ending in a `variable` or a loop has no value.
+            return NULL
+        else:
+            return result
+
+
+def _compile_expression_statement(node: ast.ASTNode) -> Closure:
+    expression = cast(ast.ExpressionStatement, node).expression
+    assert expression is not None
+
+    return compile_closures(expression)
+
+
+def _compile_function(node: ast.ASTNode) -> Closure:
+    function = cast(ast.Function, node)
+    assert function.body is not None and function.scope is not None
+    body = compile_closures(function.body)
+    padding: List[None] = \
+        [None] * (len(function.scope.names) - len(function.parameters))
+
+    return lambda frame: CompiledFunction(function, frame, body, padding)
+
+
+def _compile_hash(node: ast.ASTNode) -> Closure:
+    pairs = cast(ast.HashLiteral, node).pairs
+    assert pairs is not None
+    item_closures = [compile_closures(item)
+                     for pair in pairs
+                     for item in pair]
+
+    def run_hash(frame: Frame) -> Optional[Object]:
+        return _evaluate_hash_items([item(frame) for item in item_closures])
+
+    return run_hash
+
+
+def _compile_identifier(node: ast.ASTNode) -> Closure:
+    identifier = cast(ast.Identifier, node)
+    name = identifier.value
+    depth = identifier.depth
+    slot = identifier.slot
+    fallback: Object = BUILTINS.get(name) \
+        or _new_error(_UNKNOWN_IDENTIFIER, [name])
+
+    if depth is None:
+        def run_global(frame: Frame) -> Optional[Object]:
+            try:
+                return frame.globals[name]
+            except KeyError:
+                return fallback
+
+        return run_global
+
+    assert slot is not None
+    if depth == 0:
+        def run_local(frame: Frame) -> Optional[Object]:
+            value = frame.values[slot]
+            if value is None:
+                return frame.find(name) or fallback
+
+            return value
+
+        return run_local
+    elif depth == 1:
+        def run_outer(frame: Frame) -> Optional[Object]:
+            frame = cast(Frame, frame.outer)
+            value = frame.values[slot]
+            if value is None:
+                return frame.find(name) or fallback
+
+            return value
+
+        return run_outer
+
+    def run_enclosing(frame: Frame) -> Optional[Object]:
+        for _ in range(depth):
+            frame = cast(Frame, frame.outer)
+
+        value = frame.values[slot]
+        if value is None:
+            return frame.find(name) or fallback
+
+        return value
+
+    return run_enclosing
+
+
+def _compile_if(node: ast.ASTNode) -> Closure:
+    if_expression = cast(ast.If, node)
+    assert if_expression.condition is not None \
+        and if_expression.consequence is not None
+    condition = compile_closures(if_expression.condition)
+    consequence = compile_closures(if_expression.consequence)
+    alternative = compile_closures(if_expression.alternative) \
+        if if_expression.alternative is not None else lambda frame: NULL
+
+    if if_expression.in_expression:
+        def run_if_value(frame: Frame) -> Optional[Object]:
+            value = condition(frame)
+            if value is FALSE or value is NULL:
+                result = alternative(frame)
+            else:
+                result = consequence(frame)
+
+            # A branch without a value used as a value.
+            return NULL if result is None else result
+
+        return run_if_value
+
+    def run_if(frame: Frame) -> Optional[Object]:
+        value = condition(frame)
+        if value is FALSE or value is NULL:
+            return alternative(frame)
+
+        return consequence(frame)
+
+    return run_if
+
+
+def _compile_index(node: ast.ASTNode) -> Closure:
+    index = cast(ast.Index, node)
+    assert index.index is not None
+    left = compile_closures(index.left)
+    position = compile_closures(index.index)
+
+    def run_index(frame: Frame) -> Optional[Object]:
+        return _evaluate_index_expression(left(frame), position(frame))
+
+    return run_index
+
+
+def _compile_infix(node: ast.ASTNode) -> Closure:
+    infix = cast(ast.Infix, node)
+    assert infix.left is not None and infix.right is not None
+    operator = infix.operator
+    left = compile_closures(infix.left)
+
+    # Most infix expressions in loops are like `n - 1` or `n < 2`, whose
+    # right operand is known while compiling.
+    if type(infix.right) is ast.Integer and operator in _ARITHMETIC:
+        return _compile_arithmetic_constant(operator, left, infix.right)
+    elif type(infix.right) is ast.Integer and operator in _COMPARISONS:
+        return _compile_comparison_constant(operator, left, infix.right)
+
+    right = compile_closures(infix.right)
+
+    if operator in _ARITHMETIC:
+        arithmetic = _ARITHMETIC[operator]
+
+        def run_arithmetic(frame: Frame) -> Optional[Object]:
+            left_value = left(frame)
+            right_value = right(frame)
+
+            if type(left_value) is Integer and type(right_value) is Integer:
+                return integer_object(arithmetic(left_value.value,
+                                                 right_value.value))
+
+            assert left_value is not None and right_value is not None
+            return _evaluate_infix_expression(operator, left_value, right_value)
+
+        return run_arithmetic
+
+    comparison = _COMPARISONS[operator]
+
+    def run_comparison(frame: Frame) -> Optional[Object]:
+        left_value = left(frame)
+        right_value = right(frame)
+
+        if type(left_value) is Integer and type(right_value) is Integer:
+            return TRUE if comparison(left_value.value,
+                                      right_value.value) \
+                else FALSE
+
+        assert left_value is not None and right_value is not None
+        return _evaluate_infix_expression(operator, left_value, right_value)
+
+    return run_comparison
+
+
+def _compile_arithmetic_constant(operator: str,
+                                 left: Closure,
+                                 right: ast.Integer) -> Closure:
+    arithmetic = _ARITHMETIC[operator]
+    assert right.value is not None
+    constant = right.value
+    right_value = integer_object(constant)
+
+    def run_arithmetic(frame: Frame) -> Optional[Object]:
+        left_value = left(frame)
+
+        if type(left_value) is Integer:
+            return integer_object(arithmetic(left_value.value, constant))
+
+        assert left_value is not None
+        return _evaluate_infix_expression(operator, left_value, right_value)
+
+    return run_arithmetic
+
+
+def _compile_comparison_constant(operator: str,
+                                 left: Closure,
+                                 right: ast.Integer) -> Closure:
+    comparison = _COMPARISONS[operator]
+    assert right.value is not None
+    constant = right.value
+    right_value = integer_object(constant)
+
+    def run_comparison(frame: Frame) -> Optional[Object]:
+        left_value = left(frame)
+
+        if type(left_value) is Integer:
+            return TRUE if comparison(left_value.value, constant) \
+                else FALSE
+
+        assert left_value is not None
+        return _evaluate_infix_expression(operator, left_value, right_value)
+
+    return run_comparison
+
+
+def _compile_integer(node: ast.ASTNode) -> Closure:
+    literal = cast(ast.Integer, node).value
+    assert literal is not None
+    value = integer_object(literal)
+
+    return lambda frame: value
+
+
+def _compile_let(node: ast.ASTNode) -> Closure:
+    let_statement = cast(ast.LetStatement, node)
+    assert let_statement.name is not None and let_statement.value is not None
+    slot = let_statement.name.slot
+    assert slot is not None
+    value = compile_closures(let_statement.value)
+
+    def run_let(frame: Frame) -> Optional[Object]:
+        frame.values[slot] = value(frame)
+        return None
+
+    return run_let
+
+
+def _compile_prefix(node: ast.ASTNode) -> Closure:
+    prefix = cast(ast.Prefix, node)
+    assert prefix.right is not None
+    operator = prefix.operator
+    right = compile_closures(prefix.right)
+
+    def run_prefix(frame: Frame) -> Optional[Object]:
+        return _evaluate_prefix_expression(operator, right(frame))
+
+    return run_prefix
+
+
+def _compile_program(node: ast.ASTNode) -> Closure:
+    statements = [compile_closures(statement)
+                  for statement in cast(ast.Program, node).statements]
+
+    def run_program(frame: Frame) -> Optional[Object]:
+        result: Optional[Object] = None
+
+        for statement in statements:
+            try:
+                result = statement(frame)
+            except _ReturnFromExpression as early_return:
+                result = early_return.result
+
+            if type(result) is Return:
+                return result.value
+            elif type(result) is Error:
+                return result
+
+        return result
+
+    return run_program
+
+
+def _compile_return(node: ast.ASTNode) -> Closure:
+    return_statement = cast(ast.ReturnStatement, node)
+    return_value = return_statement.return_value
+    assert return_value is not None
+
+    if return_statement.tail:
+        return _compile_tail_call(cast(ast.Call, return_value))
+
+    value = compile_closures(return_value)
+
+    if return_statement.in_expression:
+        def run_early_return(frame: Frame) -> Optional[Object]:
+            raise _ReturnFromExpression(Return(value(frame)))
+
+        return run_early_return
+
+    def run_return(frame: Frame) -> Optional[Object]:
+        return Return(value(frame))
+
+    return run_return
+
+
+def _compile_tail_call(call: ast.Call) -> Closure:
+    assert call.arguments is not None
+    function_closure = compile_closures(call.function)
+    argument_closures = [compile_closures(argument)
+                         for argument in call.arguments]
+
+    def run_tail_call(frame: Frame) -> Optional[Object]:
+        function = function_closure(frame)
+        arguments = [argument(frame) for argument in argument_closures]
+
+        if type(function) is CompiledFunction:
+            # The caller runs it, see _run_function.
+            return TailCall(function, arguments)
+
+        return Return(_call_other(function, arguments))
+
+    return run_tail_call
+
+
+def _compile_while(node: ast.ASTNode) -> Closure:
+    while_statement = cast(ast.WhileStatement, node)
+    assert while_statement.condition is not None \
+        and while_statement.body is not None
+    condition = compile_closures(while_statement.condition)
+    statements = [compile_closures(statement)
+                  for statement in while_statement.body.statements]
+
+    def run_while(frame: Frame) -> Optional[Object]:
+        while True:
+            value = condition(frame)
+            if value is FALSE or value is NULL:
+                return None
+            elif type(value) is Error:
+                return value
+
+            for statement in statements:
+                result = statement(frame)
+
+                result_type = type(result)
+                if result_type is Return or result_type is Error:
+                    return result
+
+    return run_while
+
+
+def _compile_string(node: ast.ASTNode) -> Closure:
+    value = String(cast(ast.StringLiteral, node).value)
+
+    return lambda frame: value
+
+
+_COMPILERS: Dict[Type[ast.ASTNode], Callable[[ast.ASTNode], Closure]] = {
+    ast.ArrayLiteral: _compile_array,
+    ast.AssignStatement: _compile_assign,
+    ast.Block: _compile_block,
+    ast.Boolean: _compile_boolean,
+    ast.Call: _compile_call,
+    ast.ExpressionStatement: _compile_expression_statement,
+    ast.Function: _compile_function,
+    ast.HashLiteral: _compile_hash,
+    ast.Identifier: _compile_identifier,
+    ast.If: _compile_if,
+    ast.Index: _compile_index,
+    ast.Infix: _compile_infix,
+    ast.Integer: _compile_integer,
+    ast.LetStatement: _compile_let,
+    ast.Prefix: _compile_prefix,
+    ast.Program: _compile_program,
+    ast.ReturnStatement: _compile_return,
+    ast.StringLiteral: _compile_string,
+    ast.WhileStatement: _compile_while,
+}
@@ -0,0 +1,482 @@
+from array import array
+from enum import IntEnum
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+
+import lpp.ast as ast
+from lpp.object import (
+    Integer,
+    String,
+    integer_object,
+)
+from lpp.resolver import resolve
+
+
+class Opcode(IntEnum):
+    """Instructions of the virtual machine.
+
+    Instructions are stored as words, an opcode followed by its operand for
+    the ones that take one. Values live on an operand stack.
+    """
+    # Push constants[operand].
+    CONSTANT = 0
+    # Push verdadero, falso or nulo.
+    TRUE = 1
+    FALSE = 2
+    NULL = 3
+    # Push the value in the slot given by the operand of the current frame.
+    GET_LOCAL = 4
+    # Pop a value and store it in the slot given by the operand.
+    SET_LOCAL = 5
+    # Discard the value on top of the stack.
+    POP = 6
+    # Pop two operands and push the result.
+    ADD = 7
+    SUBTRACT = 8
+    MULTIPLY = 9
+    DIVIDE = 10
+    EQUAL = 11
+    NOT_EQUAL = 12
+    GREATER_THAN = 13
+    LESS_THAN = 14
+    # Replace the value on top of the stack.
+    MINUS = 15
+    BANG = 16
+    # Continue at the operand.
+    JUMP = 17
+    # Pop a value and continue at the operand when it isn't truthy.
+    JUMP_IF_FALSY = 18
+    # Continue at the operand, keeping the value, when it is an error.
+    JUMP_IF_ERROR = 19
+    # Push a function for the code in constants[operand] closing over the
+    # current environment.
+    FUNCTION = 20
+    # Call the function below the operand arguments on top of the stack.
+    CALL = 21
+    # Return the value on top of the stack from the current call.
+    RETURN_VALUE = 22
+    # Return from the current call without a value.
+    RETURN = 23
+    # Push the value in the slot given by the second operand of the frame
+    # as many procedimientos out as the first operand.
+    GET_OUTER = 24
+    # Push the global or builtin named names[operand].
+    GET_GLOBAL = 25
+    # Like CALL, but a procedimiento replaces the current call instead of
+    # returning to it. The RETURN_VALUE that follows returns the result of
+    # any other function.
+    TAIL_CALL = 26
+    # Pop a value and store it in the slot given by the first operand, or
+    # where the variable it names is defined when the slot is unset.
+    # Continue at the second operand with an error when no variable has
+    # that name.
+    ASSIGN_LOCAL = 27
+    # Like ASSIGN_LOCAL, in the frame as many procedimientos out as the
+    # first operand, at the slot given by the second.
+    ASSIGN_OUTER = 28
+    # Like ASSIGN_LOCAL, for the global named names[operand].
+    ASSIGN_GLOBAL = 29
+    # Pop a value and continue at the first operand when it is truthy. An
+    # error is kept and continues at the second operand.
+    LOOP_IF_TRUTHY = 30
+    # Pop as many values as the operand and push an array of them.
+    ARRAY = 31
+    # Pop an index and push the element of the array or hash below it.
+    INDEX = 32
+    # Pop twice as many values as the operand, keys and values
+    # alternating, and push a hash of them.
+    HASH = 33
+
+
+INFIX_OPCODES: Dict[str, Opcode] = {
+    '+': Opcode.ADD,
+    '-': Opcode.SUBTRACT,
+    '*': Opcode.MULTIPLY,
+    '/': Opcode.DIVIDE,
+    '==': Opcode.EQUAL,
+    '!=': Opcode.NOT_EQUAL,
+    '>': Opcode.GREATER_THAN,
+    '<': Opcode.LESS_THAN,
+}
+
+PREFIX_OPCODES: Dict[str, Opcode] = {
+    '-': Opcode.MINUS,
+    '!': Opcode.BANG,
+}
+
+_OPERANDS: Dict[Opcode, int] = {
+    Opcode.CONSTANT: 1,
+    Opcode.GET_LOCAL: 1,
+    Opcode.SET_LOCAL: 1,
+    Opcode.JUMP: 1,
+    Opcode.JUMP_IF_FALSY: 1,
+    Opcode.JUMP_IF_ERROR: 1,
+    Opcode.FUNCTION: 1,
+    Opcode.CALL: 1,
+    Opcode.TAIL_CALL: 1,
+    Opcode.GET_OUTER: 2,
+    Opcode.GET_GLOBAL: 1,
+    Opcode.ASSIGN_LOCAL: 2,
+    Opcode.ASSIGN_OUTER: 3,
+    Opcode.ASSIGN_GLOBAL: 2,
+    Opcode.LOOP_IF_TRUTHY: 2,
+    Opcode.ARRAY: 1,
+    Opcode.HASH: 1,
+}
+
+Constant = Union[Integer, String, 'Code']
+
+
+class Code:
+    """Compiled body of a program or a procedimiento.
+
+    `scope` gives the slots of the variables of its frames, and `names` the
+    globals it uses. `parameters` and `body` are the source of a
+    procedimiento, kept so the functions the virtual machine creates look
+    like the ones of the evaluator.
+    """
+
+    __slots__ = ('instructions', 'constants', 'names', 'scope', 'parameters',
+                 'body')
+
+    def __init__(self,
+                 instructions: array,
+                 constants: List[Constant],
+                 names: List[str],
+                 scope: ast.Scope,
+                 parameters: Sequence[ast.Identifier] = (),
+                 body: Optional[ast.Block] = None) -> None:
+        self.instructions = instructions
+        self.constants = constants
+        self.names = names
+        self.scope = scope
+        self.parameters = parameters
+        self.body = body
+
+
+def compile_program(program: ast.Program) -> Code:
+    """Lower `program` to the instructions of the virtual machine."""
+    resolve(program)
+    assert program.scope is not None
+    compiler = _Compiler(program.scope)
+    compiler.compile_statements(program.statements, is_program=True)
+
+    return compiler.code()
+
+
+def disassemble(code: Code) -> List[str]:
+    """Return one line per instruction of `code`, for debugging."""
+    lines: List[str] = []
+    instructions = code.instructions
+    ip = 0
+
+    while ip < len(instructions):
+        opcode = Opcode(instructions[ip])
+        operands = instructions[ip + 1:ip + 1 + _OPERANDS.get(opcode, 0)]
+        lines.append(' '.join([f'{ip:04}', opcode.name]
+                              + [str(operand) for operand in operands]))
+        ip += 1 + len(operands)
+
+    return lines
+
+
+class _Compiler:
+
+    def __init__(self,
+                 scope: ast.Scope,
+                 parameters: Sequence[ast.Identifier] = (),
+                 body: Optional[ast.Block] = None) -> None:
+        self._instructions: array = array('I')
+        self._constants: List[Constant] = []
+        self._constant_indexes: Dict[Tuple[Type, Union[int, str]], int] = {}
+        self._names: List[str] = []
+        self._name_indexes: Dict[str, int] = {}
+        self._scope = scope
+        self._parameters = parameters
+        self._body = body
+
+    def code(self) -> Code:
+        return Code(self._instructions,
+                    self._constants,
+                    self._names,
+                    self._scope,
+                    self._parameters,
+                    self._body)
+
+    def compile_statements(self,
+                           statements: List[ast.Statement],
+                           is_program: bool = False) -> None:
+        """Compile a program or the body of a procedimiento, which leave the
+        value of their last statement as their result."""
+        ends: List[int] = []
+        has_value = self._compile_block(statements, ends, is_program)
+
+        if has_value:
+            self._patch(ends)
+            self._emit(Opcode.RETURN_VALUE)
+            return
+        elif is_program:
+            self._emit(Opcode.RETURN)
+        else:
+            self._emit(Opcode.NULL)
+            self._emit(Opcode.RETURN_VALUE)
+
+        # An error that stopped the statements is the result.
+        if ends:
+            self._patch(ends)
+            self._emit(Opcode.RETURN_VALUE)
+
+    def _compile(self, node: ast.ASTNode) -> None:
+        node_type: Type = type(node)
+
+        if node_type == ast.Identifier:
+            node = cast(ast.Identifier, node)
+
+            if node.depth is None:
+                self._emit(Opcode.GET_GLOBAL, self._name(node.value))
+            elif node.depth == 0:
+                self._emit(Opcode.GET_LOCAL, node.slot)
+            else:
+                self._emit(Opcode.GET_OUTER, node.depth, node.slot)
+        elif node_type == ast.Integer:
+            node = cast(ast.Integer, node)
+
+            assert node.value is not None
+            self._emit(Opcode.CONSTANT, self._constant(Integer, node.value))
+        elif node_type == ast.Infix:
+            node = cast(ast.Infix, node)
+
+            assert node.left is not None and node.right is not None
+            self._compile(node.left)
+            self._compile(node.right)
+            self._emit(INFIX_OPCODES[node.operator])
+        elif node_type == ast.Call:
+            node = cast(ast.Call, node)
+
+            assert node.arguments is not None
+            self._compile(node.function)
+            for argument in node.arguments:
+                self._compile(argument)
+            self._emit(Opcode.CALL, len(node.arguments))
+        elif node_type == ast.If:
+            node = cast(ast.If, node)
+
+            self._compile_if(node)
+        elif node_type == ast.Boolean:
+            node = cast(ast.Boolean, node)
+
+            self._emit(Opcode.TRUE if node.value else Opcode.FALSE)
+        elif node_type == ast.Prefix:
+            node = cast(ast.Prefix, node)
+
+            assert node.right is not None
+            self._compile(node.right)
+            self._emit(PREFIX_OPCODES[node.operator])
+        elif node_type == ast.StringLiteral:
+            node = cast(ast.StringLiteral, node)
+
+            self._emit(Opcode.CONSTANT, self._constant(String, node.value))
+        elif node_type == ast.ArrayLiteral:
+            node = cast(ast.ArrayLiteral, node)
+
+            assert node.elements is not None
+            for element in node.elements:
+                self._compile(element)
+            self._emit(Opcode.ARRAY, len(node.elements))
+        elif node_type == ast.HashLiteral:
+            node = cast(ast.HashLiteral, node)
+
+            assert node.pairs is not None
+            for key, value in node.pairs:
+                self._compile(key)
+                self._compile(value)
+            self._emit(Opcode.HASH, len(node.pairs))
+        elif node_type == ast.Index:
+            node = cast(ast.Index, node)
+
+            assert node.index is not None
+            self._compile(node.left)
+            self._compile(node.index)
+            self._emit(Opcode.INDEX)
+        elif node_type == ast.Function:
+            node = cast(ast.Function, node)
+
+            assert node.body is not None and node.scope is not None
+            function = _Compiler(node.scope, node.parameters, node.body)
+            function.compile_statements(node.body.statements)
+            self._constants.append(function.code())
+            self._emit(Opcode.FUNCTION, len(self._constants) - 1)
+        else:
+            raise TypeError(f'Expresión sin soporte: {node_type.__name__}')
+
+    def _compile_block(self,
+                       statements: List[ast.Statement],
+                       ends: List[int],
+                       ends_program: bool = False) -> bool:
+        """Compile `statements` and return whether they leave a value.
+
+        Like in the evaluator, an error stops the statements that follow it
+        and becomes the value of the block. The jumps that skip them are
+        added to `ends`. `ends_program` tells whether the last statement is
+        the last one the program runs.
+        """
+        has_value = False
+
+        for index, statement in enumerate(statements):
+            if has_value:
+                ends.append(self._emit(Opcode.JUMP_IF_ERROR, 0))
+                self._emit(Opcode.POP)
+
+            statement_type: Type = type(statement)
+            if statement_type == ast.ExpressionStatement:
+                statement = cast(ast.ExpressionStatement, statement)
+
+                assert statement.expression is not None
+                if ends_program and index == len(statements) - 1 \
+                        and type(statement.expression) is ast.If:
+                    self._compile_if(cast(ast.If, statement.expression),
+                                     ends_program=True)
+                else:
+                    self._compile(statement.expression)
+                has_value = True
+            elif statement_type == ast.LetStatement:
+                statement = cast(ast.LetStatement, statement)
+
+                assert statement.name is not None \
+                    and statement.value is not None
+                self._compile(statement.value)
+                self._emit(Opcode.SET_LOCAL, statement.name.slot)
+                has_value = False
+            elif statement_type == ast.ReturnStatement:
+                statement = cast(ast.ReturnStatement, statement)
+
+                assert statement.return_value is not None
+                if statement.tail:
+                    self._compile_tail_call(
+                        cast(ast.Call, statement.return_value))
+                else:
+                    self._compile(statement.return_value)
+                self._emit(Opcode.RETURN_VALUE)
+                # Nothing after a return runs, the block has no value.
+                return True
+            elif statement_type == ast.AssignStatement:
+                statement = cast(ast.AssignStatement, statement)
+
+                assert statement.name is not None \
+                    and statement.value is not None
+                self._compile(statement.value)
+                self._compile_assign(statement.name, ends)
+                has_value = False
+            elif statement_type == ast.WhileStatement:
+                statement = cast(ast.WhileStatement, statement)
+
+                self._compile_while(statement, ends)
+                has_value = False
+            else:
+                raise TypeError(
+                    f'Sentencia sin soporte: {statement_type.__name__}')
+
+        return has_value
+
+    def _compile_assign(self, name: ast.Identifier, ends: List[int]) -> None:
+        if name.depth is None:
+            ends.append(self._emit(Opcode.ASSIGN_GLOBAL,
+                                   self._name(name.value),
+                                   0))
+        elif name.depth == 0:
+            ends.append(self._emit(Opcode.ASSIGN_LOCAL, name.slot, 0))
+        else:
+            ends.append(self._emit(Opcode.ASSIGN_OUTER,
+                                   name.depth,
+                                   name.slot,
+                                   0))
+
+    def _compile_if(self, node: ast.If, ends_program: bool = False) -> None:
+        assert node.condition is not None and node.consequence is not None
+        self._compile(node.condition)
+        alternative_jump = self._emit(Opcode.JUMP_IF_FALSY, 0)
+
+        self._compile_branch(node.consequence, ends_program)
+        end_jump = self._emit(Opcode.JUMP, 0)
+
+        self._patch([alternative_jump])
+        if node.alternative is not None:
+            self._compile_branch(node.alternative, ends_program)
+        else:
+            self._emit(Opcode.NULL)
+
+        self._patch([end_jump])
+
+    def _compile_branch(self, block: ast.Block, ends_program: bool) -> None:
+        ends: List[int] = []
+        if not self._compile_block(block.statements, ends, ends_program):
+            # Like in the evaluator, a program that ends with a branch
+            # without a value has no value, instead of nulo.
+            self._emit(Opcode.RETURN if ends_program else Opcode.NULL)
+
+        self._patch(ends)
+
+    def _compile_tail_call(self, call: ast.Call) -> None:
+        assert call.arguments is not None
+        self._compile(call.function)
+        for argument in call.arguments:
+            self._compile(argument)
+        self._emit(Opcode.TAIL_CALL, len(call.arguments))
+
+    def _compile_while(self, node: ast.WhileStatement, ends: List[int]) -> None:
+        """Compile a loop, which leaves no value. An error in its condition
+        or body stops it and the block around it, so the jumps that skip
+        the rest of that block are added to `ends`.
+
+        The condition goes after the body, so an iteration only jumps
+        once, back to the start of the body.
+        """
+        assert node.condition is not None and node.body is not None
+        condition_jump = self._emit(Opcode.JUMP, 0)
+        start = len(self._instructions)
+
+        if self._compile_block(node.body.statements, ends):
+            ends.append(self._emit(Opcode.JUMP_IF_ERROR, 0))
+            self._emit(Opcode.POP)
+
+        self._patch([condition_jump])
+        self._compile(node.condition)
+        ends.append(self._emit(Opcode.LOOP_IF_TRUTHY, start, 0))
+
+    def _constant(self, constant_type: Type, value: Union[int, str]) -> int:
+        key = (constant_type, value)
+        if key not in self._constant_indexes:
+            self._constant_indexes[key] = len(self._constants)
+            self._constants.append(
+                integer_object(cast(int, value)) if constant_type is Integer
+                else constant_type(value))
+
+        return self._constant_indexes[key]
+
+    def _emit(self, opcode: Opcode, *operands: Optional[int]) -> int:
+        """Append an instruction and return the position of its last
+        word, which for jumps is their target."""
+        self._instructions.append(opcode)
+        self._instructions.extend(operands)
+
+        return len(self._instructions) - 1
+
+    def _name(self, name: str) -> int:
+        if name not in self._name_indexes:
+            self._name_indexes[name] = len(self._names)
+            self._names.append(name)
+
+        return self._name_indexes[name]
+
+    def _patch(self, operands: List[int]) -> None:
+        """Point the jumps with the given operands to the next instruction."""
+        for operand in operands:
+            self._instructions[operand] = len(self._instructions)
@@ -1,31 +1,51 @@
 from typing import (
     Any,
+    Callable,
     cast,
+    Dict,
     List,
     Optional,
+    Sequence,
+    Tuple,
     Type,
 )
 
 import lpp.ast as ast
 from lpp.builtins import BUILTINS
 from lpp.object import (
+    Array,
     Boolean,
     Builtin,
     Environment,
     Error,
+    FALSE,
     Function,
+    Hash,
+    Hashable,
+    HashKey,
     Integer,
-    Null,
+    NULL,
     Object,
     ObjectType,
     Return,
     String,
+    TailCall,
+    TRUE,
+    integer_object,
 )
+from lpp.persistent import (
+    Map,
+    Vector,
+)
+from lpp.resolver import mark_positions
 
 
-TRUE = Boolean(True)
-FALSE = Boolean(False)
-NULL = Null()
+# Reading a member of an enum is slower than reading a global.
+_ERROR = ObjectType.ERROR
+_INTEGER = ObjectType.INTEGER
+_RETURN = ObjectType.RETURN
+_STRING = ObjectType.STRING
+_TAIL_CALL = ObjectType.TAIL_CALL
 
 
 _NOT_A_FUNCTION = 'No es una función: {}'
@@ -33,108 +53,63 @@ _TYPE_MISMATCH = 'Discrepancia de tipos: {} {} {}'
 _UNKNOWN_PREFIX_OPERATOR = 'Operador desconocido: {}{}'
 _UNKNOWN_INFIX_OPERATOR = 'Operador desconocido: {} {} {}'
 _UNKNOWN_IDENTIFIER = 'Identificador no encontrado: {}'
+_UNSUPPORTED_INDEX = 'Índice sin soporte: {}[{}]'
+_UNUSABLE_HASH_KEY = 'Llave sin soporte: {}'
 
 
-def evaluate(node: ast.ASTNode, env: Environment) -> Optional[Object]:
-    node_type: Type = type(node)
-
-    if node_type == ast.Program:
-        node = cast(ast.Program, node)
-
-        return _evaluate_program(node, env)
-    elif node_type == ast.ExpressionStatement:
-        node = cast(ast.ExpressionStatement, node)
-
-        assert node.expression is not None
-        return evaluate(node.expression, env)
-    elif node_type == ast.Integer:
-        node = cast(ast.Integer, node)
-
-        assert node.value is not None
-        return Integer(node.value)
-    elif node_type == ast.Boolean:
-        node = cast(ast.Boolean, node)
-
-        assert node.value is not None
-        return _to_boolean_object(node.value)
-    elif node_type == ast.Prefix:
-        node = cast(ast.Prefix, node)
-
-        assert node.right is not None
-        right = evaluate(node.right, env)
-
-        assert right is not None
-        return _evaluate_prefix_expression(node.operator, right)
-    elif node_type == ast.Infix:
-        node = cast(ast.Infix, node)
-
-        assert node.left is not None and node.right is not None
-        left = evaluate(node.left, env)
-        right = evaluate(node.right, env)
-
-        assert right is not None and left is not None
-        return _evaluate_infix_expression(node.operator, left, right)
-    elif node_type == ast.Block:
-        node = cast(ast.Block, node)
-
-        return _evaluate_block_statement(node, env)
-    elif node_type == ast.If:
-        node = cast(ast.If, node)
-
-        return _evaluate_if_expression(node, env)
-    elif node_type == ast.ReturnStatement:
-        node = cast(ast.ReturnStatement, node)
-
-        assert node.return_value is not None
-        value = evaluate(node.return_value, env)
-
-        assert value is not None
-        return Return(value)
-    elif node_type == ast.LetStatement:
-        node = cast(ast.LetStatement, node)
+# Evaluates a node of the type it is registered for in the environment.
+Handler = Callable[[ast.ASTNode, Environment], Optional[Object]]
 
-        assert node.value is not None
-        value = evaluate(node.value, env)
 
-        assert node.name is not None
-        env[node.name.value] = value
-    elif node_type == ast.Identifier:
-        node = cast(ast.Identifier, node)
-
-        return _evaluate_identifier(node, env)
-    elif node_type == ast.Function:
-        node = cast(ast.Function, node)
+def evaluate(node: ast.ASTNode, env: Environment) -> Optional[Object]:
+    return _HANDLERS[type(node)](node, env)
 
-        assert node.body is not None
-        return Function(node.parameters,
-                        node.body,
-                        env)
-    elif node_type == ast.Call:
-        node = cast(ast.Call, node)
 
-        function = evaluate(node.function, env)
+class _ReturnFromExpression(Exception):
+    """Raised by a `regresa` in a `si` used as a value, to leave the
+    expressions around it and end the call with `result`."""
 
-        assert node.arguments is not None
-        args = _evaluate_expression(node.arguments, env)
+    def __init__(self, result: Return) -> None:
+        super().__init__()
+        self.result = result
 
-        assert function is not None
-        return _apply_function(function, args)
-    elif node_type == ast.StringLiteral:
-        node = cast(ast.StringLiteral, node)
 
-        return String(node.value)
+def register(node_type: Type[ast.ASTNode], handler: Handler) -> None:
+    """Evaluate nodes of exactly `node_type` with `handler`, replacing the
+    handler it had.
 
-    return None
+    Handlers evaluate their children calling `evaluate`, or the handler of
+    their type in `_HANDLERS` directly, so embedders can add node types of
+    their own or change how existing ones evaluate.
+    """
+    _HANDLERS[node_type] = handler
 
 
 def _apply_function(fn: Object, args: List[Object]) -> Object:
     if type(fn) == Function:
         fn = cast(Function, fn)
 
-        extended_environment = _extend_function_environment(fn, args)
-        evaluated = evaluate(fn.body, extended_environment)
+        # Calls returned by the body run here, instead of one level deeper
+        # for every call in a row.
+        while True:
+            extended_environment = _extend_function_environment(fn, args)
+            try:
+                evaluated = _HANDLERS[type(fn.body)](fn.body,
+                                                     extended_environment)
+            except _ReturnFromExpression as early_return:
+                evaluated = early_return.result
+
+            if type(evaluated) != TailCall:
+                break
+
+            tail_call = cast(TailCall, evaluated)
+            fn = tail_call.function
+            args = tail_call.arguments
+
+        if evaluated is None:
+            # A body ending in a `variable` or a loop has no value.
+            return NULL
 
-        assert evaluated is not None
         return _unwrap_return_value(evaluated)
     elif type(fn) == Builtin:
         fn = cast(Builtin, fn)
@@ -147,8 +122,9 @@ def _apply_function(fn: Object, args: List[Object]) -> Object:
 def _extend_function_environment(fn: Function, args: List[Object]) -> Environment:
     env = Environment(outer=fn.env)
 
-    for idx, param in enumerate(fn.parameters):
-        env[param.value] = args[idx - 1]
+    # Parameters without an argument are left unset.
+    for param, arg in zip(fn.parameters, args):
+        env[param.value] = arg
 
     return env
 
@@ -160,11 +136,15 @@ def _unwrap_return_value(obj: Object) -> Object:
     return obj
 
 
-def _evaluate_program(program: ast.Program, env: Environment) -> Optional[Object]:
+def _evaluate_program(node: ast.ASTNode, env: Environment) -> Optional[Object]:
+    mark_positions(node)
     result: Optional[Object] = None
 
-    for statement in program.statements:
-        result = evaluate(statement, env)
+    for statement in cast(ast.Program, node).statements:
+        try:
+            result = evaluate(statement, env)
+        except _ReturnFromExpression as early_return:
+            result = early_return.result
 
         if type(result) == Return:
             result = cast(Return, result)
@@ -175,6 +155,28 @@ def _evaluate_program(program: ast.Program, env: Environment) -> Optional[Object
     return result
 
 
+def _evaluate_array(node: ast.ASTNode, env: Environment) -> Object:
+    elements = cast(ast.ArrayLiteral, node).elements
+
+    assert elements is not None
+    return Array(Vector(_evaluate_expression(elements, env)))
+
+
+def _evaluate_assign_statement(node: ast.ASTNode,
+                               env: Environment) -> Optional[Object]:
+    assign_statement = cast(ast.AssignStatement, node)
+
+    assert assign_statement.value is not None
+    value = evaluate(assign_statement.value, env)
+
+    assert assign_statement.name is not None
+    name = assign_statement.name.value
+    if not env.assign(name, value):
+        return _new_error(_UNKNOWN_IDENTIFIER, [name])
+
+    return None
+
+
 def _evaluate_bang_operator_expression(right: Object) -> Object:
     if right is TRUE:
         return FALSE
@@ -186,19 +188,41 @@ def _evaluate_bang_operator_expression(right: Object) -> Object:
         return FALSE
 
 
-def _evaluate_block_statement(block: ast.Block, env: Environment) -> Optional[Object]:
+def _evaluate_block_statement(node: ast.ASTNode,
+                              env: Environment) -> Optional[Object]:
     result: Optional[Object] = None
 
-    for statement in block.statements:
-        result = evaluate(statement, env)
+    for statement in cast(ast.Block, node).statements:
+        result = _HANDLERS[type(statement)](statement, env)
 
-        if result is not None and \
-                (result.type() == ObjectType.RETURN or result.type() == ObjectType.ERROR):
-            return result
+        if result is not None:
+            result_type = result.object_type
+            if result_type is _RETURN or result_type is _ERROR \
+                    or result_type is _TAIL_CALL:
+                return result
 
     return result
 
 
+def _evaluate_boolean(node: ast.ASTNode, env: Environment) -> Object:
+    value = cast(ast.Boolean, node).value
+
+    assert value is not None
+    return _to_boolean_object(value)
+
+
+def _evaluate_call(node: ast.ASTNode, env: Environment) -> Object:
+    call = cast(ast.Call, node)
+
+    function = _HANDLERS[type(call.function)](call.function, env)
+
+    assert call.arguments is not None
+    args = _evaluate_expression(call.arguments, env)
+
+    assert function is not None
+    return _apply_function(function, args)
+
+
 def _evaluate_expression(expressions: List[ast.Expression], env: Environment) -> List[Object]:
     result: List[Object] = []
 
@@ -211,49 +235,163 @@ def _evaluate_expression(expressions: List[ast.Expression], env: Environment) ->
     return result
 
 
-def _evaluate_identifier(node: ast.Identifier, env: Environment) -> Object:
+def _evaluate_expression_statement(node: ast.ASTNode,
+                                   env: Environment) -> Optional[Object]:
+    expression = cast(ast.ExpressionStatement, node).expression
+
+    assert expression is not None
+    return _HANDLERS[type(expression)](expression, env)
+
+
+def _evaluate_function(node: ast.ASTNode, env: Environment) -> Object:
+    function = cast(ast.Function, node)
+
+    assert function.body is not None
+    return Function(function.parameters,
+                    function.body,
+                    env)
+
+
+def _evaluate_hash(node: ast.ASTNode, env: Environment) -> Object:
+    pairs = cast(ast.HashLiteral, node).pairs
+
+    assert pairs is not None
+    items: List[Object] = []
+    for key, value in pairs:
+        evaluated_key = evaluate(key, env)
+        evaluated_value = evaluate(value, env)
+
+        assert evaluated_key is not None and evaluated_value is not None
+        items.append(evaluated_key)
+        items.append(evaluated_value)
+
+    return _evaluate_hash_items(items)
+
+
+def _evaluate_hash_items(items: Sequence[Object]) -> Object:
+    """Return a hash of the keys and values alternating in `items`, the
+    last value of a repeated key wins."""
+    pairs: List[Tuple[HashKey, Tuple[Hashable, Object]]] = []
+
+    for position in range(0, len(items), 2):
+        key = items[position]
+        if not isinstance(key, Hashable):
+            return _new_error(_UNUSABLE_HASH_KEY, [key.type().name])
+
+        pairs.append((key.hash_key(), (key, items[position + 1])))
+
+    return Hash(Map(pairs))
+
+
+def _evaluate_identifier(node: ast.ASTNode, env: Environment) -> Object:
+    name = cast(ast.Identifier, node).value
+
     try:
-        return env[node.value]
+        return env[name]
     except KeyError:
-        return BUILTINS.get(node.value, 
-                            _new_error(_UNKNOWN_IDENTIFIER, [node.value]))
+        return BUILTINS.get(name, _new_error(_UNKNOWN_IDENTIFIER, [name]))
+
 
+def _evaluate_if_expression(node: ast.ASTNode,
+                            env: Environment) -> Optional[Object]:
+    if_expression = cast(ast.If, node)
 
-def _evaluate_if_expression(if_expression: ast.If, env: Environment) -> Optional[Object]:
     assert if_expression.condition is not None
-    condition = evaluate(if_expression.condition, env)
+    condition = _HANDLERS[type(if_expression.condition)](
+        if_expression.condition, env)
 
     assert condition is not None
     if _is_truthy(condition):
         assert if_expression.consequence is not None
-        return evaluate(if_expression.consequence, env)
+        result = _HANDLERS[type(if_expression.consequence)](
+            if_expression.consequence, env)
     elif if_expression.alternative is not None:
-        return evaluate(if_expression.alternative, env)
+        result = _HANDLERS[type(if_expression.alternative)](
+            if_expression.alternative, env)
     else:
         return NULL
 
+    if result is None and if_expression.in_expression:
+        # A branch without a value used as a value.
+        return NULL
+
+    return result
+
+
+def _evaluate_index(node: ast.ASTNode, env: Environment) -> Object:
+    index = cast(ast.Index, node)
+
+    left = evaluate(index.left, env)
+    assert index.index is not None
+    position = evaluate(index.index, env)
+
+    assert left is not None and position is not None
+    return _evaluate_index_expression(left, position)
+
+
+def _evaluate_index_expression(left: Object, index: Object) -> Object:
+    if type(left) is Array and type(index) is Integer:
+        array = cast(Array, left)
+        position = cast(Integer, index).value
+
+        if 0 <= position < len(array.elements):
+            return array.elements[position]
+
+        return NULL
+    elif type(left) is Hash:
+        if not isinstance(index, Hashable):
+            return _new_error(_UNUSABLE_HASH_KEY, [index.type().name])
+
+        pair = cast(Hash, left).pairs.get(index.hash_key())
+
+        return pair[1] if pair is not None else NULL
+
+    return _new_error(_UNSUPPORTED_INDEX, [left.type().name,
+                                           index.type().name])
+
+
+def _evaluate_infix(node: ast.ASTNode, env: Environment) -> Object:
+    infix = cast(ast.Infix, node)
+
+    assert infix.left is not None and infix.right is not None
+    left = _HANDLERS[type(infix.left)](infix.left, env)
+    right = _HANDLERS[type(infix.right)](infix.right, env)
+
+    assert right is not None and left is not None
+    return _evaluate_infix_expression(infix.operator, left, right)
+
 
 def _evaluate_infix_expression(operator: str, 
                                 left: Object, 
                                 right: Object) -> Object:
-    if left.type() == ObjectType.INTEGER \
-            and right.type() == ObjectType.INTEGER:
+    left_type = left.object_type
+    right_type = right.object_type
+
+    if left_type is _INTEGER and right_type is _INTEGER:
         return _evaluate_integer_infix_expression(operator, left, right)
-    elif left.type() == ObjectType.STRING \
-            and right.type() == ObjectType.STRING:
+    elif left_type is _STRING and right_type is _STRING:
         return _evaluate_string_infix_expression(operator, left, right)
     elif operator == '==':
         return _to_boolean_object(left is right)
     elif operator == '!=':
         return _to_boolean_object(left is not right)
-    elif left.type() != right.type():
-        return _new_error(_TYPE_MISMATCH, [left.type().name, 
+    elif left_type is not right_type:
+        return _new_error(_TYPE_MISMATCH, [left_type.name, 
                                            operator, 
-                                           right.type().name])
+                                           right_type.name])
     else:
-        return _new_error(_UNKNOWN_INFIX_OPERATOR, [left.type().name, 
+        return _new_error(_UNKNOWN_INFIX_OPERATOR, [left_type.name, 
                                                     operator, 
-                                                    right.type().name])
+                                                    right_type.name])
+
+
+def _evaluate_integer(node: ast.ASTNode, env: Environment) -> Object:
+    integer = cast(ast.Integer, node)
+    if integer.object is None:
+        assert integer.value is not None
+        integer.object = integer_object(integer.value)
+
+    return integer.object
 
 
 def _evaluate_integer_infix_expression(operator: str,
@@ -263,13 +401,13 @@ def _evaluate_integer_infix_expression(operator: str,
     right_value: int = cast(Integer, right).value
 
     if operator == '+':
-        return Integer(left_value + right_value)
+        return integer_object(left_value + right_value)
     elif operator == '-':
-        return Integer(left_value - right_value)
+        return integer_object(left_value - right_value)
     elif operator == '*':
-        return Integer(left_value * right_value)
+        return integer_object(left_value * right_value)
     elif operator == '/':
-        return Integer(left_value // right_value)
+        return integer_object(left_value // right_value)
     elif operator == '<':
         return _to_boolean_object(left_value < right_value)
     elif operator == '>':
@@ -284,13 +422,33 @@ def _evaluate_integer_infix_expression(operator: str,
                                                     right.type().name])
 
 
+def _evaluate_let_statement(node: ast.ASTNode, env: Environment) -> None:
+    let_statement = cast(ast.LetStatement, node)
+
+    assert let_statement.value is not None
+    value = evaluate(let_statement.value, env)
+
+    assert let_statement.name is not None
+    env[let_statement.name.value] = value
+
+
 def _evaluate_minus_operator_expression(right: Object) -> Object:
     if type(right) != Integer:
         return _new_error(_UNKNOWN_PREFIX_OPERATOR, ['-', right.type().name])
 
     right = cast(Integer, right)
 
-    return Integer(-right.value)
+    return integer_object(-right.value)
+
+
+def _evaluate_prefix(node: ast.ASTNode, env: Environment) -> Object:
+    prefix = cast(ast.Prefix, node)
+
+    assert prefix.right is not None
+    right = evaluate(prefix.right, env)
+
+    assert right is not None
+    return _evaluate_prefix_expression(prefix.operator, right)
 
 
 def _evaluate_prefix_expression(operator: str, right: Object) -> Object:
@@ -302,15 +460,47 @@ def _evaluate_prefix_expression(operator: str, right: Object) -> Object:
         return _new_error(_UNKNOWN_PREFIX_OPERATOR, [operator, right.type().name])
 
 
+def _evaluate_return_statement(node: ast.ASTNode, env: Environment) -> Object:
+    return_statement = cast(ast.ReturnStatement, node)
+    return_value = return_statement.return_value
+
+    assert return_value is not None
+    if return_statement.tail:
+        call = cast(ast.Call, return_value)
+        function = evaluate(call.function, env)
+
+        assert call.arguments is not None
+        args = _evaluate_expression(call.arguments, env)
+
+        if type(function) == Function:
+            return TailCall(cast(Function, function), args)
+
+        assert function is not None
+        return Return(_apply_function(function, args))
+
+    value = _HANDLERS[type(return_value)](return_value, env)
+
+    assert value is not None
+    if return_statement.in_expression:
+        raise _ReturnFromExpression(Return(value))
+
+    return Return(value)
+
+
+def _evaluate_string(node: ast.ASTNode, env: Environment) -> Object:
+    return String(cast(ast.StringLiteral, node).value)
+
+
 def _evaluate_string_infix_expression(operator: str,
                                       left: Object,
                                       right: Object) -> Object:
+    if operator == '+':
+        return cast(String, left).concat(cast(String, right))
+
     left_value: str = cast(String, left).value
     right_value: str = cast(String, right).value
 
-    if operator == '+':
-        return String(left_value + right_value)
-    elif operator == '==':
+    if operator == '==':
         return _to_boolean_object(left_value == right_value)
     elif operator == '!=':
         return _to_boolean_object(left_value != right_value)
@@ -319,6 +509,34 @@ def _evaluate_string_infix_expression(operator: str,
                                                     operator,
                                                     right.type().name])
 
+def _evaluate_while_statement(node: ast.ASTNode,
+                              env: Environment) -> Optional[Object]:
+    while_statement = cast(ast.WhileStatement, node)
+    condition = while_statement.condition
+    body = while_statement.body
+    assert condition is not None and body is not None
+
+    # Handlers are looked up once, and the loop runs the statements of its
+    # body itself instead of evaluating the block every iteration.
+    evaluate_condition = _HANDLERS.get(type(condition), evaluate)
+    statements = [(_HANDLERS.get(type(statement), evaluate), statement)
+                  for statement in body.statements]
+
+    while True:
+        value = evaluate_condition(condition, env)
+        if type(value) is Error:
+            return value
+        elif value is FALSE or value is NULL:
+            return None
+
+        for handler, statement in statements:
+            result = handler(statement, env)
+
+            result_type = type(result)
+            if result_type is Return or result_type is Error:
+                return result
+
+
 def _is_truthy(obj: Object) -> bool:
     if obj is NULL:
         return False
@@ -337,3 +555,36 @@ def _new_error(message: str, args: List[Any]) -> Error:
 def _to_boolean_object(value: bool) -> Boolean:
     return TRUE if value else FALSE
 
+
+def _evaluate_unknown(node: ast.ASTNode, env: Environment) -> None:
+    return None
+
+
+class _HandlerTable(Dict[Type[ast.ASTNode], Handler]):
+    """Handlers by node type. Nodes of a type without one have no value."""
+
+    def __missing__(self, node_type: Type[ast.ASTNode]) -> Handler:
+        return _evaluate_unknown
+
+
+_HANDLERS: Dict[Type[ast.ASTNode], Handler] = _HandlerTable({
+    ast.ArrayLiteral: _evaluate_array,
+    ast.AssignStatement: _evaluate_assign_statement,
+    ast.Block: _evaluate_block_statement,
+    ast.Boolean: _evaluate_boolean,
+    ast.Call: _evaluate_call,
+    ast.ExpressionStatement: _evaluate_expression_statement,
+    ast.Function: _evaluate_function,
+    ast.HashLiteral: _evaluate_hash,
+    ast.Identifier: _evaluate_identifier,
+    ast.If: _evaluate_if_expression,
+    ast.Index: _evaluate_index,
+    ast.Infix: _evaluate_infix,
+    ast.Integer: _evaluate_integer,
+    ast.LetStatement: _evaluate_let_statement,
+    ast.Prefix: _evaluate_prefix,
+    ast.Program: _evaluate_program,
+    ast.ReturnStatement: _evaluate_return_statement,
+    ast.StringLiteral: _evaluate_string,
+    ast.WhileStatement: _evaluate_while_statement,
+})
@@ -0,0 +1,133 @@
+from bisect import (
+    bisect_left,
+    bisect_right,
+)
+from collections import deque
+from typing import (
+    Deque,
+    List,
+    Optional,
+    Tuple,
+)
+
+from lpp.ast import (
+    Program,
+    Statement,
+)
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+from lpp.token import (
+    Token,
+    TokenType,
+)
+
+
+class IncrementalParser:
+    """Keeps a program parsed while its source is edited.
+
+    The program is tracked as a list of top-level statements together with
+    the offset where each one starts and the parse errors it produced. An
+    edit only re-lexes and re-parses from the statement just before it
+    until the new statements line up again with a statement boundary past
+    the edit. The statements after that point are reused as they are.
+    """
+
+    def __init__(self, source: str) -> None:
+        self._source: str = ''
+        self._starts: List[int] = []
+        self._statements: List[Optional[Statement]] = []
+        self._errors: List[List[str]] = []
+
+        self.edit(0, 0, source)
+
+    @property
+    def errors(self) -> List[str]:
+        return [error for errors in self._errors for error in errors]
+
+    @property
+    def program(self) -> Program:
+        return Program(statements=[statement
+                                   for statement in self._statements
+                                   if statement is not None])
+
+    @property
+    def source(self) -> str:
+        return self._source
+
+    def edit(self, offset: int, deleted_length: int, inserted_text: str) -> Program:
+        """Replace `deleted_length` characters at `offset` with
+        `inserted_text` and bring the program up to date."""
+        delta = len(inserted_text) - deleted_length
+        edit_end = offset + deleted_length
+        self._source = self._source[:offset] + inserted_text + \
+            self._source[edit_end:]
+
+        # Parsing a statement peeks at the first token of the next one, so
+        # the statement before the edited one is parsed again too.
+        first = max(bisect_right(self._starts, offset - 1) - 2, 0)
+        position = self._starts[first] if first > 0 else 0
+
+        lexer = _RecordingLexer(self._source, position)
+        parser = _StatementParser(lexer)
+
+        starts: List[int] = []
+        statements: List[Optional[Statement]] = []
+        errors: List[List[str]] = []
+        reused = len(self._starts)
+
+        while not parser.at_end():
+            start = lexer.current_start()
+
+            if starts:
+                # Past the edit the source is unchanged, so from an old
+                # statement boundary on everything parses the same.
+                old_start = start - delta
+                index = bisect_left(self._starts, old_start)
+                if old_start >= edit_end and index < len(self._starts) \
+                        and self._starts[index] == old_start:
+                    reused = index
+                    break
+
+            statement, statement_errors = parser.parse_statement()
+            starts.append(start)
+            statements.append(statement)
+            errors.append(statement_errors)
+
+        self._starts[first:] = starts + \
+            [start + delta for start in self._starts[reused:]]
+        self._statements[first:] = statements + self._statements[reused:]
+        self._errors[first:] = errors + self._errors[reused:]
+
+        return self.program
+
+
+class _RecordingLexer(Lexer):
+    """Lexer that remembers where its last two tokens start, which are the
+    current and the peek tokens of the parser reading from it."""
+
+    def __init__(self, source: str, position: int) -> None:
+        super().__init__(source, position)
+        self._starts: Deque[int] = deque(maxlen=2)
+
+    def current_start(self) -> int:
+        return self._starts[0]
+
+    def next_token(self) -> Token:
+        token = super().next_token()
+        self._starts.append(self.token_span(token)[0])
+
+        return token
+
+
+class _StatementParser(Parser):
+
+    def at_end(self) -> bool:
+        assert self._current_token is not None
+        return self._current_token.token_type == TokenType.EOF
+
+    def parse_statement(self) -> Tuple[Optional[Statement], List[str]]:
+        errors = len(self._errors)
+        statement = self._parse_statement()
+        self._advance_tokens()
+
+        return statement, self._errors[errors:]
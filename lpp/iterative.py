@@ -0,0 +1,307 @@
+from typing import (
+    Any,
+    List,
+    Optional,
+    Tuple,
+)
+
+import lpp.ast as ast
+from lpp.builtins import BUILTINS
+from lpp.evaluator import (
+    FALSE,
+    NULL,
+    TRUE,
+    _HANDLERS,
+    _NOT_A_FUNCTION,
+    _UNKNOWN_IDENTIFIER,
+    _evaluate_hash_items,
+    _evaluate_index_expression,
+    _evaluate_infix_expression,
+    _evaluate_prefix_expression,
+    _new_error,
+)
+from lpp.object import (
+    Array,
+    Builtin,
+    Environment,
+    Error,
+    Function,
+    Object,
+    Return,
+    String,
+    integer_object,
+)
+from lpp.persistent import Vector
+from lpp.resolver import mark_positions
+
+
+# What is left to do with a node once the values it needs are on the value
+# stack.
+_EVALUATE = 0
+_STATEMENTS = 1
+_INFIX = 2
+_CALL = 3
+_END_CALL = 4
+_IF = 5
+_RETURN = 6
+_LET = 7
+_PREFIX = 8
+_TAIL_CALL = 9
+_WHILE = 10
+_WHILE_BODY = 11
+_ASSIGN = 12
+_ARRAY = 13
+_INDEX = 14
+_HASH = 15
+_VALUE = 16
+
+# Kind of work, its node, the environment it runs in and a number whose
+# meaning depends on the kind. Nodes and values are Any so their fields are
+# used without a cast() call, which would run for every node.
+_Work = Tuple[int, Any, Environment, int]
+
+
+def evaluate(node: ast.ASTNode, env: Environment) -> Optional[Object]:
+    """Evaluate `node` like lpp.evaluator does, keeping what is left to do
+    on a list instead of on the Python stack.
+
+    LPP calls don't nest Python calls, so recursion is only bound by
+    memory. A call returned by `regresa` replaces the call it returns from,
+    so tail recursion runs in constant memory. Node types registered in
+    lpp.evaluator that this loop doesn't know are evaluated by their
+    handler.
+    """
+    root = node
+    if type(root) is ast.Program:
+        mark_positions(root)
+
+    values: List[Any] = []
+    work: List[_Work] = [(_EVALUATE, node, env, 0)]
+    push_value = values.append
+    pop_value = values.pop
+    push = work.append
+    pop = work.pop
+
+    while work:
+        kind, current, env, count = pop()
+
+        if kind == _EVALUATE:
+            node_type = type(current)
+
+            if node_type is ast.Identifier:
+                name = current.value
+                try:
+                    push_value(env[name])
+                except KeyError:
+                    push_value(BUILTINS.get(name)
+                               or _new_error(_UNKNOWN_IDENTIFIER, [name]))
+            elif node_type is ast.Integer:
+                value = current.object
+                if value is None:
+                    value = current.object = integer_object(current.value)
+                push_value(value)
+            elif node_type is ast.Infix:
+                push((_INFIX, current, env, 0))
+                push((_EVALUATE, current.right, env, 0))
+                push((_EVALUATE, current.left, env, 0))
+            elif node_type is ast.Call:
+                arguments = current.arguments
+                push((_CALL, current, env, len(arguments)))
+                for argument in reversed(arguments):
+                    push((_EVALUATE, argument, env, 0))
+                push((_EVALUATE, current.function, env, 0))
+            elif node_type is ast.ExpressionStatement:
+                push((_EVALUATE, current.expression, env, 0))
+            elif node_type is ast.If:
+                push((_IF, current, env, 0))
+                push((_EVALUATE, current.condition, env, 0))
+            elif node_type is ast.ReturnStatement:
+                if current.tail:
+                    call = current.return_value
+                    arguments = call.arguments
+                    push((_TAIL_CALL, call, env, len(arguments)))
+                    for argument in reversed(arguments):
+                        push((_EVALUATE, argument, env, 0))
+                    push((_EVALUATE, call.function, env, 0))
+                else:
+                    push((_RETURN, current, env, 0))
+                    push((_EVALUATE, current.return_value, env, 0))
+            elif node_type is ast.Block or node_type is ast.Program:
+                push((_STATEMENTS, current, env, 0))
+            elif node_type is ast.LetStatement:
+                push((_LET, current, env, 0))
+                push((_EVALUATE, current.value, env, 0))
+            elif node_type is ast.Boolean:
+                push_value(TRUE if current.value else FALSE)
+            elif node_type is ast.StringLiteral:
+                push_value(String(current.value))
+            elif node_type is ast.Prefix:
+                push((_PREFIX, current, env, 0))
+                push((_EVALUATE, current.right, env, 0))
+            elif node_type is ast.Function:
+                push_value(Function(current.parameters, current.body, env))
+            elif node_type is ast.AssignStatement:
+                push((_ASSIGN, current, env, 0))
+                push((_EVALUATE, current.value, env, 0))
+            elif node_type is ast.WhileStatement:
+                push((_WHILE, current, env, 0))
+                push((_EVALUATE, current.condition, env, 0))
+            elif node_type is ast.ArrayLiteral:
+                elements = current.elements
+                push((_ARRAY, current, env, len(elements)))
+                for element in reversed(elements):
+                    push((_EVALUATE, element, env, 0))
+            elif node_type is ast.HashLiteral:
+                pairs = current.pairs
+                push((_HASH, current, env, 2 * len(pairs)))
+                for key, value in reversed(pairs):
+                    push((_EVALUATE, value, env, 0))
+                    push((_EVALUATE, key, env, 0))
+            elif node_type is ast.Index:
+                push((_INDEX, current, env, 0))
+                push((_EVALUATE, current.index, env, 0))
+                push((_EVALUATE, current.left, env, 0))
+            else:
+                handler = _HANDLERS.get(node_type)
+                push_value(handler(current, env) if handler is not None else None)
+        elif kind == _STATEMENTS:
+            # `count` is the index of the next statement, the value of the
+            # one before it is on the value stack.
+            statements = current.statements
+            if count:
+                result_type = type(values[-1])
+                if result_type is Return or result_type is Error:
+                    continue
+                pop_value()
+            elif not statements:
+                push_value(None)
+                continue
+
+            # The value of the last statement is the value of the block
+            # whatever it is, so nothing is left to do after it.
+            if count + 1 < len(statements):
+                push((_STATEMENTS, current, env, count + 1))
+            push((_EVALUATE, statements[count], env, 0))
+        elif kind == _INFIX:
+            right = pop_value()
+            values[-1] = _evaluate_infix_expression(current.operator,
+                                                    values[-1],
+                                                    right)
+        elif kind == _CALL or kind == _TAIL_CALL:
+            if count:
+                arguments = values[-count:]
+                del values[-count:]
+            else:
+                arguments = []
+            function = pop_value()
+
+            if type(function) is Function:
+                call_env = Environment(outer=function.env)
+                # Parameters without an argument are left unset.
+                for parameter, argument in zip(function.parameters,
+                                               arguments):
+                    call_env[parameter.value] = argument
+
+                if kind == _CALL:
+                    # With the height of the value stack the call starts at.
+                    push((_END_CALL, None, call_env, len(values)))
+                else:
+                    # The rest of the body won't run, the call takes the
+                    # place of the one it returns from.
+                    while work[-1][0] != _END_CALL:
+                        pop()
+                push((_STATEMENTS, function.body, call_env, 0))
+            elif type(function) is Builtin:
+                result = function.fn(*arguments)
+                push_value(result if kind == _CALL else Return(result))
+            else:
+                assert function is not None
+                error = _new_error(_NOT_A_FUNCTION, [function.type().name])
+                push_value(error if kind == _CALL else Return(error))
+        elif kind == _END_CALL:
+            result = values[-1]
+            if type(result) is Return:
+                values[-1] = result.value
+            elif result is None:
+                # A body ending in a `variable` has no value.
+                values[-1] = NULL
+        elif kind == _IF:
+            condition = pop_value()
+            if condition is not FALSE and condition is not NULL:
+                block = current.consequence
+            elif current.alternative is not None:
+                block = current.alternative
+            else:
+                push_value(NULL)
+                continue
+
+            if current.in_expression:
+                push((_VALUE, current, env, 0))
+            push((_STATEMENTS, block, env, 0))
+        elif kind == _VALUE:
+            # A branch without a value used as a value.
+            if values[-1] is None:
+                values[-1] = NULL
+        elif kind == _RETURN:
+            result = Return(values[-1])
+            if current.in_expression:
+                # Leave the expressions around it, up to the end of the call
+                # or of the program.
+                while work and work[-1][0] != _END_CALL:
+                    pop()
+                del values[work[-1][3] if work else 0:]
+                push_value(result)
+            else:
+                values[-1] = result
+        elif kind == _LET:
+            env[current.name.value] = values[-1]
+            values[-1] = None
+        elif kind == _WHILE:
+            condition = values[-1]
+            if type(condition) is Error:
+                continue
+
+            if condition is FALSE or condition is NULL:
+                values[-1] = None
+            else:
+                pop_value()
+                push((_WHILE_BODY, current, env, 0))
+                push((_STATEMENTS, current.body, env, 0))
+        elif kind == _WHILE_BODY:
+            # A return or an error stops the loop and the block around it.
+            result_type = type(values[-1])
+            if result_type is not Return and result_type is not Error:
+                pop_value()
+                push((_WHILE, current, env, 0))
+                push((_EVALUATE, current.condition, env, 0))
+        elif kind == _ASSIGN:
+            name = current.name.value
+            if env.assign(name, values[-1]):
+                values[-1] = None
+            else:
+                values[-1] = _new_error(_UNKNOWN_IDENTIFIER, [name])
+        elif kind == _ARRAY:
+            if count:
+                elements = values[-count:]
+                del values[-count:]
+            else:
+                elements = []
+            push_value(Array(Vector(elements)))
+        elif kind == _HASH:
+            if count:
+                items = values[-count:]
+                del values[-count:]
+            else:
+                items = []
+            push_value(_evaluate_hash_items(items))
+        elif kind == _INDEX:
+            index = pop_value()
+            values[-1] = _evaluate_index_expression(values[-1], index)
+        else:
+            values[-1] = _evaluate_prefix_expression(current.operator, values[-1])
+
+    result = values[-1]
+    if type(root) is ast.Program and type(result) is Return:
+        return result.value
+
+    return result
@@ -1,143 +1,533 @@
-from re import match
+from array import array
+from bisect import bisect_right
+from functools import partial
+from mmap import (
+    ACCESS_READ,
+    mmap,
+)
+from sys import intern
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    TextIO,
+    Tuple,
+    Union,
+)
 
 from lpp.token import (
+    KEYWORDS,
     lookup_token_type,
     Token,
     TokenType,
 )
 
+
+_LETTERS: FrozenSet[str] = frozenset(
+    'abcdefghijklmnopqrstuvwxyz'
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    'áéíóúÁÉÍÓÚñÑ_'
+)
+_DIGITS: FrozenSet[str] = frozenset('0123456789')
+_IDENTIFIER_CHARACTERS: FrozenSet[str] = _LETTERS | _DIGITS
+# Every ASCII character \s matched, separators \x1c to \x1f included.
+_WHITESPACE: FrozenSet[str] = frozenset(
+    chr(code) for code in range(0x80) if chr(code).isspace()
+)
+
+_SINGLE_CHARACTER_TOKENS: Dict[str, TokenType] = {
+    '=': TokenType.ASSIGN,
+    '+': TokenType.PLUS,
+    '(': TokenType.LPAREN,
+    ')': TokenType.RPAREN,
+    '{': TokenType.LBRACE,
+    '}': TokenType.RBRACE,
+    '[': TokenType.LBRACKET,
+    ']': TokenType.RBRACKET,
+    ',': TokenType.COMMA,
+    ':': TokenType.COLON,
+    ';': TokenType.SEMICOLON,
+    '-': TokenType.MINUS,
+    '/': TokenType.DIVISION,
+    '*': TokenType.MULTIPLICATION,
+    '<': TokenType.LT,
+    '>': TokenType.GT,
+    '!': TokenType.NEGATION,
+}
+_TWO_CHARACTER_TOKENS: Dict[str, TokenType] = {
+    '==': TokenType.EQ,
+    '!=': TokenType.NOT_EQ,
+}
+
+# Tokens are immutable, so operators and delimiters are built only once.
+_OPERATOR_TOKENS: Dict[str, Token] = {
+    literal: Token(token_type, literal)
+    for literal, token_type in [*_SINGLE_CHARACTER_TOKENS.items(),
+                                *_TWO_CHARACTER_TOKENS.items()]
+}
+_EOF_TOKEN: Token = Token(TokenType.EOF, '')
+
+# The same tables over the UTF-8 encoded source used by memory-mapped files.
+# Every non-ASCII character that can appear in an identifier is two bytes
+# long and starts with 0xC3.
+_LETTER_BYTES: FrozenSet[int] = frozenset(
+    ord(letter) for letter in _LETTERS if letter < '\x80'
+)
+_DIGIT_BYTES: FrozenSet[int] = frozenset(b'0123456789')
+_IDENTIFIER_BYTES: FrozenSet[int] = _LETTER_BYTES | _DIGIT_BYTES
+_WHITESPACE_BYTES: FrozenSet[int] = frozenset(
+    byte for byte in range(0x80) if chr(byte).isspace()
+)
+_OPERATOR_BYTE_TOKENS: Dict[bytes, Token] = {
+    literal.encode(): token for literal, token in _OPERATOR_TOKENS.items()
+}
+_QUOTE_BYTE: int = ord('"')
+
+_TOKEN_TYPES: Dict[int, TokenType] = {
+    token_type.value: token_type for token_type in TokenType
+}
+_WORD_TYPES: FrozenSet[int] = frozenset(
+    [TokenType.IDENT.value] +
+    [token_type.value for token_type in KEYWORDS.values()]
+)
+
+
 class Lexer:
 
-    def __init__(self, source: str) -> None:
+    def __init__(self, source: str, position: int = 0) -> None:
         self._source: str = source
-        self._position: int = 0
-        self._read_position: int = 0
-        self._character: str = ''
+        self._length: int = len(source)
+        self._position: int = position
+        self._identifier_tokens: Dict[str, Token] = {}
+
+    @classmethod
+    def from_stream(cls,
+                    stream: Union[TextIO, Iterable[str]],
+                    chunk_size: int = 65536) -> 'Lexer':
+        """Return a lexer that reads `stream` in chunks of `chunk_size`
+        characters instead of holding the whole program in memory.
+
+        `stream` is either a text file object or an iterable of strings.
+        """
+        chunks: Iterator[str]
+        if hasattr(stream, 'read'):
+            chunks = iter(partial(stream.read, chunk_size), '')  # type: ignore
+        else:
+            chunks = iter(stream)
 
-        self._read_character()
+        return _StreamLexer(chunks)
 
-    def next_token(self) -> Token:
-        self._skip_whitespace()
+    @classmethod
+    def from_path(cls, path: str) -> 'Lexer':
+        """Return a lexer over a memory map of the UTF-8 file at `path`.
 
-        if match(r'^=$', self._character):
-            if self._peek_character() == '=':
-                token = self._make_two_character_token(TokenType.EQ)
-            else:
-                token = Token(TokenType.ASSIGN, self._character)
-        elif match(r'^\+$', self._character):
-            token = Token(TokenType.PLUS, self._character)
-        elif match(r'^$', self._character):
-            token = Token(TokenType.EOF, self._character)
-        elif match(r'^\($', self._character):
-            token = Token(TokenType.LPAREN, self._character)
-        elif match(r'^\)$', self._character):
-            token = Token(TokenType.RPAREN, self._character)
-        elif match(r'^{$', self._character):
-            token = Token(TokenType.LBRACE, self._character)
-        elif match(r'^}$', self._character):
-            token = Token(TokenType.RBRACE, self._character)
-        elif match(r'^,$', self._character):
-            token = Token(TokenType.COMMA, self._character)
-        elif match(r'^;$', self._character):
-            token = Token(TokenType.SEMICOLON, self._character)
-        elif match(r'^-$', self._character):
-            token = Token(TokenType.MINUS, self._character)
-        elif match(r'^/$', self._character):
-            token = Token(TokenType.DIVISION, self._character)
-        elif match(r'^\*$', self._character):
-            token = Token(TokenType.MULTIPLICATION, self._character)
-        elif match(r'^<$', self._character):
-            token = Token(TokenType.LT, self._character)
-        elif match(r'^>$', self._character):
-            token = Token(TokenType.GT, self._character)
-        elif match(r'^!$', self._character):
-            if self._peek_character() == '=':
-                token = self._make_two_character_token(TokenType.NOT_EQ)
+        Only the literals of the emitted tokens are decoded, the source
+        itself is never copied into a str. The map is closed when the lexer
+        reaches the end of the file.
+        """
+        with open(path, 'rb') as source_file:
+            try:
+                buffer = mmap(source_file.fileno(), 0, access=ACCESS_READ)
+            except ValueError:
+                # Empty files can't be mapped.
+                return cls('')
+
+        return _MappedLexer(buffer)
+
+    def next_token(self) -> Token:
+        source = self._source
+        length = self._length
+        position = self._position
+
+        # Skip whitespace. The table holds the ASCII characters, isspace the
+        # rest that \s matched.
+        while position < length:
+            character = source[position]
+            if character in _WHITESPACE or \
+                    (character > '\x7f' and character.isspace()):
+                position += 1
             else:
-                token = Token(TokenType.NEGATION, self._character)
-        elif self._is_letter(self._character):
+                break
+        else:
+            self._position = position
+
+            return _EOF_TOKEN
+
+        self._position = position
+
+        if character in _SINGLE_CHARACTER_TOKENS:
+            pair = source[position:position + 2]
+            if pair in _TWO_CHARACTER_TOKENS:
+                self._position = position + 2
+
+                return _OPERATOR_TOKENS[pair]
+
+            self._position = position + 1
+
+            return _OPERATOR_TOKENS[character]
+        elif character in _LETTERS:
             literal = self._read_identifier()
-            token_type = lookup_token_type(literal)
 
-            return Token(token_type, literal)
-        elif self._is_number(self._character):
+            # Identifiers repeat a lot, so their tokens are built only once.
+            # Their literals are interned so every lexer, and the
+            # environments keyed by them, share a single string.
+            token = self._identifier_tokens.get(literal)
+            if token is None:
+                token = self._identifier_token(literal)
+                self._identifier_tokens[token.literal] = token
+
+            return token
+        elif _is_number(character):
             literal = self._read_number()
 
             return Token(TokenType.INT, literal)
-        elif match(r'^"$', self._character):
+        elif character == '"':
             literal = self._read_string()
 
             return Token(TokenType.STRING, literal)
-        else:
-            token = Token(TokenType.ILLEGAL, self._character)
 
-        self._read_character()
+        self._position = position + 1
+
+        return Token(TokenType.ILLEGAL, character)
+
+    def token_span(self, token: Token) -> Tuple[int, int]:
+        """Return the offsets where the text of `token`, the last one
+        returned by `next_token`, starts and ends."""
+        # next_token leaves the lexer right after the token's text, so the
+        # text's length is all that's needed to find where it starts.
+        end = min(self._position, self._length)
+        if token.token_type == TokenType.STRING:
+            return self._position - len(token.literal) - 2, end
+
+        return end - len(token.literal), end
+
+    def _identifier_token(self, literal: str) -> Token:
+        literal = intern(literal)
+
+        return Token(lookup_token_type(literal), literal)
+
+    def _read_identifier(self) -> str:
+        source = self._source
+        length = self._length
+        initial_position = self._position
+        position = initial_position + 1
+
+        while position < length:
+            character = source[position]
+            if character in _IDENTIFIER_CHARACTERS or \
+                    (character > '\x7f' and character.isdecimal()):
+                position += 1
+            else:
+                break
+
+        self._position = position
+
+        return source[initial_position:position]
+
+    def _read_number(self) -> str:
+        source = self._source
+        length = self._length
+        initial_position = self._position
+        position = initial_position + 1
+
+        while position < length and _is_number(source[position]):
+            position += 1
+
+        self._position = position
+
+        return source[initial_position:position]
+
+    def _read_string(self) -> str:
+        initial_position = self._position + 1
+        closing_quote = self._source.find('"', initial_position)
+
+        if closing_quote == -1:
+            closing_quote = self._length
+
+        self._position = closing_quote + 1
+
+        return self._source[initial_position:closing_quote]
+
+
+class _StreamLexer(Lexer):
+    """Lexer over a bounded buffer that is refilled from an iterator of
+    chunks.
+
+    A token that touches the end of the buffer might continue in the next
+    chunk (an identifier, a string, `=` followed by `=`), so it is scanned
+    again once more source is available. Consumed source is dropped on
+    every refill, so the buffer only ever holds the current chunk and the
+    token being read.
+    """
+
+    def __init__(self, chunks: Iterator[str]) -> None:
+        super().__init__('')
+        self._chunks = chunks
+        self._exhausted = False
+
+    def next_token(self) -> Token:
+        start = self._position
+        token = super().next_token()
+
+        while self._position >= self._length and not self._exhausted:
+            self._refill(start)
+            start = 0
+            token = super().next_token()
 
         return token
 
-    def _is_letter(self, character: str) -> bool:
-        return bool(match(r'^[a-záéíóúA-ZÁÉÍÓÚñÑ_]$', character))
+    def _refill(self, start: int) -> None:
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._exhausted = True
+            chunk = ''
+
+        self._source = self._source[start:] + chunk
+        self._length = len(self._source)
+        self._position = 0
+        # Tokens are only reused within a chunk, otherwise a stream of
+        # distinct identifiers would keep all of them.
+        self._identifier_tokens.clear()
+
+
+class _MappedLexer(Lexer):
+    """Lexer over the UTF-8 bytes of a memory-mapped file.
+
+    ASCII bytes are classified through the byte tables, anything else is
+    decoded one character at a time and classified like in `Lexer`.
+
+    Nothing is read past the end of the file, so the map is closed as soon
+    as the end is reached instead of whenever the lexer is collected.
+    """
 
-    def _is_number(self, character: str) -> bool:
-        return bool(match(r'^\d$', character))
+    def __init__(self, buffer: mmap) -> None:
+        super().__init__('')
+        self._buffer = buffer
+        self._length = len(buffer)
 
-    def _make_two_character_token(self, token_type: TokenType) -> Token:
-        prefix = self._character
-        self._read_character()
-        suffix = self._character
+    def next_token(self) -> Token:
+        buffer = self._buffer
+        length = self._length
+        position = self._position
+
+        # Skip whitespace.
+        while position < length:
+            byte = buffer[position]
+            if byte in _WHITESPACE_BYTES:
+                position += 1
+            elif byte > 0x7f and self._character_at(position).isspace():
+                position += _utf8_width(byte)
+            else:
+                break
+        else:
+            self._position = position
+            buffer.close()
+
+            return _EOF_TOKEN
 
-        return Token(token_type, f'{prefix}{suffix}')
+        self._position = position
 
-    def _peek_character(self) -> str:
-        if self._read_position >= len(self._source):
-            return ''
+        operator = buffer[position:position + 2]
+        if operator in _OPERATOR_BYTE_TOKENS:
+            self._position = position + 2
 
-        return self._source[self._read_position]
+            return _OPERATOR_BYTE_TOKENS[operator]
 
-    def _read_character(self) -> None:
-        if self._read_position >= len(self._source):
-            self._character = ''
+        operator = operator[:1]
+        if operator in _OPERATOR_BYTE_TOKENS:
+            self._position = position + 1
+
+            return _OPERATOR_BYTE_TOKENS[operator]
+
+        if byte < 0x80:
+            character = chr(byte)
         else:
-            self._character = self._source[self._read_position]
+            character = self._character_at(position)
 
-        self._position = self._read_position
-        self._read_position += 1
+        if character in _LETTERS:
+            literal = self._read_identifier()
+
+            token = self._identifier_tokens.get(literal)
+            if token is None:
+                token = self._identifier_token(literal)
+                self._identifier_tokens[token.literal] = token
+
+            return token
+        elif _is_number(character):
+            literal = self._read_number()
+
+            return Token(TokenType.INT, literal)
+        elif byte == _QUOTE_BYTE:
+            literal = self._read_string()
+
+            return Token(TokenType.STRING, literal)
+
+        self._position = position + _utf8_width(byte)
+
+        return Token(TokenType.ILLEGAL, character)
+
+    def _character_at(self, position: int) -> str:
+        width = _utf8_width(self._buffer[position])
+
+        return self._buffer[position:position + width].decode('utf-8',
+                                                               'replace')
 
     def _read_identifier(self) -> str:
+        buffer = self._buffer
+        length = self._length
         initial_position = self._position
+        position = initial_position
+
+        while position < length:
+            byte = buffer[position]
+            if byte in _IDENTIFIER_BYTES:
+                position += 1
+            elif byte > 0x7f:
+                character = self._character_at(position)
+                if character in _LETTERS or character.isdecimal():
+                    position += _utf8_width(byte)
+                else:
+                    break
+            else:
+                break
 
-        is_first_letter = True
-        while self._is_letter(self._character) or \
-                (not is_first_letter and self._is_number(self._character)):
-            self._read_character()
-            is_first_letter = False
+        self._position = position
 
-        return self._source[initial_position:self._position]
+        return buffer[initial_position:position].decode('utf-8')
 
     def _read_number(self) -> str:
+        buffer = self._buffer
+        length = self._length
         initial_position = self._position
+        position = initial_position
+
+        while position < length:
+            byte = buffer[position]
+            if byte in _DIGIT_BYTES:
+                position += 1
+            elif byte > 0x7f and self._character_at(position).isdecimal():
+                position += _utf8_width(byte)
+            else:
+                break
 
-        while self._is_number(self._character):
-            self._read_character()
+        self._position = position
 
-        return self._source[initial_position:self._position]
+        return buffer[initial_position:position].decode('utf-8')
 
     def _read_string(self) -> str:
-        self._read_character()
+        initial_position = self._position + 1
+        closing_quote = self._buffer.find(b'"', initial_position)
 
-        initial_position = self._position
+        if closing_quote == -1:
+            closing_quote = self._length
+
+        self._position = closing_quote + 1
+
+        return self._buffer[initial_position:closing_quote].decode('utf-8',
+                                                                   'replace')
+
+
+class TokenBuffer:
+    """Token stream stored column-wise in arrays.
+
+    Each token is its type, the offset where its text starts and the length
+    of that text (quotes included for strings). Literals and `Token` objects
+    are only built when a token is accessed.
+    """
+
+    def __init__(self, source: str) -> None:
+        self._source = source
+        self._types: array = array('H')
+        self._starts: array = array('I')
+        self._lengths: array = array('I')
+        self._newlines: array = array('I')
+
+        position = source.find('\n')
+        while position != -1:
+            self._newlines.append(position)
+            position = source.find('\n', position + 1)
+
+    def __getitem__(self, index: int) -> Token:
+        return Token(self.token_type(index), self.literal(index))
+
+    def __iter__(self) -> Iterator[Token]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def append(self, token_type: TokenType, start: int, length: int) -> None:
+        self._types.append(token_type.value)
+        self._starts.append(start)
+        self._lengths.append(length)
+
+    def literal(self, index: int) -> str:
+        start = self._starts[index]
+        text = self._source[start:start + self._lengths[index]]
+
+        if self._types[index] == TokenType.STRING.value:
+            if len(text) > 1 and text.endswith('"'):
+                return text[1:-1]
+
+            return text[1:]
+        elif self._types[index] in _WORD_TYPES:
+            return intern(text)
+
+        return text
+
+    def position(self, index: int) -> Tuple[int, int]:
+        """Return the line and column, both starting at 1, where the token
+        at `index` starts."""
+        offset = self._starts[index]
+        line = bisect_right(self._newlines, offset)
+        line_start = self._newlines[line - 1] + 1 if line > 0 else 0
+
+        return line + 1, offset - line_start + 1
+
+    def span(self, index: int) -> Tuple[int, int]:
+        """Return the offsets where the text of the token at `index` starts
+        and ends."""
+        start = self._starts[index]
+
+        return start, start + self._lengths[index]
+
+    def token_type(self, index: int) -> TokenType:
+        return _TOKEN_TYPES[self._types[index]]
+
+
+def tokenize(source: str) -> TokenBuffer:
+    """Lex the whole `source` into a `TokenBuffer` ending with EOF."""
+    lexer = Lexer(source)
+    tokens = TokenBuffer(source)
+    length = len(source)
+
+    token = lexer.next_token()
+    while token.token_type != TokenType.EOF:
+        start, end = lexer.token_span(token)
+        tokens.append(token.token_type, start, end - start)
+        token = lexer.next_token()
+
+    tokens.append(TokenType.EOF, length, 0)
 
-        while self._character != '"' \
-                and self._read_position <= len(self._source):
-            self._read_character()
+    return tokens
 
-        string = self._source[initial_position:self._position]
 
-        self._read_character()
+def _utf8_width(lead_byte: int) -> int:
+    if lead_byte < 0xc0:
+        return 1
+    elif lead_byte < 0xe0:
+        return 2
+    elif lead_byte < 0xf0:
+        return 3
 
-        return string
+    return 4
 
-    def _skip_whitespace(self) -> None:
-        while match(r'^\s$', self._character):
-            self._read_character()
 
+def _is_number(character: str) -> bool:
+    # Outside of ASCII fall back to the Unicode decimal class, which is what
+    # the original \d regular expression accepted.
+    return character in _DIGITS or \
+        (character > '\x7f' and character.isdecimal())
@@ -1,9 +1,16 @@
 from abc import abstractmethod, ABC
 from enum import auto, Enum
 from typing import (
+    ClassVar,
     Dict,
+    Generic,
     List,
     Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
 )
 from typing_extensions import Protocol
 
@@ -11,83 +18,164 @@ from lpp.ast import (
     Block,
     Identifier,
 )
+from lpp.persistent import (
+    Map,
+    Vector,
+)
 
 
 class ObjectType(Enum):
+    ARRAY = auto()
     BOOLEAN = auto()
     BUILTIN = auto()
     ERROR = auto()
     FUNCTION = auto()
+    HASH = auto()
     INTEGER = auto()
     NULL = auto()
     RETURN = auto()
     STRING = auto()
+    TAIL_CALL = auto()
 
 
 class Object(ABC):
 
-    @abstractmethod
+    __slots__ = ()
+
+    # The same for every object of a class, so it can be read without
+    # calling type().
+    object_type: ClassVar[ObjectType]
+
     def type(self) -> ObjectType:
-        pass
+        return self.object_type
 
     @abstractmethod
     def inspect(self) -> str:
         pass
 
 
-class Integer(Object):
+# What a hash is indexed by for a key: its class and its value, so 1 and
+# verdadero are different keys even though True == 1 in Python.
+HashKey = Tuple[type, Union[bool, int, str]]
+
+# The type of the value of a hashable object.
+V = TypeVar('V', bool, int, str)
+
+
+class Hashable(Object, Generic[V]):
+    """Object that can be a key of a hash.
+
+    The hash key of an object is built the first time it is asked for and
+    kept in the object, and Python caches the hash of the str and int in
+    it, so looking the same object up again doesn't hash its value again.
+    The slot that keeps it is left unset until then, so creating objects
+    that are never keys costs nothing more.
+    """
+
+    __slots__ = ('_hash_key',)
+
+    _hash_key: HashKey
+
+    @property
+    @abstractmethod
+    def value(self) -> V:
+        """The Python value of the object, read only so strings can join
+        their rope when it is read."""
+        pass
+
+    def hash_key(self) -> HashKey:
+        try:
+            return self._hash_key
+        except AttributeError:
+            self._hash_key = (type(self), self.value)
+
+            return self._hash_key
+
+
+class Integer(Hashable[int]):
+
+    __slots__ = ('value',)
+
+    object_type = ObjectType.INTEGER
+
+    value: int
 
     def __init__(self, value: int) -> None:
         self.value = value
 
-    def type(self) -> ObjectType:
-        return ObjectType.INTEGER
-
     def inspect(self) -> str:
         return str(self.value)
 
 
-class Boolean(Object):
+# Integers are never changed once created, so the small ones most
+# arithmetic produces are created once and shared, like CPython does with
+# its own ints.
+_SMALL_INTEGER_MIN = -5
+_SMALL_INTEGER_MAX = 256
+_SMALL_INTEGERS: Tuple[Integer, ...] = tuple(
+    Integer(value) for value in range(_SMALL_INTEGER_MIN, _SMALL_INTEGER_MAX + 1))
+
+
+def integer_object(value: int) -> Integer:
+    """Return an Integer for `value`, shared if `value` is small."""
+    if _SMALL_INTEGER_MIN <= value <= _SMALL_INTEGER_MAX:
+        return _SMALL_INTEGERS[value - _SMALL_INTEGER_MIN]
+
+    return Integer(value)
+
+
+class Boolean(Hashable[bool]):
+
+    __slots__ = ('value',)
+
+    object_type = ObjectType.BOOLEAN
+
+    value: bool
 
     def __init__(self, value: bool) -> None:
         self.value = value
 
-    def type(self) -> ObjectType:
-        return ObjectType.BOOLEAN
-
     def inspect(self) -> str:
         return 'verdadero' if self.value else 'falso'
 
 
 class Null(Object):
 
-    def type(self) -> ObjectType:
-        return ObjectType.NULL
+    __slots__ = ()
+
+    object_type = ObjectType.NULL
 
     def inspect(self) -> str:
         return 'nulo'
 
 
+TRUE = Boolean(True)
+FALSE = Boolean(False)
+NULL = Null()
+
+
 class Return(Object):
 
+    __slots__ = ('value',)
+
+    object_type = ObjectType.RETURN
+
     def __init__(self, value: Object):
         self.value = value
 
-    def type(self) -> ObjectType:
-        return ObjectType.RETURN
-
     def inspect(self) -> str:
         return self.value.inspect()
 
 
 class Error(Object):
 
+    __slots__ = ('message',)
+
+    object_type = ObjectType.ERROR
+
     def __init__(self, message: str) -> None:
         self.message = message
 
-    def type(self) -> ObjectType:
-        return ObjectType.ERROR
-
     def inspect(self) -> str:
         return f'Error: {self.message}'
 
@@ -113,37 +201,227 @@ class Environment(Dict):
     def __delitem__(self, key):
         del self._store[key]
 
+    def assign(self, key, value) -> bool:
+        """Change the value of `key` in the innermost environment that
+        defines it, and return whether one does."""
+        env = self
+        while env is not None:
+            if key in env._store:
+                env._store[key] = value
+                return True
+
+            env = env._outer
+
+        return False
+
+
+class Frame:
+    """Variables of a program or a call stored by slot, for code whose names
+    were resolved by lpp.resolver. Slots not assigned yet hold None.
+
+    Every frame of a run shares `globals`, the environment the program was
+    run in, for the names no scope defines.
+    """
+
+    __slots__ = ('values', 'names', 'outer', 'globals')
+
+    def __init__(self,
+                 values: List[Optional[Object]],
+                 names: Sequence[str],
+                 outer: Optional['Frame'],
+                 globals: Environment) -> None:
+        self.values = values
+        self.names = names
+        self.outer = outer
+        self.globals = globals
+
+    def find(self, name: str) -> Optional[Object]:
+        """Look `name` up by name, from this frame outwards and then in the
+        globals, like an Environment would."""
+        frame: Optional[Frame] = self
+        while frame is not None:
+            if name in frame.names:
+                value = frame.values[frame.names.index(name)]
+                if value is not None:
+                    return value
+
+            frame = frame.outer
+
+        try:
+            return self.globals[name]
+        except KeyError:
+            return None
+
+    def assign(self, name: str, value: Object) -> bool:
+        """Change the value of `name` where `find` would look it up, and
+        return whether it was found."""
+        frame: Optional[Frame] = self
+        while frame is not None:
+            if name in frame.names:
+                slot = frame.names.index(name)
+                if frame.values[slot] is not None:
+                    frame.values[slot] = value
+                    return True
+
+            frame = frame.outer
+
+        return self.globals.assign(name, value)
+
 
 class Function(Object):
 
+    __slots__ = ('parameters', 'body', 'env')
+
+    object_type = ObjectType.FUNCTION
+
     def __init__(self,
-                 parameters: List[Identifier],
+                 parameters: Sequence[Identifier],
                  body: Block,
-                 env: Environment) -> None:
+                 env: Union[Environment, Frame]) -> None:
         self.parameters = parameters
         self.body = body
         self.env = env
 
-    def type(self) -> ObjectType:
-        return ObjectType.FUNCTION
-
     def inspect(self) -> str:
         params: str = ', '.join([str(param) for param in self.parameters])
 
         return 'procedimiento({}) {{\n{}\n}}'.format(params, str(self.body))
 
 
-class String(Object):
+class TailCall(Object):
+    """Call left for the caller by a `regresa` that returns it, so the
+    caller runs it in place of the call that returned it."""
+
+    __slots__ = ('function', 'arguments')
+
+    object_type = ObjectType.TAIL_CALL
+
+    def __init__(self, function: Function, arguments: List[Object]) -> None:
+        self.function = function
+        self.arguments = arguments
+
+    def inspect(self) -> str:
+        return self.function.inspect()
+
+
+# Concatenations shorter than this are copied right away, a node of a rope
+# costs more than copying a few characters.
+_ROPE_MIN_LENGTH = 256
+
+
+class String(Hashable[str]):
+    """String of LPP, either its characters or a rope: the two strings it
+    is the concatenation of, joined the first time its value is read.
+
+    Appending to a string in a loop only creates a node every time, and
+    the pieces are copied once when the value is finally needed, instead
+    of copying the whole string on every append.
+    """
+
+    __slots__ = ('_value',)
+
+    object_type = ObjectType.STRING
 
     def __init__(self, value: str) -> None:
-        self.value = value
+        self._value: Union[str, Tuple[String, String]] = value
 
-    def type(self) -> ObjectType:
-        return ObjectType.STRING
+    @property
+    def value(self) -> str:
+        value = self._value
+        if type(value) is str:
+            return cast(str, value)
+
+        return self._flatten()
+
+    def concat(self, other: 'String') -> 'String':
+        """Return this string followed by `other`."""
+        left = self._value
+        right = other._value
+        if type(left) is str and type(right) is str \
+                and len(left) + len(right) < _ROPE_MIN_LENGTH:
+            return String(cast(str, left) + cast(str, right))
+
+        rope: String = String.__new__(String)
+        rope._value = (self, other)
+
+        return rope
 
     def inspect(self) -> str:
         return self.value
 
+    def is_rope(self) -> bool:
+        """Return whether the characters of this string haven't been
+        joined yet."""
+        return type(self._value) is not str
+
+    def _flatten(self) -> str:
+        # Ropes built in a loop are as deep as the number of appends, so
+        # they are walked with a stack instead of recursion. Strings below
+        # this one that were already joined are not walked again.
+        pieces: List[str] = []
+        stack: List[Union[str, Tuple[String, String]]] = [self._value]
+
+        while stack:
+            node = stack.pop()
+            if type(node) is str:
+                pieces.append(cast(str, node))
+            else:
+                left, right = cast(Tuple[String, String], node)
+                stack.append(right._value)
+                stack.append(left._value)
+
+        value = ''.join(pieces)
+        # The pieces are not needed anymore.
+        self._value = value
+
+        return value
+
+
+class Array(Object):
+    """Arreglo of LPP. Arrays never change, appending to one returns a new
+    array that shares most of its elements with it."""
+
+    __slots__ = ('elements',)
+
+    object_type = ObjectType.ARRAY
+
+    def __init__(self, elements: Vector[Object]) -> None:
+        self.elements = elements
+
+    def append(self, element: Object) -> 'Array':
+        """Return a new array with the elements of this one and
+        `element`."""
+        return Array(self.elements.append(element))
+
+    def inspect(self) -> str:
+        elements = ', '.join([element.inspect() for element in self.elements])
+
+        return f'[{elements}]'
+
+
+class Hash(Object):
+    """Hash of LPP, it maps the hash key of every key to the key and its
+    value. Hashes never change, setting a key returns a new hash that
+    shares most of its pairs with it."""
+
+    __slots__ = ('pairs',)
+
+    object_type = ObjectType.HASH
+
+    def __init__(self, pairs: Map[HashKey, Tuple[Hashable, Object]]) -> None:
+        self.pairs = pairs
+
+    def set(self, key: Hashable, value: Object) -> 'Hash':
+        """Return a new hash with the pairs of this one and `key` set to
+        `value`."""
+        return Hash(self.pairs.set(key.hash_key(), (key, value)))
+
+    def inspect(self) -> str:
+        pairs = ', '.join([f'{key.inspect()}: {value.inspect()}'
+                           for key, value in self.pairs.values()])
+
+        return f'{{{pairs}}}'
+
 
 class BuiltinFunction(Protocol):
 
@@ -152,12 +430,13 @@ class BuiltinFunction(Protocol):
 
 class Builtin(Object):
 
+    __slots__ = ('fn',)
+
+    object_type = ObjectType.BUILTIN
+
     def __init__(self, fn: BuiltinFunction) -> None:
         self.fn = fn
 
-    def type(self) -> ObjectType:
-        return ObjectType.BUILTIN
-
     def inspect(self) -> str:
         return 'builtin function'
 
@@ -0,0 +1,376 @@
+from enum import (
+    auto,
+    Enum,
+)
+from typing import (
+    List,
+    NamedTuple,
+    Optional,
+    Type,
+    cast,
+)
+
+import lpp.ast as ast
+from lpp.token import (
+    Token,
+    TokenType,
+)
+
+
+class ChangeKind(Enum):
+    FOLD = auto()
+    BRANCH = auto()
+
+
+class Change(NamedTuple):
+    """A rewrite of the optimizer. `after` is empty for removed
+    statements."""
+    kind: ChangeKind
+    before: str
+    after: str
+
+
+_LITERALS = (ast.Integer, ast.Boolean, ast.StringLiteral)
+
+
+def optimize(program: ast.Program) -> List[Change]:
+    """Rewrite `program` in place so it evaluates to the same result doing
+    less work, and return what changed.
+
+    Infix and prefix expressions over literals become the literal they
+    evaluate to, with the semantics of lpp.evaluator. Expressions that
+    evaluate to an error, or fail like a division by zero, are left for
+    the evaluator. `si` expressions whose condition is a literal lose the
+    branch that can't run, and loops whose condition is falso are dropped.
+
+    The spans of the program no longer match its nodes after a rewrite, so
+    they are dropped.
+    """
+    optimizer = _Optimizer()
+    program.statements = optimizer.statements(program.statements)
+
+    if optimizer.changes:
+        program.spans = None
+
+    return optimizer.changes
+
+
+class _Optimizer:
+
+    def __init__(self) -> None:
+        self.changes: List[Change] = []
+
+    def statements(self, statements: List[ast.Statement]) -> List[ast.Statement]:
+        result: List[ast.Statement] = []
+
+        for index, statement in enumerate(statements):
+            statement_type: Type = type(statement)
+
+            if statement_type == ast.ExpressionStatement \
+                    and type(cast(ast.ExpressionStatement,
+                                  statement).expression) == ast.If:
+                is_last = index == len(statements) - 1
+                result.extend(self._if_statement(
+                    cast(ast.ExpressionStatement, statement), is_last))
+            elif statement_type == ast.ExpressionStatement:
+                expression_statement = cast(ast.ExpressionStatement, statement)
+                assert expression_statement.expression is not None
+                expression_statement.expression = \
+                    self.expression(expression_statement.expression)
+                result.append(statement)
+            elif statement_type == ast.LetStatement:
+                let_statement = cast(ast.LetStatement, statement)
+                assert let_statement.value is not None
+                let_statement.value = self.expression(let_statement.value)
+                result.append(statement)
+            elif statement_type == ast.ReturnStatement:
+                return_statement = cast(ast.ReturnStatement, statement)
+                assert return_statement.return_value is not None
+                return_statement.return_value = \
+                    self.expression(return_statement.return_value)
+                result.append(statement)
+            elif statement_type == ast.AssignStatement:
+                assign_statement = cast(ast.AssignStatement, statement)
+                assert assign_statement.value is not None
+                assign_statement.value = self.expression(assign_statement.value)
+                result.append(statement)
+            elif statement_type == ast.WhileStatement:
+                while_statement = cast(ast.WhileStatement, statement)
+                assert while_statement.condition is not None \
+                    and while_statement.body is not None
+                while_statement.condition = \
+                    self.expression(while_statement.condition)
+                while_statement.body.statements = \
+                    self.statements(while_statement.body.statements)
+
+                # A loop has no value, but dropping the last statement would
+                # make the one before it the value of the block.
+                is_last = index == len(statements) - 1
+                if _is_false(while_statement.condition) and not is_last:
+                    self.changes.append(
+                        Change(ChangeKind.BRANCH, str(statement), ''))
+                else:
+                    result.append(statement)
+            else:
+                result.append(statement)
+
+        return result
+
+    def expression(self, node: ast.Expression) -> ast.Expression:
+        node_type: Type = type(node)
+
+        if node_type == ast.Infix or node_type == ast.Prefix:
+            return self._operation(node)
+        elif node_type == ast.If:
+            if_expression = cast(ast.If, node)
+            self._if_branches(if_expression)
+
+            return self._prune(if_expression)
+        elif node_type == ast.Function:
+            function = cast(ast.Function, node)
+            assert function.body is not None
+            function.body.statements = self.statements(function.body.statements)
+        elif node_type == ast.Call:
+            call = cast(ast.Call, node)
+            assert call.arguments is not None
+            call.function = self.expression(call.function)
+            call.arguments = [self.expression(argument)
+                              for argument in call.arguments]
+        elif node_type == ast.ArrayLiteral:
+            array = cast(ast.ArrayLiteral, node)
+            assert array.elements is not None
+            array.elements = [self.expression(element)
+                              for element in array.elements]
+        elif node_type == ast.HashLiteral:
+            hash_literal = cast(ast.HashLiteral, node)
+            assert hash_literal.pairs is not None
+            hash_literal.pairs = [(self.expression(key), self.expression(value))
+                                  for key, value in hash_literal.pairs]
+        elif node_type == ast.Index:
+            index = cast(ast.Index, node)
+            assert index.left is not None and index.index is not None
+            index.left = self.expression(index.left)
+            index.index = self.expression(index.index)
+
+        return node
+
+    def _operation(self, node: ast.Expression) -> ast.Expression:
+        folded = _fold(node)
+        if folded is not None:
+            self.changes.append(Change(ChangeKind.FOLD, str(node), str(folded)))
+            return folded
+
+        if type(node) == ast.Infix:
+            infix = cast(ast.Infix, node)
+            assert infix.left is not None and infix.right is not None
+            infix.left = self.expression(infix.left)
+            infix.right = self.expression(infix.right)
+        else:
+            prefix = cast(ast.Prefix, node)
+            assert prefix.right is not None
+            prefix.right = self.expression(prefix.right)
+
+        # Pruned branches may have left literal operands behind.
+        folded = _fold(node)
+        if folded is not None:
+            self.changes.append(Change(ChangeKind.FOLD, str(node), str(folded)))
+            return folded
+
+        return node
+
+    def _if_branches(self, if_expression: ast.If) -> None:
+        assert if_expression.condition is not None \
+            and if_expression.consequence is not None
+        if_expression.condition = self.expression(if_expression.condition)
+        if_expression.consequence.statements = \
+            self.statements(if_expression.consequence.statements)
+        if if_expression.alternative is not None:
+            if_expression.alternative.statements = \
+                self.statements(if_expression.alternative.statements)
+
+    def _if_statement(self,
+                      statement: ast.ExpressionStatement,
+                      is_last: bool) -> List[ast.Statement]:
+        """Return the statements that replace a `si` used as a statement.
+
+        Blocks don't have scopes of their own, so the statements of the
+        branch that runs can take the place of the `si`. Returns and errors
+        stop the statements they are spliced into like they stopped the
+        block. When no statements run the `si` is dropped, unless its value
+        is the value of the enclosing block.
+        """
+        if_expression = cast(ast.If, statement.expression)
+        self._if_branches(if_expression)
+
+        branch = _taken_branch(if_expression)
+        if branch is None:
+            statement.expression = self._prune(if_expression)
+            return [statement]
+
+        before = str(statement)
+        if branch.statements:
+            self.changes.append(Change(ChangeKind.BRANCH, before, str(branch)))
+            return branch.statements
+        elif not is_last:
+            self.changes.append(Change(ChangeKind.BRANCH, before, ''))
+            return []
+
+        return [statement]
+
+    def _prune(self, if_expression: ast.If) -> ast.Expression:
+        branch = _taken_branch(if_expression)
+        if branch is None or branch is _NO_BRANCH:
+            # A `si` without a branch to run evaluates to nulo, which has no
+            # literal.
+            return if_expression
+
+        before = str(if_expression)
+        statements = branch.statements
+        if len(statements) == 1 and type(statements[0]) == ast.ExpressionStatement:
+            expression = cast(ast.ExpressionStatement, statements[0]).expression
+            assert expression is not None
+            self.changes.append(Change(ChangeKind.BRANCH, before, str(expression)))
+            return expression
+        elif if_expression.alternative is None:
+            return if_expression
+
+        # The branch stays a block, behind a condition that always holds.
+        if_expression.condition = _boolean(True)
+        if_expression.consequence = branch
+        if_expression.alternative = None
+        self.changes.append(Change(ChangeKind.BRANCH, before, str(if_expression)))
+
+        return if_expression
+
+
+# Taken branch of a `si` whose condition is false and has no alternative.
+_NO_BRANCH = ast.Block(Token(TokenType.LBRACE, '{'), [])
+
+
+def _taken_branch(if_expression: ast.If) -> Optional[ast.Block]:
+    """Return the block that runs when the condition of `if_expression` is
+    a literal, `_NO_BRANCH` if none does, and None if it isn't known."""
+    condition = if_expression.condition
+    if type(condition) not in _LITERALS:
+        return None
+
+    if _is_false(condition):
+        return if_expression.alternative or _NO_BRANCH
+
+    return if_expression.consequence
+
+
+def _is_false(condition: Optional[ast.Expression]) -> bool:
+    # Only falso and nulo are falsy, and nulo has no literal.
+    return type(condition) == ast.Boolean \
+        and not cast(ast.Boolean, condition).value
+
+
+def _fold(node: ast.Expression) -> Optional[ast.Expression]:
+    """Return the literal `node` evaluates to, if it only depends on
+    literals and evaluates to a value."""
+    node_type: Type = type(node)
+
+    if node_type in _LITERALS:
+        return node
+    elif node_type == ast.Prefix:
+        prefix = cast(ast.Prefix, node)
+        assert prefix.right is not None
+        right = _fold(prefix.right)
+
+        return _fold_prefix(prefix.operator, right) if right is not None \
+            else None
+    elif node_type == ast.Infix:
+        infix = cast(ast.Infix, node)
+        assert infix.left is not None and infix.right is not None
+        left = _fold(infix.left)
+        if left is None:
+            return None
+        right = _fold(infix.right)
+        if right is None:
+            return None
+
+        return _fold_infix(infix.operator, left, right)
+
+    return None
+
+
+def _fold_infix(operator: str,
+                left: ast.Expression,
+                right: ast.Expression) -> Optional[ast.Expression]:
+    left_type: Type = type(left)
+    right_type: Type = type(right)
+
+    if left_type == ast.Integer and right_type == ast.Integer:
+        left_value = cast(int, cast(ast.Integer, left).value)
+        right_value = cast(int, cast(ast.Integer, right).value)
+
+        if operator == '+':
+            return _integer(left_value + right_value)
+        elif operator == '-':
+            return _integer(left_value - right_value)
+        elif operator == '*':
+            return _integer(left_value * right_value)
+        elif operator == '/':
+            return _integer(left_value // right_value) if right_value != 0 \
+                else None
+        elif operator == '<':
+            return _boolean(left_value < right_value)
+        elif operator == '>':
+            return _boolean(left_value > right_value)
+        elif operator == '==':
+            return _boolean(left_value == right_value)
+        elif operator == '!=':
+            return _boolean(left_value != right_value)
+
+        return None
+    elif left_type == ast.StringLiteral and right_type == ast.StringLiteral:
+        left_string = cast(ast.StringLiteral, left).value
+        right_string = cast(ast.StringLiteral, right).value
+
+        if operator == '+':
+            return _string(left_string + right_string)
+        elif operator == '==':
+            return _boolean(left_string == right_string)
+        elif operator == '!=':
+            return _boolean(left_string != right_string)
+
+        return None
+    elif operator == '==' or operator == '!=':
+        # The evaluator compares anything else by identity: booleans are
+        # singletons, and objects of different types are never the same.
+        same = left_type == ast.Boolean and right_type == ast.Boolean \
+            and cast(ast.Boolean, left).value == cast(ast.Boolean, right).value
+
+        return _boolean(same if operator == '==' else not same)
+
+    return None
+
+
+def _fold_prefix(operator: str,
+                 right: ast.Expression) -> Optional[ast.Expression]:
+    right_type: Type = type(right)
+
+    if operator == '!':
+        # Only falso is falsy among literals.
+        return _boolean(right_type == ast.Boolean
+                        and not cast(ast.Boolean, right).value)
+    elif operator == '-' and right_type == ast.Integer:
+        return _integer(-cast(int, cast(ast.Integer, right).value))
+
+    return None
+
+
+def _boolean(value: bool) -> ast.Boolean:
+    if value:
+        return ast.Boolean(Token(TokenType.TRUE, 'verdadero'), True)
+
+    return ast.Boolean(Token(TokenType.FALSE, 'falso'), False)
+
+
+def _integer(value: int) -> ast.Integer:
+    return ast.Integer(Token(TokenType.INT, str(value)), value)
+
+
+def _string(value: str) -> ast.StringLiteral:
+    return ast.StringLiteral(Token(TokenType.STRING, value), value)
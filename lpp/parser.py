@@ -1,20 +1,27 @@
+from array import array
 from enum import IntEnum
 from typing import (
     Callable,
     Dict,
+    Iterator,
     List,
     Optional,
+    Union,
 )
 
 from lpp.ast import (
+    ArrayLiteral,
+    AssignStatement,
     Block,
     Boolean,
     Call,
     Expression,
     ExpressionStatement,
     Function,
+    HashLiteral,
     Identifier,
     If,
+    Index,
     Infix,
     Integer,
     LetStatement,
@@ -23,8 +30,13 @@ from lpp.ast import (
     ReturnStatement,
     Statement,
     StringLiteral,
+    WhileStatement,
+    walk,
+)
+from lpp.lexer import (
+    Lexer,
+    TokenBuffer,
 )
-from lpp.lexer import Lexer
 from lpp.token import (
     Token,
     TokenType,
@@ -45,6 +57,7 @@ class Precedence(IntEnum):
     PRODUCT = 5
     PREFIX = 6
     CALL = 7
+    INDEX = 8
 
 
 PRECEDENCES: Dict[TokenType, Precedence] = {
@@ -57,17 +70,35 @@ PRECEDENCES: Dict[TokenType, Precedence] = {
     TokenType.DIVISION: Precedence.PRODUCT,
     TokenType.MULTIPLICATION: Precedence.PRODUCT,
     TokenType.LPAREN: Precedence.CALL,
+    TokenType.LBRACKET: Precedence.INDEX,
 }
 
 
 class Parser:
 
-    def __init__(self, lexer: Lexer) -> None:
+    def __init__(self,
+                 lexer: Union[Lexer, TokenBuffer],
+                 keep_tokens: bool = True) -> None:
+        """With `keep_tokens` set to False the nodes of the parsed program
+        don't keep their tokens, their spans are stored in `Program.spans`
+        instead. Only a TokenBuffer knows those spans."""
         self._lexer = lexer
         self._current_token: Optional[Token] = None
         self._peek_token: Optional[Token] = None
         self._errors: List[str] = []
 
+        # Only known when reading from a TokenBuffer, which keeps positions.
+        self._tokens: Optional[TokenBuffer] = \
+            lexer if isinstance(lexer, TokenBuffer) else None
+        self._current_index: int = -2
+
+        if not keep_tokens and self._tokens is None:
+            raise ValueError('Solo se pueden descartar los tokens al leer de un TokenBuffer')
+
+        self._keep_tokens = keep_tokens
+        # Index in the TokenBuffer of every token read, by the token's id.
+        self._token_indexes: Dict[int, int] = {}
+
         self._prefix_parse_fns: PrefixParseFns = self._register_prefix_fns()
         self._infix_parse_fns: InfixParseFns = self._register_infix_fns()
 
@@ -79,21 +110,44 @@ class Parser:
         return self._errors
 
     def parse_program(self) -> Program:
-        program = Program(statements=[])
+        program = Program(statements=list(self.parse_statements()))
+
+        if not self._keep_tokens:
+            self._drop_tokens(program)
+
+        return program
 
+    def parse_statements(self) -> Iterator[Statement]:
+        """Parse the program one top-level statement at a time."""
         assert self._current_token is not None
         while self._current_token.token_type != TokenType.EOF:
             statement = self._parse_statement()
             if statement is not None:
-                program.statements.append(statement)
+                yield statement
 
             self._advance_tokens()
 
-        return program
-
     def _advance_tokens(self) -> None:
         self._current_token = self._peek_token
-        self._peek_token = self._lexer.next_token()
+        self._current_index += 1
+
+        if self._tokens is None:
+            assert isinstance(self._lexer, Lexer)
+            self._peek_token = self._lexer.next_token()
+        elif self._current_index + 1 < len(self._tokens):
+            peek_index = self._current_index + 1
+            self._peek_token = self._tokens[peek_index]
+
+            if not self._keep_tokens:
+                self._token_indexes[id(self._peek_token)] = peek_index
+
+    def _add_error(self, message: str, token_index: int) -> None:
+        if self._tokens is not None:
+            token_index = min(token_index, len(self._tokens) - 1)
+            line, column = self._tokens.position(token_index)
+            message += f' (línea {line}, columna {column})'
+
+        self._errors.append(message)
 
     def _current_precedence(self) -> Precedence:
         assert self._current_token is not None
@@ -102,6 +156,19 @@ class Parser:
         except KeyError:
             return Precedence.LOWEST
 
+    def _drop_tokens(self, program: Program) -> None:
+        assert self._tokens is not None
+        program.spans = array('I')
+
+        for node in walk(program):
+            if isinstance(node, (Statement, Expression)):
+                assert node.token is not None
+                index = self._token_indexes[id(node.token)]
+                program.spans.extend(self._tokens.span(index))
+                node.token = None
+
+        self._token_indexes.clear()
+
     def _expected_token(self, token_type: TokenType) -> bool:
         assert self._peek_token is not None
         if self._peek_token.token_type == token_type:
@@ -116,7 +183,32 @@ class Parser:
         assert self._peek_token is not None
         error = f'Se esperaba que el siguiente token fuera {token_type} ' + \
                 f'pero se obtuvo {self._peek_token.token_type}'
-        self._errors.append(error)
+        self._add_error(error, self._current_index + 1)
+
+    def _parse_array(self) -> ArrayLiteral:
+        assert self._current_token is not None
+        array = ArrayLiteral(self._current_token)
+        array.elements = self._parse_expression_list(TokenType.RBRACKET)
+
+        return array
+
+    def _parse_assign_statement(self) -> Optional[AssignStatement]:
+        assert self._current_token is not None
+        assign_statement = AssignStatement(token=self._current_token,
+                                           name=self._parse_identifier())
+
+        if not self._expected_token(TokenType.ASSIGN):
+            return None
+
+        self._advance_tokens()
+
+        assign_statement.value = self._parse_expression(Precedence.LOWEST)
+
+        assert self._peek_token is not None
+        if self._peek_token.token_type == TokenType.SEMICOLON:
+            self._advance_tokens()
+
+        return assign_statement
 
     def _parse_block(self) -> Block:
         assert self._current_token is not None
@@ -145,42 +237,17 @@ class Parser:
     def _parse_call(self, function: Expression) -> Call:
         assert self._current_token is not None
         call = Call(self._current_token, function)
-        call.arguments = self._parse_call_arguments()
+        call.arguments = self._parse_expression_list(TokenType.RPAREN)
 
         return call
 
-    def _parse_call_arguments(self) -> Optional[List[Expression]]:
-        arguments: List[Expression] = []
-
-        assert self._peek_token is not None
-        if self._peek_token.token_type == TokenType.RPAREN:
-            self._advance_tokens()
-
-            return arguments
-
-        self._advance_tokens()
-        if expression := self._parse_expression(Precedence.LOWEST):
-            arguments.append(expression)
-
-        while self._peek_token.token_type == TokenType.COMMA:
-            self._advance_tokens()
-            self._advance_tokens()
-
-            if expression := self._parse_expression(Precedence.LOWEST):
-                arguments.append(expression)
-
-        if not self._expected_token(TokenType.RPAREN):
-            return None
-
-        return arguments
-
     def _parse_expression(self, precedence: Precedence) -> Optional[Expression]:
         assert self._current_token is not None
         try:
             prefix_parse_fn = self._prefix_parse_fns[self._current_token.token_type]
         except KeyError:
             message = f'No se encontro ninguna función para parsear {self._current_token.literal}'
-            self._errors.append(message)
+            self._add_error(message, self._current_index)
 
             return None
 
@@ -201,6 +268,34 @@ class Parser:
 
         return left_expression
 
+    def _parse_expression_list(self,
+                               end: TokenType) -> Optional[List[Expression]]:
+        """Parse expressions separated by commas up to `end`, the arguments
+        of a call or the elements of an array."""
+        expressions: List[Expression] = []
+
+        assert self._peek_token is not None
+        if self._peek_token.token_type == end:
+            self._advance_tokens()
+
+            return expressions
+
+        self._advance_tokens()
+        if expression := self._parse_expression(Precedence.LOWEST):
+            expressions.append(expression)
+
+        while self._peek_token.token_type == TokenType.COMMA:
+            self._advance_tokens()
+            self._advance_tokens()
+
+            if expression := self._parse_expression(Precedence.LOWEST):
+                expressions.append(expression)
+
+        if not self._expected_token(end):
+            return None
+
+        return expressions
+
     def _parse_expression_statement(self) -> Optional[ExpressionStatement]:
         assert self._current_token is not None
         expression_statement = ExpressionStatement(token=self._current_token)
@@ -258,12 +353,52 @@ class Parser:
 
         return params
 
+    def _parse_hash(self) -> Optional[HashLiteral]:
+        assert self._current_token is not None
+        hash_literal = HashLiteral(self._current_token, [])
+
+        assert self._peek_token is not None
+        while self._peek_token.token_type != TokenType.RBRACE:
+            self._advance_tokens()
+
+            key = self._parse_expression(Precedence.LOWEST)
+            if not self._expected_token(TokenType.COLON):
+                return None
+
+            self._advance_tokens()
+
+            value = self._parse_expression(Precedence.LOWEST)
+            if key is not None and value is not None:
+                assert hash_literal.pairs is not None
+                hash_literal.pairs.append((key, value))
+
+            if self._peek_token.token_type != TokenType.RBRACE \
+                    and not self._expected_token(TokenType.COMMA):
+                return None
+
+        if not self._expected_token(TokenType.RBRACE):
+            return None
+
+        return hash_literal
+
     def _parse_identifier(self) -> Identifier:
         assert self._current_token is not None
 
         return Identifier(token=self._current_token,
                           value=self._current_token.literal)
 
+    def _parse_index(self, left: Expression) -> Optional[Index]:
+        assert self._current_token is not None
+        index = Index(self._current_token, left)
+
+        self._advance_tokens()
+        index.index = self._parse_expression(Precedence.LOWEST)
+
+        if not self._expected_token(TokenType.RBRACKET):
+            return None
+
+        return index
+
     def _parse_infix_expression(self, left: Expression) -> Infix:
         assert self._current_token is not None
         infix = Infix(token=self._current_token,
@@ -287,7 +422,7 @@ class Parser:
         except ValueError:
             message = f'No se ha podido parsear {self._current_token.literal} ' + \
                        'como entero.'
-            self._errors.append(message)
+            self._add_error(message, self._current_index)
 
             return None
 
@@ -386,6 +521,12 @@ class Parser:
             return self._parse_let_statement()
         elif self._current_token.token_type == TokenType.RETURN:
             return self._parse_return_statement()
+        elif self._current_token.token_type == TokenType.WHILE:
+            return self._parse_while_statement()
+        elif self._current_token.token_type == TokenType.IDENT \
+                and self._peek_token is not None \
+                and self._peek_token.token_type == TokenType.ASSIGN:
+            return self._parse_assign_statement()
         else:
             return self._parse_expression_statement()
 
@@ -401,6 +542,31 @@ class Parser:
         except KeyError:
             return Precedence.LOWEST
 
+    def _parse_while_statement(self) -> Optional[WhileStatement]:
+        assert self._current_token is not None
+        while_statement = WhileStatement(self._current_token)
+
+        if not self._expected_token(TokenType.LPAREN):
+            return None
+
+        self._advance_tokens()
+
+        while_statement.condition = self._parse_expression(Precedence.LOWEST)
+
+        if not self._expected_token(TokenType.RPAREN):
+            return None
+
+        if not self._expected_token(TokenType.LBRACE):
+            return None
+
+        while_statement.body = self._parse_block()
+
+        assert self._peek_token is not None
+        if self._peek_token.token_type == TokenType.SEMICOLON:
+            self._advance_tokens()
+
+        return while_statement
+
     def _register_infix_fns(self) -> InfixParseFns:
         return {
             TokenType.PLUS: self._parse_infix_expression,
@@ -412,6 +578,7 @@ class Parser:
             TokenType.LT: self._parse_infix_expression,
             TokenType.GT: self._parse_infix_expression,
             TokenType.LPAREN: self._parse_call,
+            TokenType.LBRACKET: self._parse_index,
         }
 
     def _register_prefix_fns(self) -> PrefixParseFns:
@@ -421,6 +588,8 @@ class Parser:
             TokenType.FUNCTION: self._parse_function,
             TokenType.IF: self._parse_if,
             TokenType.INT: self._parse_integer,
+            TokenType.LBRACE: self._parse_hash,
+            TokenType.LBRACKET: self._parse_array,
             TokenType.LPAREN:self._parse_grouped_expression,
             TokenType.MINUS: self._parse_prefix_expression,
             TokenType.NEGATION: self._parse_prefix_expression,
@@ -0,0 +1,387 @@
+"""Collections that are never changed, updating one returns a new one that
+shares most of its structure with the old one.
+
+`Vector` is a trie with 32 children per node, like the vectors of Clojure.
+Appending, reading and replacing an element touch one node per level, and
+a million elements only take four levels.
+
+`Map` is a hash array mapped trie: every node has up to 32 children, chosen
+by five bits of the hash of the key, and keeps a bitmap of which of them it
+has instead of 32 slots.
+"""
+import sys
+from typing import (
+    Any,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+
+
+K = TypeVar('K')
+T = TypeVar('T')
+V = TypeVar('V')
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+
+
+if sys.version_info >= (3, 10):
+    _bit_count = int.bit_count
+else:
+    def _bit_count(value: int) -> int:
+        return bin(value).count('1')
+
+
+class Vector(Generic[T]):
+    """Sequence of elements that is never changed.
+
+    The last elements, up to 32 of them, are kept in a tail out of the
+    trie, so most appends only copy the tail. Nodes are lists that no
+    vector changes once they are part of one.
+    """
+
+    __slots__ = ('_count', '_shift', '_root', '_tail')
+
+    def __init__(self, elements: Iterable[T] = ()) -> None:
+        elements = list(elements)
+        count = len(elements)
+        tail_offset = _tail_offset(count)
+
+        # The trie is built a level at a time, from the leaves up.
+        nodes: List[Any] = [elements[start:start + _WIDTH]
+                            for start in range(0, tail_offset, _WIDTH)]
+        shift = _BITS
+        while len(nodes) > _WIDTH:
+            nodes = [nodes[start:start + _WIDTH]
+                     for start in range(0, len(nodes), _WIDTH)]
+            shift += _BITS
+
+        self._count = count
+        self._shift = shift
+        self._root: List[Any] = nodes
+        self._tail: List[T] = elements[tail_offset:]
+
+    def __getitem__(self, index: int) -> T:
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+
+        tail_offset = self._count - len(self._tail)
+        if index >= tail_offset:
+            return self._tail[index - tail_offset]
+
+        node = self._root
+        level = self._shift
+        while level > 0:
+            node = node[(index >> level) & _MASK]
+            level -= _BITS
+
+        return node[index & _MASK]
+
+    def __iter__(self) -> Iterator[T]:
+        for leaf in _leaves(self._root, self._shift):
+            yield from leaf
+
+        yield from self._tail
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, element: T) -> 'Vector[T]':
+        """Return a vector with the elements of this one and `element`."""
+        count = self._count
+        tail = self._tail
+
+        if len(tail) < _WIDTH:
+            return self._new(count + 1, self._shift, self._root,
+                             tail + [element])
+
+        # The tail is full, it becomes a leaf of the trie.
+        shift = self._shift
+        if (count >> _BITS) > (1 << shift):
+            root = [self._root, _new_path(shift, tail)]
+            shift += _BITS
+        else:
+            root = _push_tail(count, shift, self._root, tail)
+
+        return self._new(count + 1, shift, root, [element])
+
+    def set(self, index: int, element: T) -> 'Vector[T]':
+        """Return a vector with the elements of this one, but `element` at
+        `index`."""
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+
+        tail_offset = self._count - len(self._tail)
+        if index >= tail_offset:
+            tail = self._tail[:]
+            tail[index - tail_offset] = element
+
+            return self._new(self._count, self._shift, self._root, tail)
+
+        return self._new(self._count, self._shift,
+                         _assoc(self._shift, self._root, index, element),
+                         self._tail)
+
+    @classmethod
+    def _new(cls,
+             count: int,
+             shift: int,
+             root: List[Any],
+             tail: List[T]) -> 'Vector[T]':
+        vector: Vector[T] = cls.__new__(cls)
+        vector._count = count
+        vector._shift = shift
+        vector._root = root
+        vector._tail = tail
+
+        return vector
+
+
+def _tail_offset(count: int) -> int:
+    # The tail is never empty unless the vector is.
+    if count < _WIDTH:
+        return 0
+
+    return ((count - 1) >> _BITS) << _BITS
+
+
+def _leaves(node: List[Any], level: int) -> Iterator[List[Any]]:
+    if level == 0:
+        yield node
+        return
+
+    for child in node:
+        yield from _leaves(child, level - _BITS)
+
+
+def _new_path(level: int, node: List[Any]) -> List[Any]:
+    while level > 0:
+        node = [node]
+        level -= _BITS
+
+    return node
+
+
+def _push_tail(count: int,
+               level: int,
+               parent: List[Any],
+               tail: List[Any]) -> List[Any]:
+    # `count` elements are in the trie and the tail, the last leaf of the
+    # trie after this one is the tail.
+    position = ((count - 1) >> level) & _MASK
+    node = parent[:]
+
+    if level == _BITS:
+        child = tail
+    elif position < len(parent):
+        child = _push_tail(count, level - _BITS, parent[position], tail)
+    else:
+        child = _new_path(level - _BITS, tail)
+
+    if position < len(node):
+        node[position] = child
+    else:
+        node.append(child)
+
+    return node
+
+
+def _assoc(level: int,
+           node: List[Any],
+           index: int,
+           element: Any) -> List[Any]:
+    node = node[:]
+
+    if level == 0:
+        node[index & _MASK] = element
+    else:
+        position = (index >> level) & _MASK
+        node[position] = _assoc(level - _BITS, node[position], index, element)
+
+    return node
+
+
+# A key in the trie of a map, with its hash and the position of its pair
+# in the vector of the map.
+_Leaf = Tuple[int, Any, int]
+
+
+class _Node:
+    """Node of a map with a child for every bit set in `bitmap`, in the
+    order of the bits. A child is a leaf or another node."""
+
+    __slots__ = ('bitmap', 'children')
+
+    def __init__(self,
+                 bitmap: int,
+                 children: List[Union[_Leaf, '_Node', '_Collision']]) -> None:
+        self.bitmap = bitmap
+        self.children = children
+
+
+class _Collision:
+    """Leaves of the keys with the same hash."""
+
+    __slots__ = ('hash', 'leaves')
+
+    def __init__(self, hash: int, leaves: List[_Leaf]) -> None:
+        self.hash = hash
+        self.leaves = leaves
+
+
+_EMPTY_NODE = _Node(0, [])
+
+
+class Map(Generic[K, V]):
+    """Mapping that is never changed, with its keys in the order they were
+    first set in, like a dict.
+
+    Like the dicts of CPython, the pairs are kept in the order they were
+    added, in a `Vector`, and the trie only maps every key to the position
+    of its pair. Setting a key that is already in the map only replaces
+    its pair in the vector.
+    """
+
+    __slots__ = ('_root', '_pairs')
+
+    def __init__(self, pairs: Iterable[Tuple[K, V]] = ()) -> None:
+        self._root: _Node = _EMPTY_NODE
+        self._pairs: Vector[Tuple[K, V]] = Vector()
+
+        for key, value in pairs:
+            self._root, self._pairs = self._set(key, value)
+
+    def __contains__(self, key: Any) -> bool:
+        return self._position(key) is not None
+
+    def __iter__(self) -> Iterator[K]:
+        for key, _ in self._pairs:
+            yield key
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        position = self._position(key)
+        if position is None:
+            return default
+
+        return self._pairs[position][1]
+
+    def items(self) -> Iterator[Tuple[K, V]]:
+        return iter(self._pairs)
+
+    def keys(self) -> Iterator[K]:
+        return iter(self)
+
+    def set(self, key: K, value: V) -> 'Map[K, V]':
+        """Return a map with the pairs of this one and `key` set to
+        `value`."""
+        new_map: Map[K, V] = Map.__new__(Map)
+        new_map._root, new_map._pairs = self._set(key, value)
+
+        return new_map
+
+    def values(self) -> Iterator[V]:
+        for _, value in self._pairs:
+            yield value
+
+    def _position(self, key: Any) -> Optional[int]:
+        key_hash = hash(key)
+        node = self._root
+        shift = 0
+
+        # The root is always a node, only nodes below it collide.
+        while True:
+            bitmap = node.bitmap
+            bit = 1 << ((key_hash >> shift) & _MASK)
+            if not bitmap & bit:
+                return None
+
+            child = node.children[_bit_count(bitmap & (bit - 1))]
+            if type(child) is _Node:
+                node = child
+                shift += _BITS
+            elif type(child) is tuple:
+                leaf_key = child[1]
+                if leaf_key is key or leaf_key == key:
+                    return child[2]
+
+                return None
+            else:
+                for _, leaf_key, position in cast(_Collision, child).leaves:
+                    if leaf_key is key or leaf_key == key:
+                        return position
+
+                return None
+
+    def _set(self,
+             key: K,
+             value: V) -> Tuple[_Node, Vector[Tuple[K, V]]]:
+        position = self._position(key)
+        if position is not None:
+            return self._root, self._pairs.set(position, (key, value))
+
+        leaf = (hash(key), key, len(self._pairs))
+        return cast(_Node, _insert(self._root, 0, leaf)), \
+            self._pairs.append((key, value))
+
+
+def _insert(node: Union[_Node, _Collision],
+            shift: int,
+            leaf: _Leaf) -> Union[_Node, _Collision]:
+    """Return `node` with `leaf`, whose key is not in it, added."""
+    key_hash = leaf[0]
+
+    if type(node) is _Collision:
+        collision = cast(_Collision, node)
+        if collision.hash == key_hash:
+            return _Collision(key_hash, collision.leaves + [leaf])
+
+        # The collision moves one level down, below a node that can hold
+        # both it and the leaf.
+        node = _Node(1 << ((collision.hash >> shift) & _MASK), [collision])
+
+    bitmap_node = cast(_Node, node)
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    index = _bit_count(bitmap_node.bitmap & (bit - 1))
+    children = bitmap_node.children[:]
+
+    if not bitmap_node.bitmap & bit:
+        children.insert(index, leaf)
+
+        return _Node(bitmap_node.bitmap | bit, children)
+
+    child = children[index]
+    if type(child) is tuple:
+        children[index] = _pair(shift + _BITS, child, leaf)
+    else:
+        children[index] = _insert(cast(Union[_Node, _Collision], child),
+                                  shift + _BITS,
+                                  leaf)
+
+    return _Node(bitmap_node.bitmap, children)
+
+
+def _pair(shift: int, first: _Leaf, second: _Leaf) -> Union[_Node, _Collision]:
+    """Return the node that holds two leaves whose hashes are the same up
+    to `shift`."""
+    if first[0] == second[0]:
+        return _Collision(first[0], [first, second])
+
+    first_bits = (first[0] >> shift) & _MASK
+    second_bits = (second[0] >> shift) & _MASK
+    if first_bits == second_bits:
+        return _Node(1 << first_bits, [_pair(shift + _BITS, first, second)])
+
+    children: List[Union[_Leaf, _Node, _Collision]] = \
+        [first, second] if first_bits < second_bits else [second, first]
+    return _Node((1 << first_bits) | (1 << second_bits), children)
@@ -0,0 +1,901 @@
+import ast as py_ast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    cast,
+)
+
+import lpp.ast as ast
+from lpp.builtins import BUILTINS
+from lpp.evaluator import (
+    FALSE,
+    NULL,
+    TRUE,
+    _NOT_A_FUNCTION,
+    _UNKNOWN_IDENTIFIER,
+    _evaluate_hash_items,
+    _evaluate_index_expression,
+    _evaluate_infix_expression,
+    _evaluate_prefix_expression,
+    _new_error,
+)
+from lpp.object import (
+    Array,
+    Builtin,
+    Environment,
+    Error,
+    Function,
+    Integer,
+    Object,
+    String,
+    TailCall,
+    integer_object,
+)
+from lpp.persistent import Vector
+from lpp.resolver import mark_positions
+
+
+class NativeFunction(Function):
+    """Function created by generated code, it keeps the Python function
+    compiled from it next to its source."""
+
+    __slots__ = ('fn',)
+
+    def __init__(self, fn: Callable[..., Any], node: ast.Function) -> None:
+        assert node.body is not None
+        super().__init__(node.parameters, node.body, Environment())
+        self.fn = fn
+
+
+Program = Callable[[Environment], Optional[Object]]
+
+_FILENAME: str = '<lpp>'
+
+_ARITHMETIC: Dict[str, str] = {
+    '+': '+',
+    '-': '-',
+    '*': '*',
+    '/': '//',
+}
+
+_COMPARISONS: Dict[str, str] = {
+    '<': '<',
+    '>': '>',
+    '==': '==',
+    '!=': '!=',
+}
+
+
+def to_source(program: ast.Program) -> str:
+    """Return the Python source `program` is translated to.
+
+    Integers and strings become Python ints and strs, every other value is
+    the same object the evaluator uses. Operations on ints run inline and
+    anything else goes through the runtime helpers, which wrap the values
+    back and call the evaluator, so errors and truthiness are the same.
+    Every procedimiento becomes a `def`, `si` a conditional expression or
+    an `if` statement, `regresa` a `return` and `mientras` a `while`
+    loop. A procedimiento that returns a call to itself runs its body in a
+    loop instead, and one that returns a call to another procedimiento
+    returns a TailCall its caller runs, so neither nests Python calls.
+
+    Variables are Python locals. One that may be used before it is defined
+    starts as `_r_UNBOUND`, and until it is defined the variable with its
+    name in the enclosing procedimientos or environment is used instead,
+    like in the evaluator. Parameters without an argument are unset the
+    same way. Procedimientos declare the variables of enclosing ones they
+    assign to as nonlocal.
+    """
+    return _Generator().program(program)
+
+
+def to_module(program: ast.Program) -> py_ast.Module:
+    return py_ast.parse(to_source(program), filename=_FILENAME)
+
+
+def compile_program(program: ast.Program) -> Program:
+    """Compile `program` with CPython's compiler and return a function that
+    runs it in an environment."""
+    generator = _Generator()
+    module = py_ast.parse(generator.program(program), filename=_FILENAME)
+    namespace: Dict[str, Any] = {
+        **_RUNTIME,
+        '_r_nodes': generator.nodes,
+    }
+    exec(compile(module, _FILENAME, 'exec'), namespace)
+    run_program = namespace['_r_program']
+
+    return lambda env: _object(run_program(env))
+
+
+def run(program: ast.Program, env: Environment) -> Optional[Object]:
+    """Compile `program` to Python and run it in `env`."""
+    return compile_program(program)(env)
+
+
+def _object(value: Any) -> Any:
+    value_type = type(value)
+    if value_type is int:
+        return integer_object(value)
+    elif value_type is str:
+        return String(value)
+
+    return value
+
+
+def _native(value: Any) -> Any:
+    value_type = type(value)
+    if value_type is Integer:
+        return value.value
+    elif value_type is String:
+        # Ropes stay strings of LPP until their value is needed, so they can
+        # keep growing without being joined.
+        return value if value.is_rope() else value.value
+
+    return value
+
+
+def _array(*elements: Any) -> Array:
+    return Array(Vector([_object(element) for element in elements]))
+
+
+def _assign(env: Environment, name: str, value: Any) -> Optional[Error]:
+    if env.assign(name, _object(value)):
+        return None
+
+    return _new_error(_UNKNOWN_IDENTIFIER, [name])
+
+
+def _call(function: Any) -> Callable[..., Any]:
+    """Return what calling `function` does, when it isn't a
+    NativeFunction."""
+    if type(function) is Builtin:
+        return lambda *arguments: _native(
+            function.fn(*[_object(argument) for argument in arguments]))
+
+    error = _new_error(_NOT_A_FUNCTION, [_object(function).type().name])
+    return lambda *arguments: error
+
+
+def _hash(*items: Any) -> Any:
+    return _evaluate_hash_items([_object(item) for item in items])
+
+
+def _index(left: Any, index: Any) -> Any:
+    return _native(_evaluate_index_expression(_object(left), _object(index)))
+
+
+def _infix(operator: str, left: Any, right: Any) -> Any:
+    return _native(
+        _evaluate_infix_expression(operator, _object(left), _object(right)))
+
+
+def _lookup(env: Environment, name: str) -> Any:
+    try:
+        return _native(env[name])
+    except KeyError:
+        return BUILTINS.get(name) or _new_error(_UNKNOWN_IDENTIFIER, [name])
+
+
+def _prefix(operator: str, right: Any) -> Any:
+    return _native(_evaluate_prefix_expression(operator, _object(right)))
+
+
+def _run_tail_calls(result: Any) -> Any:
+    """Run the call a procedimiento returned, and the ones those return,
+    in a row instead of one inside the other."""
+    while type(result) is TailCall:
+        result = cast(NativeFunction, result.function).fn(*result.arguments)
+
+    return result
+
+
+_RUNTIME: Dict[str, Any] = {
+    '_r_UNBOUND': object(),
+    '_r_TRUE': TRUE,
+    '_r_FALSE': FALSE,
+    '_r_NULL': NULL,
+    '_r_Error': Error,
+    '_r_NativeFunction': NativeFunction,
+    '_r_TailCall': TailCall,
+    '_r_array': _array,
+    '_r_assign': _assign,
+    '_r_call': _call,
+    '_r_hash': _hash,
+    '_r_index': _index,
+    '_r_infix': _infix,
+    '_r_lookup': _lookup,
+    '_r_prefix': _prefix,
+    '_r_run_tail_calls': _run_tail_calls,
+}
+
+
+# Lines of statements to run first, and the expression to use after them.
+_Expression = Tuple[List[str], str]
+
+
+class _Scope:
+    """Variables of the program or of a procedimiento, locals of the
+    Python function it becomes."""
+
+    __slots__ = ('names', 'defined', 'unbound', 'nonlocals')
+
+    def __init__(self, names: Dict[str, str], defined: Set[str]) -> None:
+        # The Python name of every variable.
+        self.names = names
+        # Variables surely defined where the code is being translated.
+        self.defined = defined
+        # Python names of the variables used where they may not be defined.
+        self.unbound: Set[str] = set()
+        # Python names of variables of enclosing scopes assigned to.
+        self.nonlocals: Set[str] = set()
+
+
+class _Generator:
+    """Translates a program to Python source.
+
+    LPP names become `l_<name>`, or `l<depth>_<name>` when they hide a
+    variable of an enclosing procedimiento, temporaries `_t<n>` and
+    functions `_f<n>`. The runtime helpers are globals named `_r_<name>`,
+    so none of them can clash.
+    """
+
+    def __init__(self) -> None:
+        # The procedimientos of the program, referred to by index.
+        self.nodes: List[ast.Function] = []
+        self._counter: int = 0
+        # Variables of every enclosing Python function, innermost last.
+        self._scopes: List[_Scope] = []
+        # Name and parameters of every enclosing Python function whose body
+        # runs in a loop, None for the others.
+        self._loops: List[Optional[Tuple[str, List[str]]]] = []
+
+    def program(self, program: ast.Program) -> str:
+        mark_positions(program)
+        self._loops.append(None)
+        scope = self._scope(_bound_names(program.statements), set())
+        self._scopes.append(scope)
+        body = self._body(program.statements, 1, is_program=True)
+        self._scopes.pop()
+        self._loops.pop()
+
+        lines = ['def _r_program(_r_env):']
+        lines.extend(_header(scope, 1))
+        lines.extend(body)
+
+        return '\n'.join(lines) + '\n'
+
+    def _body(self,
+              statements: List[ast.Statement],
+              indent: int,
+              is_program: bool = False) -> List[str]:
+        """Translate the statements of a program or procedimiento, whose
+        result is returned."""
+        pad = '    ' * indent
+        lines: List[str] = []
+        no_value = 'None' if is_program else '_r_NULL'
+
+        for index, statement in enumerate(statements):
+            is_last = index == len(statements) - 1
+            value = self._statement(statement, indent, lines)
+
+            if value is None:
+                if is_last:
+                    lines.append(f'{pad}return {no_value}')
+            elif isinstance(statement, ast.ReturnStatement) or is_last:
+                if type(statement) in (ast.AssignStatement,
+                                       ast.WhileStatement):
+                    # Only their errors are values.
+                    value = f'{value} or {no_value}'
+                elif not is_program \
+                        and type(statement) is ast.ExpressionStatement \
+                        and type(cast(ast.ExpressionStatement,
+                                      statement).expression) is ast.If:
+                    # A branch without a value leaves None in its target.
+                    value = f'{value} if {value} is not None else _r_NULL'
+                lines.append(f'{pad}return {value}')
+                return lines
+            else:
+                # An error stops the statements that follow it.
+                temporary = self._temporary()
+                lines.append(f'{pad}if type({temporary} := {value}) '
+                             f'is _r_Error:')
+                lines.append(f'{pad}    return {temporary}')
+
+        if not statements:
+            lines.append(f'{pad}return {no_value}')
+
+        return lines
+
+    def _branch(self,
+                block: ast.Block,
+                target: str,
+                indent: int,
+                lines: List[str]) -> None:
+        """Translate a block of a `si`, whose result is stored in
+        `target`."""
+        pad = '    ' * indent
+        statements = block.statements
+        # Variables it defines are not defined when it doesn't run.
+        defined = set(self._scopes[-1].defined)
+
+        for index, statement in enumerate(statements):
+            is_last = index == len(statements) - 1
+            value = self._statement(statement, indent, lines)
+
+            if value is None:
+                if is_last:
+                    lines.append(f'{pad}{target} = None')
+            elif isinstance(statement, ast.ReturnStatement):
+                lines.append(f'{pad}return {value}')
+                break
+            elif is_last:
+                lines.append(f'{pad}{target} = {value}')
+            else:
+                # An error stops the statements that follow it and becomes
+                # the value of the block.
+                lines.append(f'{pad}{target} = {value}')
+                lines.append(f'{pad}if type({target}) is not _r_Error:')
+                indent += 1
+                pad = '    ' * indent
+
+        if not statements:
+            lines.append(f'{pad}{target} = None')
+
+        self._scopes[-1].defined = defined
+
+    def _statement(self,
+                   statement: ast.Statement,
+                   indent: int,
+                   lines: List[str]) -> Optional[str]:
+        """Append the lines of `statement` and return the expression with
+        its value, or None when it has no value."""
+        pad = '    ' * indent
+        statement_type: Type = type(statement)
+
+        if statement_type == ast.ExpressionStatement:
+            expression = cast(ast.ExpressionStatement, statement).expression
+            assert expression is not None
+
+            if type(expression) is ast.If:
+                target = self._temporary()
+                self._if_statement(cast(ast.If, expression), target, indent, lines)
+                return target
+
+            prelude, value = self._expression(expression, indent)
+            lines.extend(prelude)
+            return value
+        elif statement_type == ast.LetStatement:
+            let_statement = cast(ast.LetStatement, statement)
+            assert let_statement.name is not None \
+                and let_statement.value is not None
+
+            name = let_statement.name.value
+            scope = self._scopes[-1]
+
+            # A procedimiento can't be called before it is stored, the
+            # variable is defined for its body.
+            if type(let_statement.value) is ast.Function:
+                scope.defined.add(name)
+
+            prelude, value = self._expression(let_statement.value, indent)
+            lines.extend(prelude)
+            lines.append(f'{pad}{scope.names[name]} = {value}')
+            scope.defined.add(name)
+            return None
+        elif statement_type == ast.AssignStatement:
+            assign_statement = cast(ast.AssignStatement, statement)
+            assert assign_statement.name is not None \
+                and assign_statement.value is not None
+            name = assign_statement.name.value
+
+            prelude, value = self._expression(assign_statement.value, indent)
+            lines.extend(prelude)
+            return self._assign(name, value, indent, lines)
+        elif statement_type == ast.WhileStatement:
+            return self._while(cast(ast.WhileStatement, statement),
+                               indent,
+                               lines)
+        elif statement_type == ast.ReturnStatement:
+            return_statement = cast(ast.ReturnStatement, statement)
+            return_value = return_statement.return_value
+            assert return_value is not None
+
+            if return_statement.tail:
+                return self._tail_call(cast(ast.Call, return_value),
+                                       self._loops[-1],
+                                       indent,
+                                       lines)
+
+            prelude, value = self._expression(return_value, indent)
+            lines.extend(prelude)
+            return value
+
+        raise TypeError(f'Sentencia sin soporte: {statement_type.__name__}')
+
+    def _while(self,
+               while_statement: ast.WhileStatement,
+               indent: int,
+               lines: List[str]) -> str:
+        """Append the lines of a loop and return the expression with the
+        error in its condition or body that stopped it, None if none did."""
+        assert while_statement.condition is not None \
+            and while_statement.body is not None
+        pad = '    ' * indent
+        result = self._temporary()
+
+        lines.append(f'{pad}{result} = None')
+        lines.append(f'{pad}while True:')
+        prelude, condition = self._expression(while_statement.condition,
+                                              indent + 1)
+        lines.extend(prelude)
+        condition_value = self._temporary()
+        lines.append(f'{pad}    if ({condition_value} := {condition}) '
+                     f'is _r_FALSE or {condition_value} is _r_NULL:')
+        lines.append(f'{pad}        break')
+        lines.append(f'{pad}    elif type({condition_value}) is _r_Error:')
+        lines.append(f'{pad}        {result} = {condition_value}')
+        lines.append(f'{pad}        break')
+
+        # Variables it defines are not defined when it doesn't run, nor
+        # before their statements when it runs again.
+        defined = set(self._scopes[-1].defined)
+        for statement in while_statement.body.statements:
+            value = self._statement(statement, indent + 1, lines)
+
+            if value is None:
+                continue
+            elif isinstance(statement, ast.ReturnStatement):
+                lines.append(f'{pad}    return {value}')
+                break
+            else:
+                temporary = self._temporary()
+                lines.append(f'{pad}    if type({temporary} := {value}) '
+                             f'is _r_Error:')
+                lines.append(f'{pad}        {result} = {temporary}')
+                lines.append(f'{pad}        break')
+
+        self._scopes[-1].defined = defined
+
+        return result
+
+    def _if_statement(self,
+                      if_expression: ast.If,
+                      target: str,
+                      indent: int,
+                      lines: List[str]) -> None:
+        assert if_expression.condition is not None \
+            and if_expression.consequence is not None
+        pad = '    ' * indent
+
+        prelude, condition = self._expression(if_expression.condition, indent)
+        lines.extend(prelude)
+        lines.append(f'{pad}if {self._truthy(condition)}:')
+        self._branch(if_expression.consequence, target, indent + 1, lines)
+        lines.append(f'{pad}else:')
+        if if_expression.alternative is not None:
+            self._branch(if_expression.alternative, target, indent + 1, lines)
+        else:
+            lines.append(f'{pad}    {target} = _r_NULL')
+
+    def _expression(self, node: ast.Expression, indent: int) -> _Expression:
+        node_type: Type = type(node)
+
+        if node_type == ast.Identifier:
+            return [], self._identifier(cast(ast.Identifier, node).value)
+        elif node_type == ast.Integer:
+            return [], repr(cast(ast.Integer, node).value)
+        elif node_type == ast.Infix:
+            infix = cast(ast.Infix, node)
+            assert infix.left is not None and infix.right is not None
+
+            prelude, (left, right) = self._sequence([infix.left, infix.right],
+                                                    indent)
+            return prelude, self._infix(infix.operator,
+                                        left,
+                                        right,
+                                        _is_integer(infix.left),
+                                        _is_integer(infix.right))
+        elif node_type == ast.Call:
+            call = cast(ast.Call, node)
+            assert call.arguments is not None
+
+            prelude, values = self._sequence([call.function] + call.arguments,
+                                             indent)
+            function = self._temporary()
+            arguments = ', '.join(values[1:])
+            result = self._temporary()
+            # The procedimiento may return a call for its caller to run.
+            return prelude, (f'(_r_run_tail_calls({result}) '
+                             f'if type({result} := '
+                             f'({function}.fn '
+                             f'if type({function} := {values[0]}) '
+                             f'is _r_NativeFunction '
+                             f'else _r_call({function}))({arguments})) '
+                             f'is _r_TailCall else {result})')
+        elif node_type == ast.If:
+            return self._if_expression(cast(ast.If, node), indent)
+        elif node_type == ast.Boolean:
+            return [], '_r_TRUE' if cast(ast.Boolean, node).value else '_r_FALSE'
+        elif node_type == ast.Prefix:
+            prefix = cast(ast.Prefix, node)
+            assert prefix.right is not None
+
+            if prefix.operator == '-' and type(prefix.right) is ast.Integer:
+                return [], repr(-cast(int, cast(ast.Integer, prefix.right).value))
+
+            prelude, right = self._expression(prefix.right, indent)
+            return prelude, self._prefix(prefix.operator, right)
+        elif node_type == ast.StringLiteral:
+            return [], repr(cast(ast.StringLiteral, node).value)
+        elif node_type == ast.Function:
+            return self._function(cast(ast.Function, node), indent)
+        elif node_type == ast.ArrayLiteral:
+            elements = cast(ast.ArrayLiteral, node).elements
+            assert elements is not None
+
+            prelude, values = self._sequence(elements, indent)
+            return prelude, f'_r_array({", ".join(values)})'
+        elif node_type == ast.HashLiteral:
+            pairs = cast(ast.HashLiteral, node).pairs
+            assert pairs is not None
+
+            prelude, values = self._sequence([item
+                                              for pair in pairs
+                                              for item in pair],
+                                             indent)
+            return prelude, f'_r_hash({", ".join(values)})'
+        elif node_type == ast.Index:
+            index = cast(ast.Index, node)
+            assert index.index is not None
+
+            prelude, (left, position) = self._sequence([index.left,
+                                                        index.index],
+                                                       indent)
+            return prelude, f'_r_index({left}, {position})'
+
+        raise TypeError(f'Expresión sin soporte: {node_type.__name__}')
+
+    def _function(self, function: ast.Function, indent: int) -> _Expression:
+        assert function.body is not None
+        pad = '    ' * indent
+        index = len(self.nodes)
+        name = f'_f{index}'
+        self.nodes.append(function)
+
+        parameters = [parameter.value for parameter in function.parameters]
+        # Missing arguments leave their parameters unset, like in the
+        # evaluator, so parameters aren't surely defined either.
+        scope = self._scope(set(parameters)
+                            | _bound_names(function.body.statements),
+                            set())
+        parameter_names = [scope.names[parameter] for parameter in parameters]
+        self._scopes.append(scope)
+
+        if _loops(function.body):
+            self._loops.append((name, parameter_names))
+            body = self._body(function.body.statements, indent + 2)
+        else:
+            self._loops.append(None)
+            body = self._body(function.body.statements, indent + 1)
+        loop = self._loops.pop()
+        self._scopes.pop()
+        # Parameters start as their arguments, not in the header.
+        scope.unbound.difference_update(parameter_names)
+
+        # Extra arguments are ignored, like in the evaluator. Of repeated
+        # parameters the last wins, the others take a name nothing reads.
+        signature = ', '.join(
+            [f'{parameter}=_r_UNBOUND'
+             if parameter not in parameter_names[position + 1:]
+             else f'_p{position}=_r_UNBOUND'
+             for position, parameter in enumerate(parameter_names)] + ['*_'])
+        lines = [f'{pad}def {name}({signature}):']
+        if scope.nonlocals:
+            lines.append(f'{pad}    nonlocal {", ".join(sorted(scope.nonlocals))}')
+        if loop is not None:
+            lines.append(f'{pad}    while True:')
+            lines.extend(_header(scope, indent + 2))
+        else:
+            lines.extend(_header(scope, indent + 1))
+        lines.extend(body)
+
+        return lines, f'_r_NativeFunction({name}, _r_nodes[{index}])'
+
+    def _assign(self,
+                name: str,
+                value: str,
+                indent: int,
+                lines: List[str]) -> Optional[str]:
+        """Append the lines that assign `value` to the innermost variable
+        called `name` that is defined when they run.
+
+        Return the expression with the error of the assignment, None when
+        a variable is surely defined and it can't fail.
+        """
+        pad = '    ' * indent
+        current = self._scopes[-1]
+        scopes = [scope for scope in reversed(self._scopes)
+                  if name in scope.names]
+
+        result = self._temporary()
+        if scopes and not any(name in scope.defined for scope in scopes):
+            # The environment is the last one tried.
+            lines.append(f'{pad}{result} = None')
+
+        for index, scope in enumerate(scopes):
+            python_name = scope.names[name]
+            if scope is not current:
+                current.nonlocals.add(python_name)
+
+            if name in scope.defined:
+                lines.append(f'{pad}{python_name} = {value}')
+                return None
+
+            # Evaluated once, for whichever variable is defined.
+            if index == 0:
+                temporary = self._temporary()
+                lines.append(f'{pad}{temporary} = {value}')
+                value = temporary
+
+            scope.unbound.add(python_name)
+            lines.append(f'{pad}if {python_name} is not _r_UNBOUND:')
+            lines.append(f'{pad}    {python_name} = {value}')
+            lines.append(f'{pad}else:')
+            pad += '    '
+
+        assignment = f'_r_assign(_r_env, {name!r}, {value})'
+        if not scopes:
+            return assignment
+
+        lines.append(f'{pad}{result} = {assignment}')
+        return result
+
+    def _identifier(self, name: str) -> str:
+        """Return the expression with the value of the innermost variable
+        called `name` that is defined."""
+        value = f'_r_lookup(_r_env, {name!r})'
+
+        for scope in self._scopes:
+            python_name = scope.names.get(name)
+            if python_name is None:
+                continue
+            elif name in scope.defined:
+                value = python_name
+            else:
+                scope.unbound.add(python_name)
+                value = (f'({python_name} if {python_name} '
+                         f'is not _r_UNBOUND else {value})')
+
+        return value
+
+    def _if_expression(self, if_expression: ast.If, indent: int) -> _Expression:
+        assert if_expression.condition is not None \
+            and if_expression.consequence is not None
+
+        branches: List[Optional[ast.Block]] = [if_expression.consequence,
+                                               if_expression.alternative]
+        values: List[str] = []
+        for branch in branches:
+            if branch is None:
+                values.append('_r_NULL')
+                continue
+
+            if len(branch.statements) != 1 \
+                    or type(branch.statements[0]) is not ast.ExpressionStatement:
+                break
+
+            expression = cast(ast.ExpressionStatement,
+                              branch.statements[0]).expression
+            assert expression is not None
+            prelude, value = self._expression(expression, indent)
+            if prelude:
+                break
+
+            values.append(value)
+        else:
+            prelude, condition = self._expression(if_expression.condition,
+                                                  indent)
+            return prelude, (f'({values[0]} if {self._truthy(condition)} '
+                             f'else {values[1]})')
+
+        # Blocks with statements need an if statement, run before the
+        # expression that uses its value. A branch without a value leaves
+        # None in its target, which is nulo here.
+        target = self._temporary()
+        lines: List[str] = []
+        self._if_statement(if_expression, target, indent, lines)
+
+        return lines, f'({target} if {target} is not None else _r_NULL)'
+
+    def _infix(self,
+               operator: str,
+               left: str,
+               right: str,
+               left_is_integer: bool,
+               right_is_integer: bool) -> str:
+        # Integer literals need neither a temporary nor a type check.
+        checks: List[str] = []
+        left_value = left
+        if not left_is_integer:
+            left_value = self._temporary()
+            checks.append(f'(type({left_value} := {left}) is int)')
+
+        right_value = right
+        if not right_is_integer:
+            right_value = self._temporary()
+            checks.append(f'(type({right_value} := {right}) is int)')
+
+        if operator in _ARITHMETIC:
+            result = f'{left_value} {_ARITHMETIC[operator]} {right_value}'
+        else:
+            result = (f'(_r_TRUE if {left_value} {_COMPARISONS[operator]} '
+                      f'{right_value} else _r_FALSE)')
+
+        if not checks:
+            return f'({result})'
+
+        are_integers = ' & '.join(checks)
+        fallback = f'_r_infix({operator!r}, {left_value}, {right_value})'
+
+        return f'({result} if {are_integers} else {fallback})'
+
+    def _prefix(self, operator: str, right: str) -> str:
+        value = self._temporary()
+
+        if operator == '!':
+            return (f'(_r_TRUE if ({value} := {right}) is _r_FALSE '
+                    f'or {value} is _r_NULL else _r_FALSE)')
+
+        return (f'(-{value} if type({value} := {right}) is int '
+                f'else _r_prefix({operator!r}, {value}))')
+
+    def _sequence(self,
+                  nodes: List[ast.Expression],
+                  indent: int) -> Tuple[List[str], List[str]]:
+        """Translate expressions evaluated left to right.
+
+        When an expression needs statements run before it, the values of
+        the expressions on its left are stored first, so they are still
+        evaluated before it.
+        """
+        pad = '    ' * indent
+        prelude: List[str] = []
+        values: List[str] = []
+
+        for node in nodes:
+            lines, value = self._expression(node, indent)
+            if lines:
+                for index, previous in enumerate(values):
+                    temporary = self._temporary()
+                    prelude.append(f'{pad}{temporary} = {previous}')
+                    values[index] = temporary
+
+                prelude.extend(lines)
+
+            values.append(value)
+
+        return prelude, values
+
+    def _tail_call(self,
+                   call: ast.Call,
+                   loop: Optional[Tuple[str, List[str]]],
+                   indent: int,
+                   lines: List[str]) -> str:
+        """Append the lines of a call returned by a procedimiento, and
+        return the expression with its value.
+
+        A procedimiento called is returned as a TailCall for the caller to
+        run, so calls in a row don't nest Python calls. When the body runs
+        in a loop and the procedimiento calls itself, the loop starts over
+        with the arguments as parameters instead.
+        """
+        assert call.arguments is not None
+        pad = '    ' * indent
+
+        prelude, values = self._sequence([call.function] + call.arguments,
+                                         indent)
+        lines.extend(prelude)
+        function = self._temporary()
+        arguments = ', '.join(values[1:])
+
+        is_native = f'type({function} := {values[0]}) is _r_NativeFunction'
+        if loop is not None and len(call.arguments) == len(loop[1]):
+            name, parameters = loop
+            lines.append(f'{pad}if {is_native} and {function}.fn is {name}:')
+            if parameters:
+                lines.append(f'{pad}    {", ".join(parameters)} = {arguments}')
+            lines.append(f'{pad}    continue')
+            is_native = f'type({function}) is _r_NativeFunction'
+
+        return (f'(_r_TailCall({function}, [{arguments}]) if {is_native} '
+                f'else _r_call({function})({arguments}))')
+
+    def _scope(self, names: Set[str], defined: Set[str]) -> _Scope:
+        """Return the scope of a Python function nested in the current
+        ones, with the variables `names`."""
+        depth = len(self._scopes)
+        python_names: Dict[str, str] = {}
+        for name in names:
+            if any(name in outer.names for outer in self._scopes):
+                python_names[name] = f'l{depth}_{name}'
+            else:
+                python_names[name] = _name(name)
+
+        return _Scope(python_names, defined)
+
+    def _temporary(self) -> str:
+        self._counter += 1
+
+        return f'_t{self._counter}'
+
+    def _truthy(self, condition: str) -> str:
+        value = self._temporary()
+
+        return (f'({value} := {condition}) is not _r_FALSE '
+                f'and {value} is not _r_NULL')
+
+
+def _bound_names(statements: List[ast.Statement]) -> Set[str]:
+    """Return the names defined by `statements`, in the environment of the
+    program or procedimiento they belong to."""
+    names: Set[str] = set()
+    stack: List[ast.ASTNode] = list(statements)
+
+    while stack:
+        node = stack.pop()
+        if type(node) is ast.Function:
+            # Its names belong to its own environment.
+            continue
+        elif type(node) is ast.LetStatement:
+            let_statement = cast(ast.LetStatement, node)
+            assert let_statement.name is not None
+            names.add(let_statement.name.value)
+
+        stack.extend(ast.children(node))
+
+    return names
+
+
+def _header(scope: _Scope, indent: int) -> List[str]:
+    """Return the lines that start the variables of `scope` that may be
+    used before they are defined."""
+    if not scope.unbound:
+        return []
+
+    names = ' = '.join(sorted(scope.unbound))
+    return [f'{"    " * indent}{names} = _r_UNBOUND']
+
+
+def _loops(body: ast.Block) -> bool:
+    """Return whether the body of a procedimiento may call itself in tail
+    position, and can run in a loop.
+
+    A procedimiento defined in the body could keep using the parameters of
+    a call after the loop rebinds them, so those bodies don't loop.
+    """
+    has_tail_calls = False
+    for node in ast.walk(body):
+        if type(node) is ast.Function:
+            return False
+        elif type(node) is ast.ReturnStatement \
+                and cast(ast.ReturnStatement, node).tail:
+            has_tail_calls = True
+
+    return has_tail_calls
+
+
+def _is_integer(node: ast.Expression) -> bool:
+    return type(node) is ast.Integer or type(node) is ast.Prefix \
+        and cast(ast.Prefix, node).operator == '-' \
+        and type(cast(ast.Prefix, node).right) is ast.Integer
+
+
+def _name(name: str) -> str:
+    return f'l_{name}'
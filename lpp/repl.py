@@ -1,25 +1,53 @@
-from typing import List
+from os import path
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
 
 from lpp.ast import Program
+from lpp.cache import ProgramCache
+from lpp.closures import run as run_closures
 from lpp.evaluator import evaluate
+from lpp.iterative import evaluate as evaluate_iteratively
 from lpp.lexer import Lexer
-from lpp.object import Environment
+from lpp.object import (
+    Environment,
+    Object,
+)
+from lpp.optimizer import optimize as optimize_program
 from lpp.parser import Parser
+from lpp.pycodegen import run as run_python
 from lpp.token import (
     Token,
     TokenType
 )
+from lpp.vm import run as run_vm
 
 
 EOF_TOKEN: Token = Token(TokenType.EOF, '')
 
+CACHE_DIRECTORY: str = '__lppcache__'
+
+Engine = Callable[[Program, Environment], Optional[Object]]
+
+# Ways to run a program, they all give the same results.
+ENGINES: Dict[str, Engine] = {
+    'evaluador': evaluate,
+    'iterativo': evaluate_iteratively,
+    'vm': run_vm,
+    'cierres': run_closures,
+    'python': run_python,
+}
+
 
 def _print_parse_errors(errors: List[str]):
     for error in errors:
         print(error)
 
 
-def start_repl() -> None:
+def start_repl(engine: Engine = evaluate, optimize: bool = False) -> None:
     scanned: List[str] = []
 
     while (source := input('>> ')) != 'salir()':
@@ -33,8 +61,38 @@ def start_repl() -> None:
             _print_parse_errors(parser.errors)
             continue
 
-        evaluated = evaluate(program, env)
+        if optimize:
+            optimize_program(program)
+
+        evaluated = engine(program, env)
 
         if evaluated is not None:
             print(evaluated.inspect())
 
+
+def run_file(file_path: str,
+             engine: Engine = evaluate,
+             optimize: bool = False) -> None:
+    """Evaluate the program in `file_path`, keeping its parsed form in a
+    cache directory next to it so later runs skip lexing and parsing.
+
+    The cache keeps programs as parsed, `optimize` rewrites them after
+    loading them."""
+    with open(file_path, encoding='utf-8') as source_file:
+        source = source_file.read()
+
+    cache = ProgramCache(path.join(path.dirname(path.abspath(file_path)),
+                                   CACHE_DIRECTORY))
+    program, errors = cache.parse(source)
+
+    if len(errors) > 0:
+        _print_parse_errors(errors)
+        return
+
+    if optimize:
+        optimize_program(program)
+
+    evaluated = engine(program, Environment())
+
+    if evaluated is not None:
+        print(evaluated.inspect())
@@ -0,0 +1,151 @@
+from typing import (
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Type,
+    cast,
+)
+
+import lpp.ast as ast
+
+
+def resolve(program: ast.Program) -> None:
+    """Work out where every variable of `program` lives.
+
+    A program and every procedimiento get a `Scope` with the names they
+    define, their parameters and every `variable` in their body outside
+    nested procedimientos. Every identifier gets the number of
+    procedimientos between it and the scope that defines its name, and the
+    slot of the name in that scope. Names no scope defines, like builtins,
+    keep None. Which `si` and `regresa` are used as values is marked too,
+    see `mark_positions`.
+
+    Resolving a program again gives the same result.
+    """
+    program.scope = _scope((), program.statements)
+    _Resolver([program.scope]).visit_all(program.statements)
+    mark_positions(program)
+
+
+def mark_positions(node: ast.ASTNode) -> None:
+    """Mark the `si` expressions in `node` used as values, the `regresa`
+    statements in them, and those of every procedimiento that return a
+    call and end the call of the procedimiento when they run.
+
+    A `si` whose branch has no value, like one that only defines a
+    variable, gives nulo where it is used as a value, and no value where
+    it is a statement.
+
+    A `regresa` ends the call of its procedimiento, or the program, wherever
+    it is. The ones in its body, or in the blocks of a `si` or a `mientras`
+    used as a statement of one of those blocks, do it with the value of
+    the block. The others have to leave the expressions around them first.
+    Only calls returned from the body or from a `si` are tail calls, a
+    loop doesn't pass them on.
+    """
+    for child in ast.walk(node):
+        if type(child) is ast.ReturnStatement:
+            return_statement = cast(ast.ReturnStatement, child)
+            return_statement.tail = False
+            return_statement.in_expression = True
+        elif type(child) is ast.If:
+            cast(ast.If, child).in_expression = True
+
+    if type(node) is ast.Program:
+        _mark_statements(cast(ast.Program, node).statements, False)
+
+    for child in ast.walk(node):
+        if type(child) is ast.Function:
+            body = cast(ast.Function, child).body
+            assert body is not None
+            _mark_statements(body.statements, True)
+
+
+class _Resolver:
+
+    def __init__(self, scopes: List[ast.Scope]) -> None:
+        # Innermost last.
+        self._scopes = scopes
+
+    def visit_all(self, nodes: Sequence[ast.ASTNode]) -> None:
+        for node in nodes:
+            self.visit(node)
+
+    def visit(self, node: ast.ASTNode) -> None:
+        node_type: Type = type(node)
+
+        if node_type == ast.Identifier:
+            self._resolve(cast(ast.Identifier, node))
+        elif node_type == ast.Function:
+            function = cast(ast.Function, node)
+            assert function.body is not None
+
+            function.scope = _scope(function.parameters,
+                                    function.body.statements)
+            self._scopes.append(function.scope)
+            self.visit_all(function.parameters)
+            self.visit_all(function.body.statements)
+            self._scopes.pop()
+        else:
+            self.visit_all(ast.children(node))
+
+    def _resolve(self, identifier: ast.Identifier) -> None:
+        identifier.depth = None
+        identifier.slot = None
+
+        for depth, scope in enumerate(reversed(self._scopes)):
+            slot = scope.slot(identifier.value)
+            if slot is not None:
+                identifier.depth = depth
+                identifier.slot = slot
+                return
+
+
+def _mark_statements(statements: List[ast.Statement], tail: bool) -> None:
+    for statement in statements:
+        statement_type: Type = type(statement)
+
+        if statement_type == ast.ReturnStatement:
+            return_statement = cast(ast.ReturnStatement, statement)
+            return_statement.in_expression = False
+            return_statement.tail = tail \
+                and type(return_statement.return_value) is ast.Call
+        elif statement_type == ast.ExpressionStatement \
+                and type(cast(ast.ExpressionStatement,
+                              statement).expression) is ast.If:
+            if_expression = cast(ast.If,
+                                 cast(ast.ExpressionStatement,
+                                      statement).expression)
+            if_expression.in_expression = False
+            assert if_expression.consequence is not None
+            _mark_statements(if_expression.consequence.statements, tail)
+            if if_expression.alternative is not None:
+                _mark_statements(if_expression.alternative.statements, tail)
+        elif statement_type == ast.WhileStatement:
+            body = cast(ast.WhileStatement, statement).body
+            assert body is not None
+            _mark_statements(body.statements, False)
+
+
+def _scope(parameters: Sequence[ast.Identifier],
+           statements: List[ast.Statement]) -> ast.Scope:
+    names: List[str] = [parameter.value for parameter in parameters]
+    seen: Set[str] = set(names)
+    stack: List[ast.ASTNode] = list(reversed(statements))
+
+    while stack:
+        node = stack.pop()
+        if type(node) is ast.Function:
+            # Its names belong to its own scope.
+            continue
+        elif type(node) is ast.LetStatement:
+            name: Optional[ast.Identifier] = cast(ast.LetStatement, node).name
+            assert name is not None
+            if name.value not in seen:
+                seen.add(name.value)
+                names.append(name.value)
+
+        stack.extend(reversed(ast.children(node)))
+
+    return ast.Scope(names)
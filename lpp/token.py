@@ -12,6 +12,7 @@ from typing import (
 @unique
 class TokenType(Enum):
     ASSIGN = auto()
+    COLON = auto()
     COMMA = auto()
     DIVISION = auto()
     ELSE = auto()
@@ -25,6 +26,7 @@ class TokenType(Enum):
     ILLEGAL = auto()
     INT = auto()
     LBRACE = auto()
+    LBRACKET = auto()
     LET = auto()
     LPAREN = auto()
     LT = auto()
@@ -36,9 +38,11 @@ class TokenType(Enum):
     RETURN = auto()
     RPAREN = auto()
     RBRACE = auto()
+    RBRACKET = auto()
     SEMICOLON = auto()
     STRING = auto()
     TRUE = auto()
+    WHILE = auto()
 
 
 class Token(NamedTuple):
@@ -49,15 +53,17 @@ class Token(NamedTuple):
         return f'Type: {self.token_type}, Literal: {self.literal}'
 
 
+KEYWORDS: Dict[str, TokenType] = {
+    'falso': TokenType.FALSE,
+    'mientras': TokenType.WHILE,
+    'procedimiento': TokenType.FUNCTION,
+    'regresa': TokenType.RETURN,
+    'si': TokenType.IF,
+    'si_no': TokenType.ELSE,
+    'variable': TokenType.LET,
+    'verdadero': TokenType.TRUE,
+}
+
+
 def lookup_token_type(literal: str) -> TokenType:
-    keywords: Dict[str, TokenType] = {
-        'falso': TokenType.FALSE,
-        'procedimiento': TokenType.FUNCTION,
-        'regresa': TokenType.RETURN,
-        'si': TokenType.IF,
-        'si_no': TokenType.ELSE,
-        'variable': TokenType.LET,
-        'verdadero': TokenType.TRUE,
-    }
-
-    return keywords.get(literal, TokenType.IDENT)
+    return KEYWORDS.get(literal, TokenType.IDENT)
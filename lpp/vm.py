@@ -0,0 +1,368 @@
+from array import array
+from typing import (
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
+
+from lpp.ast import Program
+from lpp.builtins import BUILTINS
+from lpp.compiler import (
+    Code,
+    Opcode,
+    compile_program,
+)
+from lpp.evaluator import (
+    FALSE,
+    NULL,
+    TRUE,
+    _NOT_A_FUNCTION,
+    _UNKNOWN_IDENTIFIER,
+    _evaluate_hash_items,
+    _evaluate_index_expression,
+    _evaluate_infix_expression,
+    _evaluate_prefix_expression,
+    _new_error,
+)
+from lpp.object import (
+    Array,
+    Builtin,
+    Environment,
+    Error,
+    Frame,
+    Function,
+    Integer,
+    Object,
+    integer_object,
+)
+from lpp.persistent import Vector
+
+
+class Closure(Function):
+    """Function created by the virtual machine, it keeps its compiled code
+    next to its source."""
+
+    __slots__ = ('code', 'frame')
+
+    def __init__(self, code: Code, frame: Frame) -> None:
+        assert code.body is not None
+        super().__init__(code.parameters, code.body, frame)
+        self.code = code
+        self.frame = frame
+
+
+# Plain ints, comparing them is cheaper than comparing enum members.
+_CONSTANT = int(Opcode.CONSTANT)
+_TRUE = int(Opcode.TRUE)
+_FALSE = int(Opcode.FALSE)
+_NULL = int(Opcode.NULL)
+_GET_LOCAL = int(Opcode.GET_LOCAL)
+_SET_LOCAL = int(Opcode.SET_LOCAL)
+_GET_OUTER = int(Opcode.GET_OUTER)
+_GET_GLOBAL = int(Opcode.GET_GLOBAL)
+_POP = int(Opcode.POP)
+_ADD = int(Opcode.ADD)
+_SUBTRACT = int(Opcode.SUBTRACT)
+_MULTIPLY = int(Opcode.MULTIPLY)
+_DIVIDE = int(Opcode.DIVIDE)
+_EQUAL = int(Opcode.EQUAL)
+_NOT_EQUAL = int(Opcode.NOT_EQUAL)
+_GREATER_THAN = int(Opcode.GREATER_THAN)
+_LESS_THAN = int(Opcode.LESS_THAN)
+_MINUS = int(Opcode.MINUS)
+_BANG = int(Opcode.BANG)
+_JUMP = int(Opcode.JUMP)
+_JUMP_IF_FALSY = int(Opcode.JUMP_IF_FALSY)
+_JUMP_IF_ERROR = int(Opcode.JUMP_IF_ERROR)
+_FUNCTION = int(Opcode.FUNCTION)
+_CALL = int(Opcode.CALL)
+_TAIL_CALL = int(Opcode.TAIL_CALL)
+_RETURN_VALUE = int(Opcode.RETURN_VALUE)
+_RETURN = int(Opcode.RETURN)
+_ASSIGN_LOCAL = int(Opcode.ASSIGN_LOCAL)
+_ASSIGN_OUTER = int(Opcode.ASSIGN_OUTER)
+_ASSIGN_GLOBAL = int(Opcode.ASSIGN_GLOBAL)
+_LOOP_IF_TRUTHY = int(Opcode.LOOP_IF_TRUTHY)
+_ARRAY = int(Opcode.ARRAY)
+_INDEX = int(Opcode.INDEX)
+_HASH = int(Opcode.HASH)
+
+_INFIX_OPERATORS = {
+    _ADD: '+',
+    _SUBTRACT: '-',
+    _MULTIPLY: '*',
+    _DIVIDE: '/',
+    _EQUAL: '==',
+    _NOT_EQUAL: '!=',
+    _GREATER_THAN: '>',
+    _LESS_THAN: '<',
+}
+
+# Instructions, constants and global names of the code being run, the
+# position of the next instruction, the variables and where the operand
+# stack of the call starts.
+_Call = Tuple[array, list, List[str], int, Frame, int]
+
+
+class VM:
+    """Runs compiled code with an operand stack.
+
+    Calls are pushed on a list instead of recursing, so the depth of LPP
+    recursion isn't bound by the Python stack. Variables live in the slots
+    of a `Frame` per call, and `env` only holds globals defined before the
+    program runs.
+    """
+
+    def __init__(self, code: Code, env: Environment) -> None:
+        self._code = code
+        self._env = env
+
+    def run(self) -> Optional[Object]:
+        instructions = self._code.instructions
+        constants = self._code.constants
+        names = self._code.names
+        frame = Frame([None] * len(self._code.scope.names),
+                      self._code.scope.names,
+                      None,
+                      self._env)
+        values = frame.values
+        ip = 0
+        base = 0
+
+        stack: List[Object] = []
+        calls: List[_Call] = []
+        push = stack.append
+        pop = stack.pop
+
+        while True:
+            opcode = instructions[ip]
+
+            if opcode == _GET_LOCAL:
+                value = values[instructions[ip + 1]]
+                if value is None:
+                    value = _unbound(frame, instructions[ip + 1])
+                push(value)
+                ip += 2
+            elif opcode == _CONSTANT:
+                push(constants[instructions[ip + 1]])
+                ip += 2
+            elif opcode == _CALL or opcode == _TAIL_CALL:
+                count = instructions[ip + 1]
+                ip += 2
+                function = stack[-count - 1]
+                arguments = stack[len(stack) - count:]
+                del stack[-count - 1:]
+
+                if type(function) is Closure:
+                    code = function.code
+                    if opcode == _CALL:
+                        calls.append((instructions, constants, names, ip, frame,
+                                      base))
+                        base = len(stack)
+                    else:
+                        # Reuse the place of the current call, nothing of it
+                        # is needed after the call it returns.
+                        del stack[base:]
+                    instructions = code.instructions
+                    constants = code.constants
+                    names = code.names
+                    ip = 0
+
+                    # Parameters take the first slots, extra arguments are
+                    # ignored and missing ones left unset.
+                    size = len(code.scope.names)
+                    arity = len(code.parameters)
+                    values = cast(List[Optional[Object]], arguments)
+                    if count != arity:
+                        values = (values + [None] * arity)[:arity]
+                    if size > arity:
+                        values.extend([None] * (size - arity))
+
+                    frame = Frame(values,
+                                  code.scope.names,
+                                  function.frame,
+                                  frame.globals)
+                elif type(function) is Builtin:
+                    push(function.fn(*arguments))
+                else:
+                    push(_new_error(_NOT_A_FUNCTION, [function.type().name]))
+            elif opcode == _RETURN_VALUE:
+                value = pop()
+                if not calls:
+                    return value
+
+                del stack[base:]
+                push(value)
+                instructions, constants, names, ip, frame, base = calls.pop()
+                values = frame.values
+            elif opcode == _JUMP_IF_FALSY:
+                condition = pop()
+                if condition is FALSE or condition is NULL:
+                    ip = instructions[ip + 1]
+                else:
+                    ip += 2
+            elif opcode == _JUMP:
+                ip = instructions[ip + 1]
+            elif opcode == _LOOP_IF_TRUTHY:
+                condition = stack[-1]
+                if condition is FALSE or condition is NULL:
+                    pop()
+                    ip += 3
+                elif type(condition) is Error:
+                    ip = instructions[ip + 2]
+                else:
+                    pop()
+                    ip = instructions[ip + 1]
+            elif opcode == _SET_LOCAL:
+                values[instructions[ip + 1]] = pop()
+                ip += 2
+            elif opcode == _ASSIGN_LOCAL:
+                slot = instructions[ip + 1]
+                if values[slot] is not None:
+                    values[slot] = pop()
+                    ip += 3
+                elif frame.assign(frame.names[slot], stack[-1]):
+                    pop()
+                    ip += 3
+                else:
+                    stack[-1] = _new_error(_UNKNOWN_IDENTIFIER,
+                                           [frame.names[slot]])
+                    ip = instructions[ip + 2]
+            elif opcode == _GET_OUTER:
+                outer = frame
+                for _ in range(instructions[ip + 1]):
+                    outer = cast(Frame, outer.outer)
+
+                value = outer.values[instructions[ip + 2]]
+                if value is None:
+                    value = _unbound(outer, instructions[ip + 2])
+                push(value)
+                ip += 3
+            elif opcode == _GET_GLOBAL:
+                name = names[instructions[ip + 1]]
+                ip += 2
+                try:
+                    push(frame.globals[name])
+                except KeyError:
+                    push(BUILTINS.get(name)
+                         or _new_error(_UNKNOWN_IDENTIFIER, [name]))
+            elif opcode == _JUMP_IF_ERROR:
+                if type(stack[-1]) is Error:
+                    ip = instructions[ip + 1]
+                else:
+                    ip += 2
+            elif opcode == _POP:
+                pop()
+                ip += 1
+            elif opcode in _INFIX_OPERATORS:
+                right = pop()
+                left = stack[-1]
+                ip += 1
+
+                if type(left) is Integer and type(right) is Integer:
+                    left_value = left.value
+                    right_value = right.value
+
+                    if opcode == _ADD:
+                        stack[-1] = integer_object(left_value + right_value)
+                    elif opcode == _SUBTRACT:
+                        stack[-1] = integer_object(left_value - right_value)
+                    elif opcode == _LESS_THAN:
+                        stack[-1] = TRUE if left_value < right_value else FALSE
+                    elif opcode == _GREATER_THAN:
+                        stack[-1] = TRUE if left_value > right_value else FALSE
+                    elif opcode == _EQUAL:
+                        stack[-1] = TRUE if left_value == right_value else FALSE
+                    elif opcode == _MULTIPLY:
+                        stack[-1] = integer_object(left_value * right_value)
+                    elif opcode == _DIVIDE:
+                        stack[-1] = integer_object(left_value // right_value)
+                    else:
+                        stack[-1] = TRUE if left_value != right_value else FALSE
+                else:
+                    stack[-1] = _evaluate_infix_expression(
+                        _INFIX_OPERATORS[opcode], left, right)
+            elif opcode == _TRUE:
+                push(TRUE)
+                ip += 1
+            elif opcode == _FALSE:
+                push(FALSE)
+                ip += 1
+            elif opcode == _NULL:
+                push(NULL)
+                ip += 1
+            elif opcode == _FUNCTION:
+                push(Closure(constants[instructions[ip + 1]], frame))
+                ip += 2
+            elif opcode == _BANG:
+                stack[-1] = _evaluate_prefix_expression('!', stack[-1])
+                ip += 1
+            elif opcode == _MINUS:
+                stack[-1] = _evaluate_prefix_expression('-', stack[-1])
+                ip += 1
+            elif opcode == _ASSIGN_OUTER:
+                outer = frame
+                for _ in range(instructions[ip + 1]):
+                    outer = cast(Frame, outer.outer)
+
+                slot = instructions[ip + 2]
+                if outer.values[slot] is not None:
+                    outer.values[slot] = pop()
+                    ip += 4
+                elif outer.assign(outer.names[slot], stack[-1]):
+                    pop()
+                    ip += 4
+                else:
+                    stack[-1] = _new_error(_UNKNOWN_IDENTIFIER,
+                                           [outer.names[slot]])
+                    ip = instructions[ip + 3]
+            elif opcode == _ASSIGN_GLOBAL:
+                name = names[instructions[ip + 1]]
+                if frame.globals.assign(name, stack[-1]):
+                    pop()
+                    ip += 3
+                else:
+                    stack[-1] = _new_error(_UNKNOWN_IDENTIFIER, [name])
+                    ip = instructions[ip + 2]
+            elif opcode == _ARRAY:
+                count = instructions[ip + 1]
+                ip += 2
+                if count:
+                    elements = stack[-count:]
+                    del stack[-count:]
+                else:
+                    elements = []
+                push(Array(Vector(elements)))
+            elif opcode == _HASH:
+                count = 2 * instructions[ip + 1]
+                ip += 2
+                if count:
+                    items = stack[-count:]
+                    del stack[-count:]
+                else:
+                    items = []
+                push(_evaluate_hash_items(items))
+            elif opcode == _INDEX:
+                index = pop()
+                stack[-1] = _evaluate_index_expression(stack[-1], index)
+                ip += 1
+            elif opcode == _RETURN:
+                # Only programs return without a value.
+                return None
+            else:
+                raise ValueError(f'Instrucción desconocida: {opcode}')
+
+
+def _unbound(frame: Frame, slot: int) -> Object:
+    """Look up the variable of an unset slot by name, like an Environment
+    would."""
+    name = frame.names[slot]
+
+    return frame.find(name) or BUILTINS.get(name) \
+        or _new_error(_UNKNOWN_IDENTIFIER, [name])
+
+
+def run(program: Program, env: Environment) -> Optional[Object]:
+    """Compile `program` and run it in `env`."""
+    return VM(compile_program(program), env).run()
@@ -1,11 +1,36 @@
-from lpp.repl import start_repl
+from argparse import ArgumentParser
+
+from lpp.repl import (
+    ENGINES,
+    run_file,
+    start_repl,
+)
 
 
 def main() -> None:
+    argument_parser = ArgumentParser(
+        description='Lenguaje de Programación Platzi.')
+    argument_parser.add_argument('--motor', choices=list(ENGINES),
+                                 default='evaluador',
+                                 help='cómo se ejecutan los programas')
+    argument_parser.add_argument('--optimizar', action='store_true',
+                                 help='simplifica las expresiones constantes '
+                                      'y las ramas que nunca se ejecutan '
+                                      'antes de ejecutar los programas')
+    argument_parser.add_argument('archivo', nargs='?',
+                                 help='programa a ejecutar, sin él se abre '
+                                      'la consola interactiva')
+    arguments = argument_parser.parse_args()
+    engine = ENGINES[arguments.motor]
+
+    if arguments.archivo is not None:
+        run_file(arguments.archivo, engine, arguments.optimizar)
+        return
+
     print('Bienvenido al Lenguaje de Programación Platzi.')
     print('Escribe un comando para comenzar.')
 
-    start_repl()
+    start_repl(engine, arguments.optimizar)
 
 
 if __name__ == '__main__':
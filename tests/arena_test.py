@@ -0,0 +1,116 @@
+from typing import List
+from unittest import TestCase
+
+from lpp.arena import (
+    Arena,
+    NodeKind,
+    parse,
+)
+from lpp.ast import (
+    Program,
+    walk,
+)
+from lpp.evaluator import evaluate
+from lpp.lexer import Lexer
+from lpp.object import (
+    Environment,
+    Integer,
+)
+from lpp.parser import Parser
+
+
+class ArenaTest(TestCase):
+
+    SOURCE: str = '''
+        variable sumador = procedimiento(x) {
+            regresa procedimiento(y) { regresa x + y; };
+        };
+        variable mayor_de_edad = procedimiento(edad) {
+            si (edad > 18) { regresa verdadero; } si_no { regresa !verdadero; }
+        };
+        mayor_de_edad(sumador(5)(-20)) == falso;
+        [sumador, [1, "dos"]][1][0];
+        {"uno": 1, sumador(1)(1): {}}["uno"];
+    '''
+
+    def test_round_trip(self) -> None:
+        program: Program = Parser(Lexer(self.SOURCE)).parse_program()
+        arena: Arena = Arena.from_program(program)
+
+        self.assertEquals(str(arena.to_node(arena.root)), str(program))
+
+    def test_parse(self) -> None:
+        arena, errors = parse(Lexer(self.SOURCE))
+        program: Program = Parser(Lexer(self.SOURCE)).parse_program()
+
+        self.assertEquals(errors, [])
+        self.assertEquals(len(arena), len(list(walk(program))))
+        self.assertEquals(arena.kind(arena.root), NodeKind.PROGRAM)
+        self.assertEquals(str(arena.to_node(arena.root)), str(program))
+
+    def test_parse_errors(self) -> None:
+        arena, errors = parse(Lexer('variable x 5; variable y = 1; variable = 2;'))
+
+        self.assertEquals(len(errors), 3)
+        self.assertEquals(arena.list(arena.root), [])
+
+    def test_walk(self) -> None:
+        arena, _ = parse(Lexer('variable a = -b + 2 * c(d, 1);'))
+
+        kinds: List[NodeKind] = [arena.kind(index) for index in arena.walk()]
+
+        self.assertEquals(kinds, [
+            NodeKind.PROGRAM,
+            NodeKind.LET,
+            NodeKind.IDENTIFIER,
+            NodeKind.INFIX,
+            NodeKind.PREFIX,
+            NodeKind.IDENTIFIER,
+            NodeKind.INFIX,
+            NodeKind.INTEGER,
+            NodeKind.CALL,
+            NodeKind.IDENTIFIER,
+            NodeKind.IDENTIFIER,
+            NodeKind.INTEGER,
+        ])
+
+    def test_serialization(self) -> None:
+        arena, _ = parse(Lexer(self.SOURCE + 'variable s = "año";'))
+
+        loaded: Arena = Arena.from_bytes(arena.to_bytes())
+
+        self.assertEquals([loaded.kind(index) for index in loaded.walk()],
+                          [arena.kind(index) for index in arena.walk()])
+        self.assertEquals(loaded.to_bytes(), arena.to_bytes())
+
+    def test_evaluation(self) -> None:
+        arena, _ = parse(Lexer('''
+            variable sumador = procedimiento(x) {
+                regresa procedimiento(y) { regresa x + y; };
+            };
+            sumador(5)(20);
+        '''))
+
+        evaluated = evaluate(arena.to_node(arena.root), Environment())
+
+        self.assertIsInstance(evaluated, Integer)
+        assert evaluated is not None
+        self.assertEquals(evaluated.inspect(), '25')
+
+    def test_loops(self) -> None:
+        source = '''
+            variable i = 0;
+            mientras (i < 5) { i = i + 1; }
+            i;
+        '''
+        program: Program = Parser(Lexer(source)).parse_program()
+        arena, _ = parse(Lexer(source))
+
+        self.assertIn(NodeKind.WHILE, [arena.kind(index) for index in arena.walk()])
+        self.assertEquals(str(arena.to_node(arena.root)), str(program))
+
+        evaluated = evaluate(arena.to_node(arena.root), Environment())
+
+        self.assertIsInstance(evaluated, Integer)
+        assert evaluated is not None
+        self.assertEquals(evaluated.inspect(), '5')
@@ -1,10 +1,13 @@
 from unittest import TestCase
 
 from lpp.ast import (
+    Function,
     Identifier,
+    Integer,
     LetStatement,
     Program,
     ReturnStatement,
+    walk,
 )
 from lpp.token import (
     Token,
@@ -47,3 +50,22 @@ class ASTTest(TestCase):
 
         self.assertEquals(program_str, 'regresa mi_var;')
 
+
+    def test_walk(self) -> None:
+        name = Identifier(token=Token(TokenType.IDENT, literal='x'), value='x')
+        value = Integer(token=Token(TokenType.INT, literal='5'), value=5)
+        statement = LetStatement(token=Token(TokenType.LET, literal='variable'),
+                                 name=name,
+                                 value=value)
+        program: Program = Program(statements=[statement])
+
+        self.assertEquals(list(walk(program)), [program, statement, name, value])
+
+    def test_nodes_have_no_dict(self) -> None:
+        function = Function(token=Token(TokenType.FUNCTION, literal='procedimiento'))
+
+        self.assertFalse(hasattr(function, '__dict__'))
+        self.assertEquals(function.parameters, ())
+        assert function.token is not None
+        self.assertIs(function.parameters,
+                      Function(token=function.token).parameters)
@@ -0,0 +1,82 @@
+from os import listdir
+from os.path import join
+from tempfile import TemporaryDirectory
+from typing import List
+from unittest import TestCase
+from unittest.mock import patch
+
+from lpp.ast import Program
+from lpp.cache import ProgramCache
+
+
+class ProgramCacheTest(TestCase):
+
+    SOURCE: str = '''
+        variable sumador = procedimiento(x, y) { regresa x + y; };
+        si (sumador(1, 2) > 2) { -sumador(3, 4) } si_no { !verdadero };
+    '''
+
+    def setUp(self) -> None:
+        self._directory = TemporaryDirectory()
+        self._cache = ProgramCache(self._directory.name)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_miss_then_hit(self) -> None:
+        self.assertIsNone(self._cache.load(self.SOURCE))
+
+        program, errors = self._cache.parse(self.SOURCE)
+        self.assertEquals(errors, [])
+        self.assertEquals(len(self._entries()), 1)
+
+        cached = self._cache.load(self.SOURCE)
+        assert cached is not None
+        self.assertEquals(str(cached), str(program))
+
+        with patch('lpp.cache.Parser') as parser:
+            warm, errors = self._cache.parse(self.SOURCE)
+
+        parser.assert_not_called()
+        self.assertEquals(errors, [])
+        self.assertEquals(str(warm), str(program))
+
+    def test_keyed_by_source(self) -> None:
+        self._cache.parse('variable a = 1;')
+        self._cache.parse('variable a = 2;')
+
+        self.assertEquals(len(self._entries()), 2)
+        self.assertIsNone(self._cache.load('variable a = 3;'))
+
+    def test_parse_errors_are_not_cached(self) -> None:
+        program, errors = self._cache.parse('variable = 5;')
+
+        self.assertIsInstance(program, Program)
+        self.assertNotEquals(errors, [])
+        self.assertEquals(self._entries(), [])
+
+    def test_corrupt_entries_are_misses(self) -> None:
+        self._cache.parse(self.SOURCE)
+        entry: str = join(self._directory.name, self._entries()[0])
+        with open(entry, 'rb') as entry_file:
+            truncated: bytes = entry_file.read()[:-10]
+
+        for data in (b'', b'basura', truncated):
+            with open(entry, 'wb') as entry_file:
+                entry_file.write(data)
+
+            self.assertIsNone(self._cache.load(self.SOURCE))
+
+        program, errors = self._cache.parse(self.SOURCE)
+        self.assertEquals(errors, [])
+        self.assertIsNotNone(self._cache.load(self.SOURCE))
+
+    def test_failed_writes_leave_no_files(self) -> None:
+        with patch('lpp.cache.replace', side_effect=OSError):
+            program, errors = self._cache.parse(self.SOURCE)
+
+        self.assertEquals(errors, [])
+        self.assertEquals(self._entries(), [])
+
+    def _entries(self) -> List[str]:
+        return sorted(listdir(self._directory.name))
@@ -0,0 +1,84 @@
+from typing import Optional
+
+from lpp.closures import (
+    CompiledFunction,
+    compile_closures,
+    run,
+)
+from lpp.lexer import Lexer
+from lpp.object import (
+    Environment,
+    Frame,
+    Object,
+)
+from lpp.parser import Parser
+from lpp.resolver import resolve
+from tests import evaluator_test
+
+
+class ClosuresTest(evaluator_test.EvaluatorTest):
+    """Runs every evaluator test on programs compiled to closures."""
+
+    def test_bodies_are_compiled_once(self) -> None:
+        program = Parser(Lexer('''
+            variable sumador = procedimiento(x) {
+                regresa procedimiento(y) { regresa x + y; };
+            };
+            variable suma_dos = sumador(2);
+            variable suma_cinco = sumador(5);
+        ''')).parse_program()
+        resolve(program)
+        assert program.scope is not None
+        names = program.scope.names
+        frame = Frame([None] * len(names), names, None, Environment())
+
+        compile_closures(program)(frame)
+
+        suma_dos = frame.values[names.index('suma_dos')]
+        suma_cinco = frame.values[names.index('suma_cinco')]
+        self.assertIsInstance(suma_dos, CompiledFunction)
+        assert isinstance(suma_dos, CompiledFunction)
+        assert isinstance(suma_cinco, CompiledFunction)
+        self.assertIsNot(suma_dos, suma_cinco)
+        self.assertIs(suma_dos.run, suma_cinco.run)
+
+    def test_closures(self) -> None:
+        evaluated = self._evaluate_tests('''
+            variable sumador = procedimiento(x) {
+                regresa procedimiento(y) { regresa x + y; };
+            };
+            sumador(2)(sumador(5)(20));
+        ''')
+
+        self._test_integer_object(evaluated, 27)
+
+    def test_constant_operands(self) -> None:
+        tests = [
+            ('variable n = 7; n - 1;', 6),
+            ('variable n = 7; n / 2;', 3),
+            ('variable n = 7; si (n > 2) { 1 } si_no { 0 };', 1),
+        ]
+
+        for source, expected in tests:
+            self._test_integer_object(self._evaluate_tests(source), expected)
+
+        self._test_error_object(self._evaluate_tests('verdadero - 1;'),
+                                'Discrepancia de tipos: BOOLEAN - INTEGER')
+
+    def test_names_read_before_their_variable(self) -> None:
+        evaluated = self._evaluate_tests('''
+            variable a = 1;
+            variable f = procedimiento() {
+                variable b = a;
+                variable a = 2;
+                b + a;
+            };
+            f();
+        ''')
+
+        self._test_integer_object(evaluated, 3)
+
+    def _evaluate(self, source: str) -> Optional[Object]:
+        program = Parser(Lexer(source)).parse_program()
+
+        return run(program, Environment())
@@ -0,0 +1,149 @@
+from typing import (
+    List,
+    cast,
+)
+from unittest import TestCase
+
+from lpp.compiler import (
+    Opcode,
+    compile_program,
+    disassemble,
+)
+from lpp.lexer import Lexer
+from lpp.object import Integer
+from lpp.parser import Parser
+
+
+class CompilerTest(TestCase):
+
+    def test_instructions(self) -> None:
+        code = compile_program(Parser(Lexer('''
+            variable a = 1 + 2;
+            si (a > 1) { a } si_no { -a };
+        ''')).parse_program())
+
+        expected: List[str] = [
+            '0000 CONSTANT 0',
+            '0002 CONSTANT 1',
+            '0004 ADD',
+            '0005 SET_LOCAL 0',
+            '0007 GET_LOCAL 0',
+            '0009 CONSTANT 0',
+            '0011 GREATER_THAN',
+            '0012 JUMP_IF_FALSY 18',
+            '0014 GET_LOCAL 0',
+            '0016 JUMP 21',
+            '0018 GET_LOCAL 0',
+            '0020 MINUS',
+            '0021 RETURN_VALUE',
+        ]
+
+        self.assertEquals(disassemble(code), expected)
+        self.assertEquals([cast(Integer, constant).inspect()
+                           for constant in code.constants],
+                          ['1', '2'])
+
+    def test_arrays(self) -> None:
+        code = compile_program(Parser(Lexer(
+            '[1, 2, 1 + 2][0];'
+        )).parse_program())
+
+        self.assertEquals(disassemble(code), [
+            '0000 CONSTANT 0',
+            '0002 CONSTANT 1',
+            '0004 CONSTANT 0',
+            '0006 CONSTANT 1',
+            '0008 ADD',
+            '0009 ARRAY 3',
+            '0011 CONSTANT 2',
+            '0013 INDEX',
+            '0014 RETURN_VALUE',
+        ])
+
+    def test_hashes(self) -> None:
+        code = compile_program(Parser(Lexer(
+            '{1: 2, 2: 1 + 2}[1];'
+        )).parse_program())
+
+        self.assertEquals(disassemble(code), [
+            '0000 CONSTANT 0',
+            '0002 CONSTANT 1',
+            '0004 CONSTANT 1',
+            '0006 CONSTANT 0',
+            '0008 CONSTANT 1',
+            '0010 ADD',
+            '0011 HASH 2',
+            '0013 CONSTANT 0',
+            '0015 INDEX',
+            '0016 RETURN_VALUE',
+        ])
+
+    def test_functions(self) -> None:
+        code = compile_program(Parser(Lexer(
+            'procedimiento(x, y) { variable z = x; }'
+        )).parse_program())
+
+        self.assertEquals(code.instructions[0], Opcode.FUNCTION)
+        function = code.constants[code.instructions[1]]
+        self.assertEquals(function.scope.names, ('x', 'y', 'z'))
+        self.assertEquals(function.names, [])
+        self.assertEquals(disassemble(function), [
+            '0000 GET_LOCAL 0',
+            '0002 SET_LOCAL 2',
+            '0004 NULL',
+            '0005 RETURN_VALUE',
+        ])
+
+    def test_outer_and_global_names(self) -> None:
+        code = compile_program(Parser(Lexer('''
+            variable a = 1;
+            procedimiento(x) { procedimiento() { a + x + longitud } };
+        ''')).parse_program())
+
+        outer = code.constants[code.instructions[5]]
+        inner = outer.constants[outer.instructions[1]]
+        self.assertEquals(disassemble(inner), [
+            '0000 GET_OUTER 2 0',
+            '0003 GET_OUTER 1 0',
+            '0006 ADD',
+            '0007 GET_GLOBAL 0',
+            '0009 ADD',
+            '0010 RETURN_VALUE',
+        ])
+        self.assertEquals(inner.names, ['longitud'])
+
+    def test_tail_calls(self) -> None:
+        code = compile_program(Parser(Lexer('''
+            procedimiento(f) { regresa f(1); }
+        ''')).parse_program())
+
+        function = code.constants[code.instructions[1]]
+        self.assertEquals(disassemble(function), [
+            '0000 GET_LOCAL 0',
+            '0002 CONSTANT 0',
+            '0004 TAIL_CALL 1',
+            '0006 RETURN_VALUE',
+            '0007 RETURN_VALUE',
+        ])
+
+    def test_loops(self) -> None:
+        code = compile_program(Parser(Lexer('''
+            variable i = 0;
+            mientras (i < 10) { i = i + 1; }
+        ''')).parse_program())
+
+        self.assertEquals(disassemble(code), [
+            '0000 CONSTANT 0',
+            '0002 SET_LOCAL 0',
+            '0004 JUMP 14',
+            '0006 GET_LOCAL 0',
+            '0008 CONSTANT 1',
+            '0010 ADD',
+            '0011 ASSIGN_LOCAL 0 23',
+            '0014 GET_LOCAL 0',
+            '0016 CONSTANT 2',
+            '0018 LESS_THAN',
+            '0019 LOOP_IF_TRUTHY 6 23',
+            '0022 RETURN',
+            '0023 RETURN_VALUE',
+        ])
@@ -8,21 +8,29 @@ from typing import (
 )
 from unittest import TestCase
 
+import lpp.ast as ast
 from lpp.evaluator import (
     evaluate,
     NULL,
+    register,
 )
 from lpp.lexer import Lexer
 from lpp.object import (
+    Array,
     Boolean,
     Environment,
     Error,
     Function,
+    Hash,
     Integer,
     Object,
     String,
 )
 from lpp.parser import Parser
+from lpp.token import (
+    Token,
+    TokenType,
+)
 
 
 class EvaluatorTest(TestCase):
@@ -107,6 +115,50 @@ class EvaluatorTest(TestCase):
             else:
                 self._test_null_object(evaluated)
 
+    def test_branches_without_value(self) -> None:
+        tests: List[str] = [
+            'si (verdadero) {};',
+            'si (falso) {} si_no {};',
+            'si (verdadero) { variable a = 1; }',
+            'si (verdadero) { si (falso) { 1 } si_no {} }',
+        ]
+
+        for source in tests:
+            self.assertIsNone(self._evaluate(source))
+
+        self._test_null_object(self._evaluate_tests('si (falso) {};'))
+        self._test_integer_object(self._evaluate_tests('si (verdadero) {}; 5;'), 5)
+
+    def test_branches_without_value_as_values(self) -> None:
+        tests: List[Tuple[str, str]] = [
+            ('1 + si (verdadero) { };',
+             'Discrepancia de tipos: INTEGER + NULL'),
+            ('-si (verdadero) { variable x = 1; };',
+             'Operador desconocido: -NULL'),
+            ('si (falso) { 1 } si_no { } (2);',
+             'No es una función: NULL'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_error_object(evaluated, expected)
+
+        tests_with_null: List[str] = [
+            'variable a = si (verdadero) {}; a;',
+            'variable a = 1; a = si (verdadero) { si (falso) { 2 } }; a;',
+            'variable f = procedimiento() { regresa si (falso) { 1 }; }; f();',
+        ]
+
+        for source in tests_with_null:
+            self._test_null_object(self._evaluate_tests(source))
+
+        evaluated = self._evaluate_tests('''
+            variable i = 0;
+            mientras (si (i < 3) { i = i + 1; }) {}
+            [i, si (verdadero) { variable a = 1; }];
+        ''')
+        self.assertEquals(evaluated.inspect(), '[1, nulo]')
+
     def test_return_evaluation(self) -> None:
         tests: List[Tuple[str, Any]] = [
             ('regresa 10;', 10),
@@ -128,6 +180,37 @@ class EvaluatorTest(TestCase):
             evaluated = self._evaluate_tests(source)
             self._test_integer_object(evaluated, expected)
 
+    def test_return_from_expressions(self) -> None:
+        tests: List[Tuple[str, int]] = [
+            ('''
+                variable f = procedimiento() {
+                    variable x = si (verdadero) { regresa 1; };
+                    2
+                };
+                f();
+            ''', 1),
+            ('''
+                variable f = procedimiento() {
+                    1 + si (verdadero) { regresa 1; }
+                };
+                f() + 5;
+            ''', 6),
+            ('''
+                variable f = procedimiento(n) {
+                    mientras (si (n > 2) { regresa n; } si_no { verdadero }) {
+                        n = n + 1;
+                    }
+                };
+                f(0);
+            ''', 3),
+            ('variable x = si (verdadero) { regresa 4; }; 2;', 4),
+            ('[1, si (verdadero) { regresa 5; }]; 2;', 5),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_integer_object(evaluated, expected)
+
     def test_error_handling(self) -> None:
         tests: List[Tuple[str, str]] = [
             ('5 + verdadero',
@@ -234,6 +317,298 @@ class EvaluatorTest(TestCase):
             evaluated = self._evaluate_tests(source)
             self._test_integer_object(evaluated, expected)
 
+    def test_functions_without_value(self) -> None:
+        tests: List[str] = [
+            'variable f = procedimiento() { variable a = 1; }; variable x = f(); x;',
+            'variable f = procedimiento() {}; f();',
+            'variable f = procedimiento() { mientras (falso) {} }; f();',
+            'variable f = procedimiento() { si (verdadero) {} }; f();',
+        ]
+
+        for source in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_null_object(evaluated)
+
+        evaluated = self._evaluate_tests(
+            'variable f = procedimiento() {}; [f()];')
+        self.assertEquals(evaluated.inspect(), '[nulo]')
+
+    def test_argument_order(self) -> None:
+        evaluated = self._evaluate_tests('''
+            variable resta = procedimiento(x, y, z) { x - y - z };
+            resta(10, 3, 2);
+        ''')
+
+        self._test_integer_object(evaluated, 5)
+
+    def test_missing_arguments(self) -> None:
+        evaluated = self._evaluate_tests('''
+            variable f = procedimiento(a, b) { a };
+            f(1);
+        ''')
+        self._test_integer_object(evaluated, 1)
+
+        evaluated = self._evaluate_tests('''
+            variable f = procedimiento(a) { a };
+            f();
+        ''')
+        self._test_error_object(evaluated, 'Identificador no encontrado: a')
+
+    def test_repeated_parameters(self) -> None:
+        tests: List[Tuple[str, int]] = [
+            ('variable f = procedimiento(x, x) { x }; f(1, 2);', 2),
+            ('variable f = procedimiento(x, y, x) { x - y }; f(1, 2, 5);', 3),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_integer_object(evaluated, expected)
+
+    def test_nested_calls(self) -> None:
+        tests: List[Tuple[str, int]] = [
+            ('''
+                variable f = procedimiento(n) {
+                    si (n == 0) { 0 } si_no { 1 + f(n - 1) }
+                };
+                f(100);
+            ''', 100),
+            ('''
+                variable f = procedimiento(n) {
+                    si (n == 0) { regresa 0; }
+                    regresa 1 + f(n - 1);
+                };
+                f(150);
+            ''', 150),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_integer_object(evaluated, expected)
+
+    def test_tail_calls(self) -> None:
+        tests: List[Tuple[str, Union[int, str]]] = [
+            ('''
+                variable contar = procedimiento(n, acc) {
+                    si (n == 0) { regresa acc; }
+                    regresa contar(n - 1, acc + n);
+                };
+                contar(5000, 0);
+             ''', 12502500),
+            ('''
+                variable f = procedimiento(n) {
+                    si (n > 0) { regresa f(n - 1); } si_no { regresa longitud("abc"); }
+                };
+                f(2000);
+             ''', 3),
+            ('''
+                variable f = procedimiento() { regresa 5(1); };
+                f();
+             ''', 'No es una función: INTEGER'),
+            ('''
+                variable f = procedimiento(n) { regresa n(); };
+                f(procedimiento() { 7 });
+             ''', 7),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            if type(expected) == int:
+                expected = cast(int, expected)
+                self._test_integer_object(evaluated, expected)
+            else:
+                expected = cast(str, expected)
+                self._test_error_object(evaluated, expected)
+
+    def test_mutual_tail_calls(self) -> None:
+        evaluated = self._evaluate_tests('''
+            variable es_par = procedimiento(n) {
+                si (n == 0) { regresa verdadero; }
+                regresa es_impar(n - 1);
+            };
+            variable es_impar = procedimiento(n) {
+                si (n == 0) { regresa falso; }
+                regresa es_par(n - 1);
+            };
+            es_par(5001);
+        ''')
+
+        self._test_boolean_object(evaluated, False)
+
+    def test_while_loops(self) -> None:
+        tests: List[Tuple[str, int]] = [
+            ('variable i = 0; mientras (i < 10) { i = i + 1; } i;', 10),
+            ('variable i = 5; mientras (i < 3) { i = i + 1; } i;', 5),
+            ('''
+                variable suma = procedimiento(n) {
+                    variable total = 0;
+                    mientras (n > 0) {
+                        total = total + n;
+                        n = n - 1;
+                    }
+                    total
+                };
+                suma(100);
+            ''', 5050),
+            ('''
+                variable fibonacci = procedimiento(n) {
+                    variable a = 0;
+                    variable b = 1;
+                    mientras (n > 0) {
+                        variable siguiente = a + b;
+                        a = b;
+                        b = siguiente;
+                        n = n - 1;
+                    }
+                    a
+                };
+                fibonacci(30);
+            ''', 832040),
+            ('''
+                variable primero_mayor = procedimiento(n) {
+                    variable i = 0;
+                    mientras (verdadero) {
+                        si (i * i > n) { regresa i; }
+                        i = i + 1;
+                    }
+                };
+                primero_mayor(50);
+            ''', 8),
+            ('''
+                variable i = 0;
+                variable j = 0;
+                mientras (i < 3) {
+                    variable k = 0;
+                    mientras (k < 4) { k = k + 1; j = j + 1; }
+                    i = i + 1;
+                }
+                j;
+            ''', 12),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_integer_object(evaluated, expected)
+
+    def test_reassignment(self) -> None:
+        tests: List[Tuple[str, int]] = [
+            ('variable a = 1; a = a + 1; a;', 2),
+            ('''
+                variable contador = 0;
+                variable incrementa = procedimiento() {
+                    contador = contador + 1;
+                };
+                incrementa();
+                incrementa();
+                contador;
+            ''', 2),
+            ('''
+                variable nuevo_contador = procedimiento() {
+                    variable n = 0;
+                    procedimiento() { n = n + 1; n }
+                };
+                variable contador = nuevo_contador();
+                contador();
+                contador();
+                contador();
+            ''', 3),
+            ('''
+                variable a = 1;
+                variable f = procedimiento(a) { a = 5; a };
+                f(2) + a;
+            ''', 6),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_integer_object(evaluated, expected)
+
+    def test_variables_before_definition(self) -> None:
+        tests: List[Tuple[str, int]] = [
+            ('''
+                variable a = 1;
+                variable f = procedimiento() {
+                    variable b = a;
+                    variable a = 2;
+                    b
+                };
+                f();
+            ''', 1),
+            ('''
+                variable a = 1;
+                variable f = procedimiento() { a = 3; variable a = 2; a };
+                f() + a;
+            ''', 5),
+            ('''
+                variable f = procedimiento() { g() };
+                variable g = procedimiento() { 7 };
+                f();
+            ''', 7),
+            ('''
+                variable i = 0;
+                variable suma = 0;
+                mientras (i < 3) {
+                    si (i > 0) { suma = suma + x; }
+                    variable x = i;
+                    i = i + 1;
+                }
+                suma;
+            ''', 1),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_integer_object(evaluated, expected)
+
+        error_tests: List[str] = [
+            'variable a = a; a;',
+            'variable f = procedimiento() { variable b = a; variable a = 2; b }; f();',
+            'variable f = procedimiento() { a = 3; variable a = 2; a }; f();',
+            'si (falso) { variable a = 1; } a;',
+        ]
+
+        for source in error_tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_error_object(evaluated, 'Identificador no encontrado: a')
+
+    def test_loop_errors(self) -> None:
+        tests: List[Tuple[str, str]] = [
+            ('mientras (x) { 1; }', 'Identificador no encontrado: x'),
+            ('mientras (verdadero) { 1 + verdadero; 2; }',
+             'Discrepancia de tipos: INTEGER + BOOLEAN'),
+            ('a = 1;', 'Identificador no encontrado: a'),
+            ('variable i = 0; mientras (i < 3) { i = i + 1; z = i; } i;',
+             'Identificador no encontrado: z'),
+            ('''
+                variable f = procedimiento() {
+                    variable i = 0;
+                    mientras (i < 3) { i = i + 1; i + "1"; }
+                };
+                f();
+                5;
+            ''', 'Discrepancia de tipos: INTEGER + STRING'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_error_object(evaluated, expected)
+
+    def test_errors_stop_their_block(self) -> None:
+        tests: List[Tuple[str, int]] = [
+            ('variable x = si (verdadero) { z = 1; 2 } si_no { 3 }; 5;', 5),
+            ('''
+                variable i = 0;
+                variable x = si (verdadero) {
+                    mientras (i < 3) { i = i + 1; z = i; }
+                    2
+                } si_no { 3 };
+                i;
+            ''', 1),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+            self._test_integer_object(evaluated, expected)
+
     def test_string_evaluation(self) -> None:
         tests: List[Tuple[str, str]] = [
             ('"Hello world!"', 'Hello world!'),
@@ -274,6 +649,44 @@ class EvaluatorTest(TestCase):
             evaluated = self._evaluate_tests(source)
             self._test_boolean_object(evaluated, expected)
 
+    def test_long_string_concatenation(self) -> None:
+        line = 'x' * 99 + '.'
+        build = f'''
+            variable repite = procedimiento(texto, veces) {{
+                variable resultado = "";
+                mientras (veces > 0) {{
+                    resultado = resultado + texto;
+                    veces = veces - 1;
+                }}
+                resultado
+            }};
+            variable largo = repite("{line}", 30);
+        '''
+        tests: List[Tuple[str, Union[str, int, bool]]] = [
+            ('largo;', line * 30),
+            ('largo + largo;', line * 60),
+            ('longitud(largo);', 3000),
+            ('longitud(largo + "!");', 3001),
+            (f'largo == repite("{line}", 30);', True),
+            (f'largo == repite("{line}", 29);', False),
+            ('largo + "a" != largo + "b";', True),
+            (f'largo == "{line}" + repite("{line}", 29);', True),
+            (f'{{largo: 1}}[repite("{line}", 30)];', 1),
+            ('contiene({largo: 1}, largo + "");', True),
+            ('variable a = largo + "a"; variable b = largo + "b"; '
+             'longitud(a) + longitud(b);', 6002),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(build + source)
+
+            if type(expected) == bool:
+                self._test_boolean_object(evaluated, cast(bool, expected))
+            elif type(expected) == int:
+                self._test_integer_object(evaluated, cast(int, expected))
+            else:
+                self._test_string_object(evaluated, cast(str, expected))
+
     def test_builtin_functions(self) -> None:
         tests: List[Tuple[str, Union[str, int]]] = [
             ('longitud("");', 0),
@@ -295,13 +708,238 @@ class EvaluatorTest(TestCase):
                 expected = cast(str, expected)
                 self._test_error_object(evaluated, expected)
 
-    def _evaluate_tests(self, source: str) -> Object:
+    def test_array_literals(self) -> None:
+        tests: List[Tuple[str, str]] = [
+            ('[];', '[]'),
+            ('[1, 2 * 2, 3 + 3];', '[1, 4, 6]'),
+            ('["a", verdadero, [1]];', '[a, verdadero, [1]]'),
+            ('variable x = 2; [x, procedimiento(y) { x + y }(3)];', '[2, 5]'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+
+            self.assertIsInstance(evaluated, Array)
+            self.assertEquals(evaluated.inspect(), expected)
+
+    def test_array_indexing(self) -> None:
+        tests: List[Tuple[str, Any]] = [
+            ('[1, 2, 3][0];', 1),
+            ('[1, 2, 3][1];', 2),
+            ('[1, 2, 3][1 + 1];', 3),
+            ('variable i = 0; [1][i];', 1),
+            ('variable a = [1, 2, 3]; a[0] + a[1] + a[2];', 6),
+            ('variable a = [1, 2, 3]; variable i = a[0]; a[i];', 2),
+            ('[[1, 2], [3]][0][1];', 2),
+            ('[procedimiento(x) { x * 2 }][0](4);', 8),
+            ('[1, 2, 3][3];', None),
+            ('[1, 2, 3][-1];', None),
+            ('[][0];', None),
+            ('1[0];', 'Índice sin soporte: INTEGER[INTEGER]'),
+            ('[1]["a"];', 'Índice sin soporte: ARRAY[STRING]'),
+            ('[1][verdadero];', 'Índice sin soporte: ARRAY[BOOLEAN]'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+
+            if type(expected) == int:
+                self._test_integer_object(evaluated, expected)
+            elif expected is None:
+                self._test_null_object(evaluated)
+            else:
+                self._test_error_object(evaluated, expected)
+
+    def test_array_builtins(self) -> None:
+        tests: List[Tuple[str, str]] = [
+            ('longitud([]);', '0'),
+            ('longitud([1, 2, 3]);', '3'),
+            ('primero([1, 2, 3]);', '1'),
+            ('primero([]);', 'nulo'),
+            ('ultimo([1, 2, 3]);', '3'),
+            ('ultimo([]);', 'nulo'),
+            ('agregar([], 1);', '[1]'),
+            ('agregar([1, 2], [3]);', '[1, 2, [3]]'),
+            ('''
+                variable a = [1];
+                variable b = agregar(a, 2);
+                variable c = agregar(a, 3);
+                variable d = agregar(b, 4);
+                [a, b, c, d, longitud(a), longitud(d)];
+             ''', '[[1], [1, 2], [1, 3], [1, 2, 4], 1, 3]'),
+            ('''
+                variable a = [];
+                variable i = 0;
+                mientras (i < 4) {
+                    a = agregar(a, i * i);
+                    i = i + 1;
+                }
+                a;
+             ''', '[0, 1, 4, 9]'),
+            ('primero(1);',
+             'Error: argumento para primero sin soporte, se recibió INTEGER'),
+            ('ultimo("a");',
+             'Error: argumento para ultimo sin soporte, se recibió STRING'),
+            ('agregar(1, 1);',
+             'Error: argumento para agregar sin soporte, se recibió INTEGER'),
+            ('primero([1], [2]);',
+             'Error: número incorrecto de argumentos para primero, se '
+             'recibieron 2, se requieren 1'),
+            ('agregar([1]);',
+             'Error: número incorrecto de argumentos para agregar, se '
+             'recibieron 1, se requieren 2'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+
+            self.assertEquals(evaluated.inspect(), expected)
+
+    def test_hash_literals(self) -> None:
+        tests: List[Tuple[str, str]] = [
+            ('{};', '{}'),
+            ('{"uno": 1, "dos": 1 + 1};', '{uno: 1, dos: 2}'),
+            ('{1: "uno", verdadero: [1], falso: {}};',
+             '{1: uno, verdadero: [1], falso: {}}'),
+            ('{"a": 1, "b": 2, "a": 3};', '{a: 3, b: 2}'),
+            ('variable x = "x"; {x + x: procedimiento() { x }()};', '{xx: x}'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+
+            self.assertIsInstance(evaluated, Hash)
+            self.assertEquals(evaluated.inspect(), expected)
+
+        tests = [
+            ('{[1]: 1};', 'Llave sin soporte: ARRAY'),
+            ('{"a": 1, procedimiento(x) { x }: 2};',
+             'Llave sin soporte: FUNCTION'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+
+            self._test_error_object(evaluated, expected)
+
+    def test_hash_indexing(self) -> None:
+        tests: List[Tuple[str, Any]] = [
+            ('{"a": 5}["a"];', 5),
+            ('{"a": 5}["b"];', None),
+            ('variable llave = "a"; {"a": 5}[llave];', 5),
+            ('{}["a"];', None),
+            ('{5: 5}[5];', 5),
+            ('{5: 5}[2 + 3];', 5),
+            ('{1: 5}[verdadero];', None),
+            ('{verdadero: 5}[verdadero];', 5),
+            ('{falso: 5}[1 > 2];', 5),
+            ('{"a" + "b": 5}["ab"];', 5),
+            ('{"x": {"y": 5}}["x"]["y"];', 5),
+            ('{"f": procedimiento(x) { x * 2 }}["f"](3);', 6),
+            ('{"a": 5}[[1]];', 'Llave sin soporte: ARRAY'),
+            ('{"a": 5}[procedimiento(x) { x }];',
+             'Llave sin soporte: FUNCTION'),
+            ('"a"["a"];', 'Índice sin soporte: STRING[STRING]'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+
+            if type(expected) == int:
+                self._test_integer_object(evaluated, expected)
+            elif expected is None:
+                self._test_null_object(evaluated)
+            else:
+                self._test_error_object(evaluated, expected)
+
+    def test_hash_builtins(self) -> None:
+        tests: List[Tuple[str, str]] = [
+            ('llaves({});', '[]'),
+            ('llaves({"a": 1, 2: 3, falso: 4});', '[a, 2, falso]'),
+            ('valores({"a": 1, 2: 3, falso: 4});', '[1, 3, 4]'),
+            ('longitud({"a": 1, "b": 2});', '2'),
+            ('contiene({"a": 1}, "a");', 'verdadero'),
+            ('contiene({"a": 1}, "b");', 'falso'),
+            ('contiene({1: 1}, verdadero);', 'falso'),
+            ('agregar({}, "a", 1);', '{a: 1}'),
+            ('agregar({"a": 1, "b": 2}, "a", 3);', '{a: 3, b: 2}'),
+            ('''
+                variable h = {"a": 1};
+                variable i = agregar(h, "b", 2);
+                variable j = agregar(h, "a", 3);
+                [h, i, j];
+             ''', '[{a: 1}, {a: 1, b: 2}, {a: 3}]'),
+            ('''
+                variable cuadrados = {};
+                variable i = 0;
+                mientras (i < 4) {
+                    cuadrados = agregar(cuadrados, i, i * i);
+                    i = i + 1;
+                }
+                [cuadrados[3], longitud(cuadrados)];
+             ''', '[9, 4]'),
+            ('agregar({}, [], 1);',
+             'Error: argumento para agregar sin soporte, se recibió ARRAY'),
+            ('agregar({}, "a");',
+             'Error: número incorrecto de argumentos para agregar, se '
+             'recibieron 2, se requieren 3'),
+            ('''
+                variable h = {"a": 1, "b": 2};
+                variable suma = 0;
+                variable l = llaves(h);
+                variable i = 0;
+                mientras (i < longitud(l)) {
+                    suma = suma + h[l[i]];
+                    i = i + 1;
+                }
+                suma;
+             ''', '3'),
+            ('llaves([]);',
+             'Error: argumento para llaves sin soporte, se recibió ARRAY'),
+            ('valores(1);',
+             'Error: argumento para valores sin soporte, se recibió INTEGER'),
+            ('contiene([], 1);',
+             'Error: argumento para contiene sin soporte, se recibió ARRAY'),
+            ('contiene({}, []);',
+             'Error: argumento para contiene sin soporte, se recibió ARRAY'),
+            ('contiene({});',
+             'Error: número incorrecto de argumentos para contiene, se '
+             'recibieron 1, se requieren 2'),
+            ('llaves({}, {});',
+             'Error: número incorrecto de argumentos para llaves, se '
+             'recibieron 2, se requieren 1'),
+        ]
+
+        for source, expected in tests:
+            evaluated = self._evaluate_tests(source)
+
+            self.assertEquals(evaluated.inspect(), expected)
+
+    def test_small_integers_are_shared(self) -> None:
+        tests: List[Tuple[str, str]] = [
+            ('1 + 1', '4 / 2'),
+            ('-5', '5 - 10'),
+            ('256', '16 * 16'),
+            ('longitud("dos")', '6 - 3'),
+        ]
+
+        for source, same in tests:
+            self.assertIs(self._evaluate_tests(source),
+                          self._evaluate_tests(same))
+
+        evaluated = self._evaluate_tests('1000 * 1000')
+        self._test_integer_object(evaluated, 1000000)
+
+    def _evaluate(self, source: str) -> Optional[Object]:
         lexer: Lexer = Lexer(source)
         parser: Parser = Parser(lexer)
         program = parser.parse_program()
         env = Environment()
 
-        evaluated = evaluate(program, env)
+        return evaluate(program, env)
+
+    def _evaluate_tests(self, source: str) -> Object:
+        evaluated = self._evaluate(source)
 
         assert evaluated is not None
         return evaluated
@@ -333,3 +971,52 @@ class EvaluatorTest(TestCase):
         evaluated = cast(String, evaluated)
         self.assertEquals(evaluated.value, expected)
 
+
+
+class Twice(ast.Expression):
+    """Node the parser doesn't know, for embedders to evaluate."""
+
+    __slots__ = ('value',)
+
+    def __init__(self, token: Token, value: ast.Expression) -> None:
+        super().__init__(token)
+        self.value = value
+
+    def __str__(self) -> str:
+        return f'doble({str(self.value)})'
+
+
+class HandlerTest(TestCase):
+
+    def test_register(self) -> None:
+        program = Parser(Lexer('2 + 3;')).parse_program()
+        statement = cast(ast.ExpressionStatement, program.statements[0])
+        assert statement.expression is not None
+        token = Token(TokenType.IDENT, 'doble')
+        statement.expression = Twice(token, statement.expression)
+
+        self.assertIsNone(evaluate(program, Environment()))
+
+        def evaluate_twice(node: ast.ASTNode, env: Environment) -> Object:
+            value = evaluate(cast(Twice, node).value, env)
+
+            assert isinstance(value, Integer)
+            return Integer(value.value * 2)
+
+        register(Twice, evaluate_twice)
+        evaluated = evaluate(program, Environment())
+
+        self.assertIsInstance(evaluated, Integer)
+        self.assertEquals(cast(Integer, evaluated).value, 10)
+
+    def test_integer_literals(self) -> None:
+        program = Parser(Lexer('1000;')).parse_program()
+        statement = cast(ast.ExpressionStatement, program.statements[0])
+        literal = cast(ast.Integer, statement.expression)
+
+        first = evaluate(program, Environment())
+        second = evaluate(program, Environment())
+
+        self.assertIs(first, second)
+        self.assertIs(literal.object, first)
+        self.assertEquals(ast.children(literal), [])
@@ -0,0 +1,64 @@
+from typing import (
+    List,
+    Tuple,
+)
+from unittest import TestCase
+
+from lpp.ast import Program
+from lpp.incremental import IncrementalParser
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+
+
+class IncrementalParserTest(TestCase):
+
+    def test_initial_parse(self) -> None:
+        source: str = 'variable x = 5; variable y = x + 1; y;'
+        parser: IncrementalParser = IncrementalParser(source)
+
+        self._test_same_as_full_parse(parser)
+        self.assertEquals(len(parser.program.statements), 3)
+
+    def test_edits(self) -> None:
+        source: str = '''
+            variable x = 5;
+            variable y = 10;
+            si (x > y) { x } si_no { y };
+            variable z = x * y;
+        '''
+        tests: List[Tuple[str, str]] = [
+            ('10', '20'),
+            ('variable y', 'variable año'),
+            (' si_no ', ' sino '),
+            ('x * y', 'x - y'),
+            ('x = 5;', 'x = 5'),
+            (';\n            variable z', ' + z'),
+        ]
+
+        for old, new in tests:
+            parser: IncrementalParser = IncrementalParser(source)
+            offset = source.index(old)
+
+            parser.edit(offset, len(old), new)
+
+            self.assertEquals(parser.source, source.replace(old, new))
+            self._test_same_as_full_parse(parser)
+
+    def test_unchanged_statements_are_reused(self) -> None:
+        source: str = ''.join(f'variable x{i} = {i};\n' for i in range(100))
+        parser: IncrementalParser = IncrementalParser(source)
+        before = parser.program.statements
+
+        offset = source.index('50;')
+        after = parser.edit(offset, 2, '500').statements
+
+        self.assertEquals(str(after[50]), 'variable x50 = 500;')
+        reused = [index for index in range(100) if after[index] is before[index]]
+        self.assertEquals(reused, [*range(49), *range(51, 100)])
+
+    def _test_same_as_full_parse(self, parser: IncrementalParser) -> None:
+        full_parser: Parser = Parser(Lexer(parser.source))
+        program: Program = full_parser.parse_program()
+
+        self.assertEquals(str(parser.program), str(program))
+        self.assertEquals(parser.errors, full_parser.errors)
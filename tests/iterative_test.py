@@ -0,0 +1,52 @@
+from typing import Optional
+
+from lpp.iterative import evaluate
+from lpp.lexer import Lexer
+from lpp.object import (
+    Environment,
+    Object,
+)
+from lpp.parser import Parser
+from tests import evaluator_test
+
+
+class IterativeTest(evaluator_test.EvaluatorTest):
+    """Runs every evaluator test without recursion."""
+
+    def test_deep_recursion(self) -> None:
+        evaluated = self._evaluate_tests('''
+            variable cuenta = procedimiento(n) {
+                si (n == 0) { regresa 0; }
+                regresa 1 + cuenta(n - 1);
+            };
+            cuenta(20000);
+        ''')
+
+        self._test_integer_object(evaluated, 20000)
+
+    def test_errors_stop_blocks(self) -> None:
+        evaluated = self._evaluate_tests('''
+            variable f = procedimiento() {
+                si (verdadero) { -falso; 1; }
+                2;
+            };
+            f();
+        ''')
+
+        self._test_error_object(evaluated, 'Operador desconocido: -BOOLEAN')
+
+    def test_returns_leave_nested_blocks(self) -> None:
+        evaluated = self._evaluate_tests('''
+            variable f = procedimiento(x) {
+                si (x > 1) { si (x > 2) { regresa 3; } 4; }
+                5;
+            };
+            f(3) + f(2) * 10 + f(1) * 100;
+        ''')
+
+        self._test_integer_object(evaluated, 553)
+
+    def _evaluate(self, source: str) -> Optional[Object]:
+        program = Parser(Lexer(source)).parse_program()
+
+        return evaluate(program, Environment())
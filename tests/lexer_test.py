@@ -1,11 +1,25 @@
+from io import StringIO
+from os import path
+from tempfile import TemporaryDirectory
+from tracemalloc import (
+    get_traced_memory,
+    start,
+    stop,
+)
+from mmap import mmap
 from unittest import TestCase
+from unittest.mock import patch
 from typing import List
 
 from lpp.token import (
     Token,
     TokenType,
 )
-from lpp.lexer import Lexer
+from lpp.lexer import (
+    Lexer,
+    TokenBuffer,
+    tokenize,
+)
 
 
 class LexerTest(TestCase):
@@ -63,7 +77,7 @@ class LexerTest(TestCase):
         self.assertEquals(tokens, expected_tokens)
 
     def test_delimiters(self) -> None:
-        source: str = '(){},;'
+        source: str = '(){}[],:;'
         lexer: Lexer = Lexer(source)
 
         tokens: List[Token] = []
@@ -75,7 +89,10 @@ class LexerTest(TestCase):
             Token(TokenType.RPAREN, ')'),
             Token(TokenType.LBRACE, '{'),
             Token(TokenType.RBRACE, '}'),
+            Token(TokenType.LBRACKET, '['),
+            Token(TokenType.RBRACKET, ']'),
             Token(TokenType.COMMA, ','),
+            Token(TokenType.COLON, ':'),
             Token(TokenType.SEMICOLON, ';'),
         ]
 
@@ -191,6 +208,33 @@ class LexerTest(TestCase):
 
         self.assertEquals(tokens, expected_tokens)
 
+    def test_loop(self) -> None:
+        source: str = 'mientras (i < 3) { i = i + 1; }'
+        lexer: Lexer = Lexer(source)
+
+        tokens: List[Token] = []
+        for i in range(14):
+            tokens.append(lexer.next_token())
+
+        expected_tokens: List[Token] = [
+            Token(TokenType.WHILE, 'mientras'),
+            Token(TokenType.LPAREN, '('),
+            Token(TokenType.IDENT, 'i'),
+            Token(TokenType.LT, '<'),
+            Token(TokenType.INT, '3'),
+            Token(TokenType.RPAREN, ')'),
+            Token(TokenType.LBRACE, '{'),
+            Token(TokenType.IDENT, 'i'),
+            Token(TokenType.ASSIGN, '='),
+            Token(TokenType.IDENT, 'i'),
+            Token(TokenType.PLUS, '+'),
+            Token(TokenType.INT, '1'),
+            Token(TokenType.SEMICOLON, ';'),
+            Token(TokenType.RBRACE, '}'),
+        ]
+
+        self.assertEquals(tokens, expected_tokens)
+
     def test_two_character_operator(self) -> None:
         source: str = '''
             10 == 10;
@@ -236,3 +280,233 @@ class LexerTest(TestCase):
 
         self.assertEquals(tokens, expected_tokens)
 
+    def test_accented_identifiers(self) -> None:
+        source: str = 'variable año_2 = edad1;'
+        lexer: Lexer = Lexer(source)
+
+        tokens: List[Token] = []
+        for i in range(6):
+            tokens.append(lexer.next_token())
+
+        expected_tokens: List[Token] = [
+            Token(TokenType.LET, 'variable'),
+            Token(TokenType.IDENT, 'año_2'),
+            Token(TokenType.ASSIGN, '='),
+            Token(TokenType.IDENT, 'edad1'),
+            Token(TokenType.SEMICOLON, ';'),
+            Token(TokenType.EOF, ''),
+        ]
+
+        self.assertEquals(tokens, expected_tokens)
+
+    def test_unusual_whitespace(self) -> None:
+        source: str = 'variable\x1ca\x1f=\u00a05;\u3000'
+        lexer: Lexer = Lexer(source)
+
+        tokens: List[Token] = []
+        for i in range(6):
+            tokens.append(lexer.next_token())
+
+        expected_tokens: List[Token] = [
+            Token(TokenType.LET, 'variable'),
+            Token(TokenType.IDENT, 'a'),
+            Token(TokenType.ASSIGN, '='),
+            Token(TokenType.INT, '5'),
+            Token(TokenType.SEMICOLON, ';'),
+            Token(TokenType.EOF, ''),
+        ]
+
+        self.assertEquals(tokens, expected_tokens)
+
+    def test_unterminated_string(self) -> None:
+        source: str = '"foo; bar'
+        lexer: Lexer = Lexer(source)
+
+        tokens: List[Token] = []
+        for i in range(3):
+            tokens.append(lexer.next_token())
+
+        expected_tokens: List[Token] = [
+            Token(TokenType.STRING, 'foo; bar'),
+            Token(TokenType.EOF, ''),
+            Token(TokenType.EOF, ''),
+        ]
+
+        self.assertEquals(tokens, expected_tokens)
+
+    def test_stream(self) -> None:
+        source: str = '''
+            variable año = "Platzi es la mejor escuela online";
+            año == 10 != 9;
+        '''
+        expected_tokens: List[Token] = [
+            Token(TokenType.LET, 'variable'),
+            Token(TokenType.IDENT, 'año'),
+            Token(TokenType.ASSIGN, '='),
+            Token(TokenType.STRING, 'Platzi es la mejor escuela online'),
+            Token(TokenType.SEMICOLON, ';'),
+            Token(TokenType.IDENT, 'año'),
+            Token(TokenType.EQ, '=='),
+            Token(TokenType.INT, '10'),
+            Token(TokenType.NOT_EQ, '!='),
+            Token(TokenType.INT, '9'),
+            Token(TokenType.SEMICOLON, ';'),
+            Token(TokenType.EOF, ''),
+        ]
+
+        for chunk_size in [1, 2, 3, 5, 64]:
+            lexer: Lexer = Lexer.from_stream(StringIO(source), chunk_size)
+
+            tokens: List[Token] = []
+            for i in range(len(expected_tokens)):
+                tokens.append(lexer.next_token())
+
+            self.assertEquals(tokens, expected_tokens)
+
+    def test_stream_from_iterable(self) -> None:
+        lexer: Lexer = Lexer.from_stream(['variable cin', 'co =', '= "a', 'b"'])
+
+        tokens: List[Token] = []
+        for i in range(5):
+            tokens.append(lexer.next_token())
+
+        expected_tokens: List[Token] = [
+            Token(TokenType.LET, 'variable'),
+            Token(TokenType.IDENT, 'cinco'),
+            Token(TokenType.EQ, '=='),
+            Token(TokenType.STRING, 'ab'),
+            Token(TokenType.EOF, ''),
+        ]
+
+        self.assertEquals(tokens, expected_tokens)
+
+    def test_stream_memory(self) -> None:
+        def lex(identifiers: int) -> int:
+            lexer: Lexer = Lexer.from_stream(
+                f'nombre{index} ' for index in range(identifiers))
+
+            start()
+            while lexer.next_token().token_type != TokenType.EOF:
+                pass
+            _, peak = get_traced_memory()
+            stop()
+
+            return peak
+
+        # The first run grows the table of interned strings.
+        lex(10000)
+
+        # Ten times the identifiers fit in about the same memory.
+        self.assertLess(lex(10000), 2 * lex(1000))
+
+    def test_path(self) -> None:
+        source: str = 'variable año = "¿qué?"; año != ñ1 ¡'
+
+        with TemporaryDirectory() as directory:
+            source_path = path.join(directory, 'programa.lpp')
+            with open(source_path, 'w', encoding='utf-8') as source_file:
+                source_file.write(source)
+
+            lexer: Lexer = Lexer.from_path(source_path)
+
+            tokens: List[Token] = []
+            for i in range(9):
+                tokens.append(lexer.next_token())
+
+        expected_tokens: List[Token] = [
+            Token(TokenType.LET, 'variable'),
+            Token(TokenType.IDENT, 'año'),
+            Token(TokenType.ASSIGN, '='),
+            Token(TokenType.STRING, '¿qué?'),
+            Token(TokenType.SEMICOLON, ';'),
+            Token(TokenType.IDENT, 'año'),
+            Token(TokenType.NOT_EQ, '!='),
+            Token(TokenType.IDENT, 'ñ1'),
+            Token(TokenType.ILLEGAL, '¡'),
+        ]
+
+        self.assertEquals(tokens, expected_tokens)
+
+    def test_path_closes_map(self) -> None:
+        maps: List[mmap] = []
+
+        class TrackedMap(mmap):
+
+            def __init__(self, *args: object, **kwargs: object) -> None:
+                maps.append(self)
+
+        with TemporaryDirectory() as directory:
+            source_path = path.join(directory, 'programa.lpp')
+            with open(source_path, 'w', encoding='utf-8') as source_file:
+                source_file.write('variable a = 5;')
+
+            with patch('lpp.lexer.mmap', TrackedMap):
+                lexer: Lexer = Lexer.from_path(source_path)
+
+            self.assertEquals(len(maps), 1)
+            while lexer.next_token() != Token(TokenType.EOF, ''):
+                self.assertFalse(maps[0].closed)
+
+            self.assertTrue(maps[0].closed)
+            self.assertEquals(lexer.next_token(), Token(TokenType.EOF, ''))
+
+    def test_path_unusual_whitespace(self) -> None:
+        source: str = 'variable\x1ca\x1d=\x1e\u00a05\x1f;\u3000'
+
+        with TemporaryDirectory() as directory:
+            source_path = path.join(directory, 'programa.lpp')
+            with open(source_path, 'w', encoding='utf-8') as source_file:
+                source_file.write(source)
+
+            lexer: Lexer = Lexer.from_path(source_path)
+
+            tokens: List[Token] = []
+            for i in range(6):
+                tokens.append(lexer.next_token())
+
+        expected_tokens: List[Token] = [
+            Token(TokenType.LET, 'variable'),
+            Token(TokenType.IDENT, 'a'),
+            Token(TokenType.ASSIGN, '='),
+            Token(TokenType.INT, '5'),
+            Token(TokenType.SEMICOLON, ';'),
+            Token(TokenType.EOF, ''),
+        ]
+
+        self.assertEquals(tokens, expected_tokens)
+
+    def test_tokenize(self) -> None:
+        source: str = '''variable año = "foo";
+            año != 10 @'''
+        tokens = tokenize(source)
+
+        expected_tokens: List[Token] = [
+            Token(TokenType.LET, 'variable'),
+            Token(TokenType.IDENT, 'año'),
+            Token(TokenType.ASSIGN, '='),
+            Token(TokenType.STRING, 'foo'),
+            Token(TokenType.SEMICOLON, ';'),
+            Token(TokenType.IDENT, 'año'),
+            Token(TokenType.NOT_EQ, '!='),
+            Token(TokenType.INT, '10'),
+            Token(TokenType.ILLEGAL, '@'),
+            Token(TokenType.EOF, ''),
+        ]
+        expected_positions = [
+            (1, 1), (1, 10), (1, 14), (1, 16), (1, 21),
+            (2, 13), (2, 17), (2, 20), (2, 23), (2, 24),
+        ]
+
+        self.assertEquals(list(tokens), expected_tokens)
+        self.assertEquals([tokens.position(i) for i in range(len(tokens))],
+                          expected_positions)
+
+    def test_interned_identifiers(self) -> None:
+        source: str = 'suma_dos(edad) + edad;'
+        first: Token = Lexer(source).next_token()
+        second: Token = Lexer('  ' + source).next_token()
+        buffered: TokenBuffer = tokenize(source)
+
+        self.assertIs(first.literal, second.literal)
+        self.assertIs(first.literal, buffered.literal(0))
+        self.assertIs(buffered.literal(2), buffered.literal(5))
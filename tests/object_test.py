@@ -0,0 +1,129 @@
+from typing import List
+from unittest import TestCase
+
+import lpp.ast as ast
+import lpp.closures as closures
+import lpp.pycodegen as pycodegen
+import lpp.vm as vm
+from lpp.builtins import longitud
+from lpp.evaluator import (
+    FALSE,
+    NULL,
+    TRUE,
+)
+from lpp.lexer import Lexer
+from lpp.object import (
+    Array,
+    Boolean,
+    Builtin,
+    Environment,
+    Error,
+    Function,
+    Hash,
+    Integer,
+    Object,
+    ObjectType,
+    Return,
+    String,
+    TailCall,
+)
+from lpp.parser import Parser
+from lpp.persistent import (
+    Map,
+    Vector,
+)
+from lpp.token import (
+    Token,
+    TokenType,
+)
+
+
+class ObjectTest(TestCase):
+
+    def test_type_tags(self) -> None:
+        function = Function([], self._body(), Environment())
+        tests: List[Object] = [
+            Integer(1),
+            Boolean(True),
+            NULL,
+            Return(Integer(1)),
+            Error('error'),
+            function,
+            TailCall(function, []),
+            String('a'),
+            Builtin(fn=longitud),
+            Array(Vector([Integer(1)])),
+            Hash(Map()),
+        ]
+
+        for value in tests:
+            self.assertIs(value.object_type, value.type())
+            self.assertIs(type(value).object_type, value.type())
+
+        self.assertEquals(Integer(1).object_type, ObjectType.INTEGER)
+        self.assertEquals(NULL.object_type, ObjectType.NULL)
+
+    def test_objects_have_no_dict(self) -> None:
+        values: List[Object] = [Integer(1), String('a'), Error('error'),
+                                Array(Vector()), Hash(Map())]
+        for run in (closures.run, vm.run, pycodegen.run):
+            program = Parser(Lexer('procedimiento(x) { x };')).parse_program()
+            function = run(program, Environment())
+            assert function is not None
+            values.append(function)
+
+        for value in values:
+            self.assertFalse(hasattr(value, '__dict__'), type(value).__name__)
+
+        with self.assertRaises(AttributeError):
+            setattr(Integer(1), 'otro', 2)
+
+    def test_hash_keys(self) -> None:
+        self.assertEquals(String('a').hash_key(), String('a').hash_key())
+        self.assertEquals(Integer(1).hash_key(), Integer(1).hash_key())
+        self.assertEquals(TRUE.hash_key(), Boolean(True).hash_key())
+
+        self.assertNotEquals(String('a').hash_key(), String('b').hash_key())
+        self.assertNotEquals(Integer(1).hash_key(), TRUE.hash_key())
+        self.assertNotEquals(Integer(0).hash_key(), FALSE.hash_key())
+        self.assertNotEquals(String('1').hash_key(), Integer(1).hash_key())
+
+    def test_hash_keys_are_cached(self) -> None:
+        string = String('a' * 1000)
+
+        self.assertIs(string.hash_key(), string.hash_key())
+        self.assertIs(TRUE.hash_key(), TRUE.hash_key())
+
+        integer = Integer(1000)
+        self.assertIs(integer.hash_key(), integer.hash_key())
+
+    def test_ropes(self) -> None:
+        short = String('a').concat(String('b'))
+        self.assertFalse(short.is_rope())
+        self.assertEquals(short.value, 'ab')
+
+        long = String('a' * 200)
+        rope = long.concat(long).concat(String('b'))
+        self.assertTrue(rope.is_rope())
+        self.assertTrue(long.concat(String('c' * 100)).is_rope())
+        self.assertFalse(long.is_rope())
+
+        self.assertEquals(rope.inspect(), 'a' * 400 + 'b')
+        self.assertFalse(rope.is_rope())
+        self.assertEquals(rope.value, 'a' * 400 + 'b')
+
+        other = long.concat(long.concat(String('b')))
+        self.assertEquals(other.hash_key(), rope.hash_key())
+
+    def test_deep_ropes(self) -> None:
+        piece = String('x' * 100)
+        rope = String('')
+        for _ in range(100000):
+            rope = rope.concat(piece)
+
+        self.assertTrue(rope.is_rope())
+        self.assertEquals(len(rope.value), 10000000)
+        self.assertEquals(rope.value[-100:], piece.value)
+
+    def _body(self) -> ast.Block:
+        return ast.Block(Token(TokenType.LBRACE, '{'), [])
@@ -0,0 +1,159 @@
+from typing import (
+    List,
+    Tuple,
+)
+from unittest import TestCase
+
+import lpp.ast as ast
+from lpp.evaluator import evaluate
+from lpp.lexer import (
+    Lexer,
+    tokenize,
+)
+from lpp.object import Environment
+from lpp.optimizer import (
+    Change,
+    ChangeKind,
+    optimize,
+)
+from lpp.parser import Parser
+
+
+class OptimizerTest(TestCase):
+
+    def test_constant_folding(self) -> None:
+        tests: List[Tuple[str, str]] = [
+            ('2 * 5 - 3;', '7'),
+            ('-5;', '-5'),
+            ('7 / 2;', '3'),
+            ('-7 / 2;', '-4'),
+            ('1 < 2 == verdadero;', 'verdadero'),
+            ('!5;', 'falso'),
+            ('!!falso;', 'falso'),
+            ('"a" + "b" + "c";', '"abc"'),
+            ('"a" == "a";', 'verdadero'),
+            ('1 == verdadero;', 'falso'),
+            ('"1" != 1;', 'verdadero'),
+            ('falso != falso;', 'falso'),
+            ('variable x = 1 + 2; x * (3 + 4);', 'variable x = 3;(x * 7)'),
+            ('procedimiento(x) { regresa x + (1 + 1); };',
+             'procedimiento(x) regresa (x + 2);'),
+            ('x = 2 * 3; mientras (x < 1 + 1) { x = x - -1; }',
+             'x = 6;mientras (x < 2) x = (x - -1);'),
+            ('[1 + 1, "a" + "b"][2 - 2];', '([2, "ab"][0])'),
+            ('{"a" + "b": 1 + 1}["ab"];', '({"ab": 2}["ab"])'),
+        ]
+
+        for source, expected in tests:
+            program = self._parse(source)
+            optimize(program)
+
+            self.assertEquals(str(program), expected)
+
+    def test_errors_are_not_folded(self) -> None:
+        tests: List[str] = [
+            '1 / 0;',
+            '-verdadero;',
+            '"a" - "b";',
+            '1 + verdadero;',
+            'verdadero + falso;',
+            '"a" < "b";',
+        ]
+
+        for source in tests:
+            program = self._parse(source)
+
+            self.assertEquals(optimize(program), [])
+
+    def test_dead_branches(self) -> None:
+        tests: List[Tuple[str, str]] = [
+            ('si (verdadero) { 1; 2 } si_no { 3 }; 4;', '124'),
+            ('si (falso) { 1 } si_no { variable a = 3; a }; 4;',
+             'variable a = 3;a4'),
+            ('si (1 > 2) { 1 }; 4;', '4'),
+            ('variable x = si (verdadero) { 1 } si_no { 2 };',
+             'variable x = 1;'),
+            ('variable x = si ("") { 1; 2 } si_no { 3 };',
+             'variable x = si verdadero 12;'),
+            ('variable x = si (falso) { 1 } si_no { 2; 3 };',
+             'variable x = si verdadero 23;'),
+            ('(si (verdadero) { 1 }) + 1;', '2'),
+            ('mientras (1 > 2) { 1 } 4;', '4'),
+            ('4; mientras (falso) { 1 }', '4mientras falso 1'),
+        ]
+
+        for source, expected in tests:
+            program = self._parse(source)
+            optimize(program)
+
+            self.assertEquals(str(program), expected)
+
+    def test_values_of_blocks_are_kept(self) -> None:
+        tests: List[str] = [
+            '4; si (falso) { 1 };',
+            '4; si (verdadero) { };',
+            'variable x = si (falso) { 1 }; x;',
+        ]
+
+        for source in tests:
+            program = self._parse(source)
+
+            self.assertEquals(optimize(program), [])
+
+    def test_same_results(self) -> None:
+        tests: List[str] = [
+            '''
+                variable f = procedimiento(x) {
+                    si (1 < 2) { regresa x * (2 + 3); }
+                    regresa 0;
+                };
+                f(2);
+            ''',
+            '''
+                variable f = procedimiento() {
+                    si (verdadero) { variable a = 1; }
+                    si (falso) { variable a = 2; } si_no { a + 10 }
+                };
+                f();
+            ''',
+            'si (verdadero) { -verdadero; 1; }; 2;',
+            'si (falso) { 1 }',
+            '"ab" + "cd" == "abcd";',
+        ]
+
+        for source in tests:
+            expected = evaluate(self._parse(source), Environment())
+            program = self._parse(source)
+            optimize(program)
+            evaluated = evaluate(program, Environment())
+
+            assert expected is not None and evaluated is not None
+            self.assertEquals(evaluated.inspect(), expected.inspect())
+
+    def test_report(self) -> None:
+        program = self._parse('''
+            variable x = 2 * 5 - 3;
+            si (verdadero) { x } si_no { 0 };
+        ''')
+
+        self.assertEquals(optimize(program), [
+            Change(ChangeKind.FOLD, '((2 * 5) - 3)', '7'),
+            Change(ChangeKind.BRANCH, 'si verdadero xsi_no 0', 'x'),
+        ])
+
+    def test_spans_are_dropped(self) -> None:
+        program = Parser(tokenize('1 + 2; a;'), keep_tokens=False).parse_program()
+        unchanged = Parser(tokenize('a;'), keep_tokens=False).parse_program()
+
+        optimize(program)
+        optimize(unchanged)
+
+        self.assertIsNone(program.spans)
+        self.assertIsNotNone(unchanged.spans)
+
+    def _parse(self, source: str) -> ast.Program:
+        parser = Parser(Lexer(source))
+        program = parser.parse_program()
+
+        self.assertEquals(parser.errors, [])
+        return program
@@ -8,14 +8,18 @@ from typing import (
 )
 
 from lpp.ast import (
+    ArrayLiteral,
+    AssignStatement,
     Block,
     Boolean,
     Call,
     Expression,
     ExpressionStatement,
     Function,
+    HashLiteral,
     Identifier,
     If,
+    Index,
     Infix,
     Integer,
     LetStatement,
@@ -23,8 +27,13 @@ from lpp.ast import (
     Program,
     ReturnStatement,
     StringLiteral,
+    WhileStatement,
+    spans,
+)
+from lpp.lexer import (
+    Lexer,
+    tokenize,
 )
-from lpp.lexer import Lexer
 from lpp.parser import Parser
 
 
@@ -95,6 +104,50 @@ class ParserTest(TestCase):
 
         self.assertEquals(names, expected_names)
 
+    def test_assign_statements(self) -> None:
+        source: str = 'x = 5; y = x + 1; x == y;'
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        self.assertEquals(parser.errors, [])
+        self.assertEquals(len(program.statements), 3)
+
+        assign_statement = cast(AssignStatement, program.statements[1])
+        self.assertIsInstance(assign_statement, AssignStatement)
+
+        assert assign_statement.name is not None
+        self._test_identifier(assign_statement.name, 'y')
+
+        assert assign_statement.value is not None
+        self._test_infix_expression(assign_statement.value, 'x', '+', 1)
+
+        self.assertIsInstance(program.statements[2], ExpressionStatement)
+
+    def test_while_statement(self) -> None:
+        source: str = 'mientras (x < 10) { x = x + 1; }'
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        self.assertEquals(parser.errors, [])
+        self.assertEquals(len(program.statements), 1)
+
+        while_statement = cast(WhileStatement, program.statements[0])
+        self.assertIsInstance(while_statement, WhileStatement)
+        self.assertEquals(while_statement.token_literal(), 'mientras')
+
+        assert while_statement.condition is not None
+        self._test_infix_expression(while_statement.condition, 'x', '<', 10)
+
+        assert while_statement.body is not None
+        self.assertEquals(len(while_statement.body.statements), 1)
+        self.assertIsInstance(while_statement.body.statements[0],
+                              AssignStatement)
+        self.assertEquals(str(while_statement), 'mientras (x < 10) x = (x + 1);')
+
     def test_parse_errors(self) -> None:
         source: str = 'variable x 5;'
         lexer: Lexer = Lexer(source)
@@ -104,6 +157,58 @@ class ParserTest(TestCase):
 
         self.assertEquals(len(parser.errors), 1)
 
+    def test_parse_errors_with_positions(self) -> None:
+        source: str = '''variable x = 5;
+            variable y 5;'''
+        parser: Parser = Parser(tokenize(source))
+
+        program: Program = parser.parse_program()
+
+        self.assertEquals(parser.errors, [
+            'Se esperaba que el siguiente token fuera TokenType.ASSIGN ' +
+            'pero se obtuvo TokenType.INT (línea 2, columna 24)',
+        ])
+
+    def test_parse_without_tokens(self) -> None:
+        source: str = 'variable suma = procedimiento(x) { x + 10 };'
+        parser: Parser = Parser(tokenize(source), keep_tokens=False)
+
+        program: Program = parser.parse_program()
+
+        self.assertEquals(str(program),
+                          'variable suma = procedimiento(x) (x + 10);')
+
+        node_spans: List[Tuple[str, str]] = [
+            (type(node).__name__, source[start:end])
+            for node, start, end in spans(program)
+        ]
+        self.assertEquals(node_spans, [
+            ('LetStatement', 'variable'),
+            ('Identifier', 'suma'),
+            ('Function', 'procedimiento'),
+            ('Identifier', 'x'),
+            ('Block', '{'),
+            ('ExpressionStatement', 'x'),
+            ('Infix', '+'),
+            ('Identifier', 'x'),
+            ('Integer', '10'),
+        ])
+
+        for node, _, _ in spans(program):
+            self.assertIsNone(cast(Expression, node).token)
+
+    def test_parse_token_buffer(self) -> None:
+        source: str = '''
+            variable suma = procedimiento(x, y) {
+                si (x > y) { regresa x - y; } si_no { regresa y; }
+            };
+            suma(1, 2 * 3);
+        '''
+        lexer_program: Program = Parser(Lexer(source)).parse_program()
+        buffer_program: Program = Parser(tokenize(source)).parse_program()
+
+        self.assertEquals(str(buffer_program), str(lexer_program))
+
     def test_return_statements(self) -> None:
         source: str = '''
             regresa 5;
@@ -255,6 +360,12 @@ class ParserTest(TestCase):
             ('suma(a, b, 1, 2 * 3, 4 + 5, suma(6, 7 * 8));',
              'suma(a, b, 1, (2 * 3), (4 + 5), suma(6, (7 * 8)))', 1),
             ('suma(a + b + c * d / f + g);', 'suma((((a + b) + ((c * d) / f)) + g))', 1),
+            ('a * [1, 2, 3, 4][b * c] * d;', '((a * ([1, 2, 3, 4][(b * c)])) * d)', 1),
+            ('suma(a * b[2], b[1], 2 * [1, 2][1]);',
+             'suma((a * (b[2])), (b[1]), (2 * ([1, 2][1])))', 1),
+            ('-a[0];', '(-(a[0]))', 1),
+            ('f(x)[0](y);', '(f(x)[0])(y)', 1),
+            ('{"a": 1 + 2}["a"] * 3;', '(({"a": (1 + 2)}["a"]) * 3)', 1),
         ]
 
         for source, expected_result, expected_statement_count in test_sources:
@@ -410,6 +521,100 @@ class ParserTest(TestCase):
         self._test_infix_expression(call.arguments[1], 2, '*', 3)
         self._test_infix_expression(call.arguments[2], 4, '+', 5)
 
+    def test_array_literal(self) -> None:
+        source: str = '[1, 2 * 2, 3 + 3];'
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        self._test_program_statements(parser, program)
+
+        array = cast(ArrayLiteral,
+                     cast(ExpressionStatement, program.statements[0]).expression)
+        self.assertIsInstance(array, ArrayLiteral)
+
+        assert array.elements is not None
+        self.assertEquals(len(array.elements), 3)
+        self._test_literal_expression(array.elements[0], 1)
+        self._test_infix_expression(array.elements[1], 2, '*', 2)
+        self._test_infix_expression(array.elements[2], 3, '+', 3)
+
+    def test_empty_array_literal(self) -> None:
+        source: str = '[];'
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        self._test_program_statements(parser, program)
+
+        array = cast(ArrayLiteral,
+                     cast(ExpressionStatement, program.statements[0]).expression)
+        self.assertIsInstance(array, ArrayLiteral)
+        self.assertEquals(array.elements, [])
+
+    def test_hash_literal(self) -> None:
+        source: str = '{"uno": 1, "dos": 2 * 2, 3: verdadero};'
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        self._test_program_statements(parser, program)
+
+        hash_literal = cast(HashLiteral,
+                            cast(ExpressionStatement, program.statements[0]).expression)
+        self.assertIsInstance(hash_literal, HashLiteral)
+
+        assert hash_literal.pairs is not None
+        self.assertEquals(len(hash_literal.pairs), 3)
+        self.assertEquals(str(hash_literal.pairs[0][0]), '"uno"')
+        self._test_literal_expression(hash_literal.pairs[0][1], 1)
+        self.assertEquals(str(hash_literal.pairs[1][0]), '"dos"')
+        self._test_infix_expression(hash_literal.pairs[1][1], 2, '*', 2)
+        self._test_literal_expression(hash_literal.pairs[2][0], 3)
+        self._test_literal_expression(hash_literal.pairs[2][1], True)
+
+    def test_empty_hash_literal(self) -> None:
+        source: str = '{};'
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        self._test_program_statements(parser, program)
+
+        hash_literal = cast(HashLiteral,
+                            cast(ExpressionStatement, program.statements[0]).expression)
+        self.assertIsInstance(hash_literal, HashLiteral)
+        self.assertEquals(hash_literal.pairs, [])
+
+    def test_hash_literal_errors(self) -> None:
+        for source in ['{"a" 1};', '{"a": 1 "b": 2};', '{"a": 1, "b"};']:
+            parser: Parser = Parser(Lexer(source))
+
+            parser.parse_program()
+
+            self.assertNotEquals(parser.errors, [], source)
+
+    def test_index_expression(self) -> None:
+        source: str = 'valores[1 + 1];'
+        lexer: Lexer = Lexer(source)
+        parser: Parser = Parser(lexer)
+
+        program: Program = parser.parse_program()
+
+        self._test_program_statements(parser, program)
+
+        index = cast(Index,
+                     cast(ExpressionStatement, program.statements[0]).expression)
+        self.assertIsInstance(index, Index)
+        self._test_identifier(index.left, 'valores')
+
+        assert index.index is not None
+        self._test_infix_expression(index.index, 1, '+', 1)
+
     def test_string_literal_expressions(self) -> None:
         source: str = '"hello world!"'
         lexer: Lexer = Lexer(source)
@@ -430,7 +635,7 @@ class ParserTest(TestCase):
 
         expression = cast(Boolean, expression)
         self.assertEquals(expression.value, expected_value)
-        self.assertEquals(expression.token.literal, 'verdadero' if expected_value else 'falso')
+        self.assertEquals(expression.token_literal(), 'verdadero' if expected_value else 'falso')
 
     def _test_infix_expression(self,
                                expression: Expression,
@@ -479,7 +684,7 @@ class ParserTest(TestCase):
 
         expression = cast(Identifier, expression)
         self.assertEquals(expression.value, expected_value)
-        self.assertEquals(expression.token.literal, expected_value)
+        self.assertEquals(expression.token_literal(), expected_value)
 
     def _test_integer(self,
                       expression: Expression,
@@ -488,5 +693,5 @@ class ParserTest(TestCase):
 
         expression = cast(Integer, expression)
         self.assertEquals(expression.value, expected_value)
-        self.assertEquals(expression.token.literal, str(expected_value))
+        self.assertEquals(expression.token_literal(), str(expected_value))
 
@@ -0,0 +1,139 @@
+from typing import (
+    Any,
+    Dict,
+    List,
+)
+from unittest import TestCase
+
+from lpp.persistent import (
+    Map,
+    Vector,
+)
+
+
+class Key:
+    """Key with the hash it is given, to make keys collide."""
+
+    def __init__(self, value: int, hash_value: int) -> None:
+        self.value = value
+        self.hash_value = hash_value
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Key) and other.value == self.value
+
+    def __hash__(self) -> int:
+        return self.hash_value
+
+
+class VectorTest(TestCase):
+
+    # Sizes around the edges of the tail and of every level of the trie.
+    SIZES: List[int] = [0, 1, 31, 32, 33, 64, 65, 1024, 1056, 1057, 33825]
+
+    def test_append(self) -> None:
+        for size in self.SIZES:
+            vector: Vector[int] = Vector()
+            for element in range(size):
+                vector = vector.append(element)
+
+            self.assertEquals(len(vector), size)
+            self.assertEquals(list(vector), list(range(size)))
+            self.assertEquals([vector[index] for index in range(size)],
+                              list(range(size)))
+
+    def test_from_elements(self) -> None:
+        for size in self.SIZES:
+            vector = Vector(range(size))
+            appended: Vector[int] = Vector()
+            for element in range(size):
+                appended = appended.append(element)
+
+            self.assertEquals(list(vector), list(range(size)))
+            self.assertEquals(list(vector.append(-1)),
+                              list(appended.append(-1)))
+
+    def test_set(self) -> None:
+        for size in self.SIZES[1:]:
+            vector = Vector(range(size))
+            for index in {0, size // 3, size - 33, size - 1}:
+                if index < 0:
+                    continue
+
+                updated = vector.set(index, -1)
+                expected = list(range(size))
+                expected[index] = -1
+
+                self.assertEquals(list(updated), expected)
+                self.assertEquals(list(vector), list(range(size)))
+
+    def test_versions_are_independent(self) -> None:
+        vector = Vector(range(40))
+        first = vector.append(40)
+        second = vector.append(-40)
+
+        self.assertEquals(list(vector), list(range(40)))
+        self.assertEquals(first[40], 40)
+        self.assertEquals(second[40], -40)
+
+    def test_index_errors(self) -> None:
+        vector = Vector(range(3))
+
+        for index in [-1, 3]:
+            with self.assertRaises(IndexError):
+                vector[index]
+
+            with self.assertRaises(IndexError):
+                vector.set(index, 0)
+
+
+class MapTest(TestCase):
+
+    def test_set_and_get(self) -> None:
+        tests: List[List[Any]] = [
+            list(range(5000)),
+            [str(key) * 3 for key in range(2000)],
+            [-1, -2, 2 ** 64, 0, 2 ** 61 - 1],
+            [Key(key, key % 7) for key in range(100)],
+            [Key(key, -(key % 3)) for key in range(30)],
+        ]
+
+        for keys in tests:
+            persistent: Map[Any, int] = Map()
+            expected: Dict[Any, int] = {}
+            for value, key in enumerate(keys):
+                persistent = persistent.set(key, value)
+                expected[key] = value
+
+            for key in keys[::3]:
+                persistent = persistent.set(key, -1)
+                expected[key] = -1
+
+            self.assertEquals(len(persistent), len(expected))
+            self.assertEquals(list(persistent.items()), list(expected.items()))
+            for key in keys:
+                self.assertIn(key, persistent)
+                self.assertEquals(persistent.get(key), expected[key])
+
+            self.assertNotIn('otra', persistent)
+            self.assertNotIn(Key(-1, 0), persistent)
+            self.assertIsNone(persistent.get('otra'))
+            self.assertEquals(persistent.get('otra', 0), 0)
+
+    def test_insertion_order(self) -> None:
+        persistent = Map([('b', 1), ('a', 2), ('c', 3), ('a', 4)])
+
+        self.assertEquals(list(persistent), ['b', 'a', 'c'])
+        self.assertEquals(list(persistent.keys()), ['b', 'a', 'c'])
+        self.assertEquals(list(persistent.values()), [1, 4, 3])
+
+    def test_versions_are_independent(self) -> None:
+        persistent = Map([(key, key) for key in range(100)])
+        first = persistent.set(50, -50)
+        second = persistent.set(100, 100)
+
+        self.assertEquals(persistent.get(50), 50)
+        self.assertNotIn(100, persistent)
+        self.assertEquals(first.get(50), -50)
+        self.assertNotIn(100, first)
+        self.assertEquals(second.get(100), 100)
+        self.assertEquals(len(second), 101)
@@ -0,0 +1,127 @@
+import ast as py_ast
+from typing import Optional
+
+from lpp.lexer import Lexer
+from lpp.object import (
+    Environment,
+    Object,
+)
+from lpp.parser import Parser
+from lpp.pycodegen import (
+    NativeFunction,
+    compile_program,
+    run,
+    to_module,
+    to_source,
+)
+from tests import evaluator_test
+
+
+class PyCodegenTest(evaluator_test.EvaluatorTest):
+    """Runs every evaluator test on programs translated to Python."""
+
+    def test_closures(self) -> None:
+        evaluated = self._evaluate_tests('''
+            variable sumador = procedimiento(x) {
+                regresa procedimiento(y) { regresa x + y; };
+            };
+            variable suma_dos = sumador(2);
+            suma_dos(sumador(5)(20));
+        ''')
+
+        self._test_integer_object(evaluated, 27)
+
+    def test_environment(self) -> None:
+        program = Parser(Lexer('a + longitud("abc");')).parse_program()
+        env = Environment()
+        env['a'] = self._evaluate_tests('2')
+
+        evaluated = compile_program(program)(env)
+
+        assert evaluated is not None
+        self._test_integer_object(evaluated, 5)
+
+    def test_errors_stop_blocks(self) -> None:
+        tests = [
+            ('''
+                variable f = procedimiento() {
+                    variable x = si (verdadero) { -falso; 1; } si_no { 2 };
+                    x;
+                };
+                f();
+             ''', 'Operador desconocido: -BOOLEAN'),
+            ('5(1);', 'No es una función: INTEGER'),
+            ('"a" - 1;', 'Discrepancia de tipos: STRING - INTEGER'),
+        ]
+
+        for source, expected in tests:
+            self._test_error_object(self._evaluate_tests(source), expected)
+
+    def test_evaluation_order(self) -> None:
+        evaluated = self._evaluate_tests('''
+            variable a = 1;
+            variable f = procedimiento() { regresa a; };
+            f() + si (verdadero) { variable a = 10; a } si_no { 0 };
+        ''')
+
+        self._test_integer_object(evaluated, 11)
+
+    def test_functions(self) -> None:
+        evaluated = self._evaluate_tests(
+            'procedimiento(x, y) { procedimiento(z) { z } };')
+
+        self.assertIsInstance(evaluated, NativeFunction)
+        self.assertEquals(evaluated.inspect(),
+                          'procedimiento(x, y) {\nprocedimiento(z) z\n}')
+
+    def test_missing_arguments(self) -> None:
+        # Missing parameters are unset, so the variables of the enclosing
+        # environment are used instead.
+        tests = [
+            ('variable f = procedimiento(a, b) { a }; f(1);', 1),
+            ('variable b = 7; variable f = procedimiento(a, b) { b }; f(1);', 7),
+            ('''
+                variable b = 7;
+                variable f = procedimiento(a, b) { b = 3; b };
+                f(1) + b;
+             ''', 6),
+        ]
+
+        for source, expected in tests:
+            self._test_integer_object(self._evaluate_tests(source), expected)
+
+        evaluated = self._evaluate_tests(
+            'variable f = procedimiento(a, b) { b }; f(1);')
+        self._test_error_object(evaluated, 'Identificador no encontrado: b')
+
+    def test_module(self) -> None:
+        program = Parser(Lexer('''
+            variable def = procedimiento(x) { si (x > 1) { x } si_no { 0 } };
+            def(2);
+        ''')).parse_program()
+
+        self.assertIsInstance(to_module(program), py_ast.Module)
+        source = to_source(program)
+        self.assertIn('def _f0(l_x=_r_UNBOUND, *_):', source)
+        self.assertIn('l_def = _r_NativeFunction(_f0, _r_nodes[0])', source)
+
+    def test_tail_calls_loop(self) -> None:
+        program = Parser(Lexer('''
+            variable contar = procedimiento(n, acc) {
+                si (n == 0) { regresa acc; }
+                regresa contar(n - 1, acc + n);
+            };
+            variable hace_funciones = procedimiento(n) {
+                variable f = procedimiento() { n };
+                regresa hace_funciones(n - 1);
+            };
+        ''')).parse_program()
+
+        source = to_source(program)
+        self.assertEquals(source.count('while True:'), 1)
+        self.assertIn('continue', source)
+
+    def _evaluate(self, source: str) -> Optional[Object]:
+        program = Parser(Lexer(source)).parse_program()
+
+        return run(program, Environment())
@@ -0,0 +1,168 @@
+from typing import (
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
+from unittest import TestCase
+
+import lpp.ast as ast
+from lpp.lexer import Lexer
+from lpp.parser import Parser
+from lpp.resolver import resolve
+
+
+class ResolverTest(TestCase):
+
+    def test_program_scope(self) -> None:
+        program = self._resolve('''
+            variable a = 1;
+            variable b = a;
+            si (verdadero) { variable c = b; }
+            variable a = 2;
+        ''')
+
+        assert program.scope is not None
+        self.assertEquals(program.scope.names, ('a', 'b', 'c'))
+        self.assertEquals(self._annotations(program), [
+            ('a', 0, 0),
+            ('b', 0, 1),
+            ('a', 0, 0),
+            ('c', 0, 2),
+            ('b', 0, 1),
+            ('a', 0, 0),
+        ])
+
+    def test_function_scopes(self) -> None:
+        program = self._resolve('''
+            variable a = 1;
+            procedimiento(x, y) {
+                variable z = x;
+                procedimiento(w) { w + z + a + longitud };
+            };
+        ''')
+
+        outer = self._functions(program)[0]
+        inner = self._functions(program)[1]
+        assert outer.scope is not None and inner.scope is not None
+        self.assertEquals(outer.scope.names, ('x', 'y', 'z'))
+        self.assertEquals(inner.scope.names, ('w',))
+        self.assertEquals(self._annotations(inner), [
+            ('w', 0, 0),
+            ('w', 0, 0),
+            ('z', 1, 2),
+            ('a', 2, 0),
+            ('longitud', None, None),
+        ])
+
+    def test_shadowing(self) -> None:
+        program = self._resolve('''
+            variable a = 1;
+            procedimiento(a) { variable b = a; variable a = b; a };
+        ''')
+
+        function = self._functions(program)[0]
+        assert function.scope is not None
+        self.assertEquals(function.scope.names, ('a', 'b'))
+        self.assertEquals(self._annotations(function), [
+            ('a', 0, 0),
+            ('b', 0, 1),
+            ('a', 0, 0),
+            ('a', 0, 0),
+            ('b', 0, 1),
+            ('a', 0, 0),
+        ])
+
+    def test_assignments(self) -> None:
+        program = self._resolve('''
+            variable a = 1;
+            procedimiento(x) { mientras (x) { a = x; b = a; } };
+        ''')
+
+        function = self._functions(program)[0]
+        assert function.scope is not None
+        self.assertEquals(function.scope.names, ('x',))
+        self.assertEquals(self._annotations(function), [
+            ('x', 0, 0),
+            ('x', 0, 0),
+            ('a', 1, 0),
+            ('x', 0, 0),
+            ('b', None, None),
+            ('a', 1, 0),
+        ])
+
+    def test_resolve_twice(self) -> None:
+        program = self._resolve('variable a = 1; procedimiento() { a };')
+        first = self._annotations(program)
+
+        resolve(program)
+
+        self.assertEquals(self._annotations(program), first)
+
+    def test_tail_calls(self) -> None:
+        program = self._resolve('''
+            regresa f(1);
+            procedimiento(n) {
+                regresa f(n);
+                regresa n;
+                si (n) { si (n) { regresa f(n); } } si_no { regresa f(n); }
+                variable x = si (n) { regresa f(n); };
+                procedimiento() { regresa g(); };
+            };
+        ''')
+
+        returns = [cast(ast.ReturnStatement, node) for node in ast.walk(program)
+                   if type(node) is ast.ReturnStatement]
+        self.assertEquals([statement.tail for statement in returns],
+                          [False, True, False, True, True, False, True])
+        self.assertEquals([statement.in_expression for statement in returns],
+                          [False, False, False, False, False, True, False])
+
+    def test_ifs_used_as_values(self) -> None:
+        program = self._resolve('''
+            si (a) { si (b) {} }
+            variable x = si (c) {};
+            procedimiento() { si (d) {} regresa si (e) {}; };
+            mientras (si (f) {}) { si (g) {} }
+        ''')
+
+        ifs = [cast(ast.If, node) for node in ast.walk(program)
+               if type(node) is ast.If]
+        self.assertEquals([str(if_expression.condition) for if_expression in ifs],
+                          ['a', 'b', 'c', 'd', 'e', 'f', 'g'])
+        self.assertEquals([if_expression.in_expression for if_expression in ifs],
+                          [False, False, True, False, True, True, False])
+
+    def test_returns_in_loops(self) -> None:
+        program = self._resolve('''
+            procedimiento(n) {
+                mientras (n) { regresa f(n); }
+                mientras (si (n) { regresa n; }) {}
+            };
+        ''')
+
+        returns = [cast(ast.ReturnStatement, node) for node in ast.walk(program)
+                   if type(node) is ast.ReturnStatement]
+        self.assertEquals([(statement.tail, statement.in_expression)
+                           for statement in returns],
+                          [(False, False), (False, True)])
+
+    def _annotations(self, node: ast.ASTNode) \
+            -> List[Tuple[str, Optional[int], Optional[int]]]:
+        return [(identifier.value, identifier.depth, identifier.slot)
+                for identifier in self._identifiers(node)]
+
+    def _functions(self, node: ast.ASTNode) -> List[ast.Function]:
+        return [cast(ast.Function, child) for child in ast.walk(node)
+                if type(child) is ast.Function]
+
+    def _identifiers(self, node: ast.ASTNode) -> List[ast.Identifier]:
+        return [cast(ast.Identifier, child) for child in ast.walk(node)
+                if type(child) is ast.Identifier]
+
+    def _resolve(self, source: str) -> ast.Program:
+        program = Parser(Lexer(source)).parse_program()
+        resolve(program)
+
+        return program
+
@@ -0,0 +1,71 @@
+from typing import Optional
+
+from lpp.lexer import Lexer
+from lpp.object import (
+    Environment,
+    Object,
+)
+from lpp.parser import Parser
+from lpp.vm import run
+from tests import evaluator_test
+
+
+class VMTest(evaluator_test.EvaluatorTest):
+    """Runs every evaluator test on the virtual machine."""
+
+    def test_closures(self) -> None:
+        evaluated = self._evaluate_tests('''
+            variable sumador = procedimiento(x) {
+                regresa procedimiento(y) { regresa x + y; };
+            };
+            variable suma_dos = sumador(2);
+            variable suma_cinco = sumador(5);
+            suma_dos(suma_cinco(20));
+        ''')
+
+        self._test_integer_object(evaluated, 27)
+
+    def test_deep_recursion(self) -> None:
+        evaluated = self._evaluate_tests('''
+            variable contar = procedimiento(n) {
+                si (n == 0) { regresa 0; }
+                regresa 1 + contar(n - 1);
+            };
+            contar(5000);
+        ''')
+
+        self._test_integer_object(evaluated, 5000)
+
+    def test_errors_stop_blocks(self) -> None:
+        evaluated = self._evaluate_tests('''
+            variable f = procedimiento() {
+                si (verdadero) { -falso; 1; }
+                2;
+            };
+            f();
+        ''')
+
+        self._test_error_object(evaluated, 'Operador desconocido: -BOOLEAN')
+
+    def test_not_a_function(self) -> None:
+        evaluated = self._evaluate_tests('5(1);')
+
+        self._test_error_object(evaluated, 'No es una función: INTEGER')
+
+    def test_names_read_before_their_variable(self) -> None:
+        evaluated = self._evaluate_tests('''
+            variable a = 1;
+            variable f = procedimiento() {
+                variable b = a;
+                variable a = 2;
+                b + a;
+            };
+            f();
+        ''')
+
+        self._test_integer_object(evaluated, 3)
+
+    def _evaluate(self, source: str) -> Optional[Object]:
+        program = Parser(Lexer(source)).parse_program()
+
+        return run(program, Environment())